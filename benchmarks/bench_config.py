@@ -0,0 +1,113 @@
+"""
+Database.json load / save at catalog scale.
+
+Compares the previous whole-list approach — json.load into AssetEntry
+objects, json.dump(indent=4) of everything after every edit — with
+config.Catalog: lazy entries, cached per-entry text and atomic saves
+that re-encode only what changed. Run from the repo root:
+
+    python benchmarks/bench_config.py --entries 10000 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import AssetEntry, Catalog, _entry_to_json, load_config, save_config   # noqa: E402
+
+
+LOAD_RUNS = 5
+
+
+def make_entries(count: int) -> list[AssetEntry]:
+    return [AssetEntry(name=f"Asset_{i:06d}", location=f"Content/Pack{i % 100}/Asset_{i:06d}",
+                       type="HTTP" if i % 3 else "Mega",
+                       url=f"https://cdn.example.com/assets/{i:06d}.zip",
+                       segments=4 if i % 10 == 0 else 1)
+            for i in range(count)]
+
+
+def timed(fn, repeat: int = 1) -> float:
+    """Best of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - began)
+    return best
+
+
+def old_load(path: Path) -> list[AssetEntry]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [AssetEntry(**e) for e in json.load(f)["Assets"]]
+
+
+def old_save(path: Path, entries: list[AssetEntry]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"Assets": [_entry_to_json(e) for e in entries]}, f, indent=4, ensure_ascii=False)
+
+
+def bench(count: int, edits: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = Path(tmp)
+        path       = config_dir / "Database.json"
+        entries    = make_entries(count)
+        save_config(config_dir, entries)
+        size_mb    = path.stat().st_size / (1024 * 1024)
+
+        # before: parse everything, rewrite everything per edit
+        loaded   = old_load(path)
+        old_open = timed(lambda: old_load(path), LOAD_RUNS)
+        old_edit = timed(lambda: old_save(path, loaded))
+        reference = path.read_bytes()
+
+        # after
+        catalog  = None
+
+        def load():
+            nonlocal catalog
+            catalog = Catalog(config_dir)
+
+        new_open  = timed(load, LOAD_RUNS)
+        iterate   = timed(lambda: catalog.entries())
+        new_list  = timed(lambda: load_config(config_dir), LOAD_RUNS)
+        new_first = timed(lambda: catalog.save(force=True))
+        if path.read_bytes() != reference:
+            raise SystemExit("Catalog output differs from json.dump(indent=4)")
+
+        names = catalog.names()
+
+        def edit_and_save():
+            for i in range(edits):
+                name = names[(i * 7919) % len(names)]
+                entry = catalog.get(name)
+                catalog.update(name, AssetEntry(entry.name, entry.location, entry.type, entry.url + "?v=2"))
+                catalog.save()
+
+        new_edit = timed(edit_and_save) / edits
+
+    print(f"{count:>7} entries ({size_mb:.1f} MB)")
+    print(f"  load every entry      before {old_open * 1000:8.1f} ms   after {new_list * 1000:8.1f} ms"
+          f"   (catalog alone {new_open * 1000:.1f} ms)")
+    print(f"  save after one edit   before {old_edit * 1000:8.1f} ms   after {new_edit * 1000:8.1f} ms"
+          f"   (first save {new_first * 1000:.1f} ms)")
+    print(f"  build all entries                            {iterate * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--edits",   type=int, default=20, help="single-entry edits to average over")
+    args = parser.parse_args()
+
+    for count in args.entries:
+        bench(count, args.edits)
+
+
+if __name__ == "__main__":
+    main()
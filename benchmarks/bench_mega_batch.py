@@ -0,0 +1,77 @@
+"""
+One megatools run per asset vs one batched run, against fake_megatools.py.
+
+Generates N small "Mega" assets, then syncs them with and without
+SyncRunner's batch mode. The fake tool sleeps --startup seconds per
+invocation to stand in for process start, login and key derivation.
+Run from the repo root:
+
+    python benchmarks/bench_mega_batch.py --assets 100 --startup 0.3
+"""
+
+import argparse
+import os
+import shlex
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import AssetEntry             # noqa: E402
+from mega_provider import MegaProvider    # noqa: E402
+from sync_runner import SyncRunner        # noqa: E402
+
+FAKE_TOOL = Path(__file__).resolve().parent / "fake_megatools.py"
+
+
+def build_assets(root: Path, count: int, size: int) -> list[AssetEntry]:
+    entries = []
+    for i in range(count):
+        handle = f"H{i:05d}"
+        (root / handle).mkdir(parents=True)
+        (root / handle / f"asset_{i:05d}.bin").write_bytes(os.urandom(size))
+        entries.append(AssetEntry(name=f"Asset{i:05d}", location=f"Content/Asset{i:05d}",
+                                  type="Mega", url=f"https://mega.nz/file/{handle}#key{i}"))
+    return entries
+
+
+def sync(work: Path, entries: list[AssetEntry], batch: bool) -> float:
+    project = work / ("batched" if batch else "single")
+    runner  = SyncRunner(project, project / "Temp", log_callback=lambda _: None, batch=batch)
+    start   = time.perf_counter()
+    summary = runner.run(entries)
+    elapsed = time.perf_counter() - start
+    assert not summary.failed, summary.failed
+
+    # every asset must have landed in its own location
+    for i, entry in enumerate(entries):
+        assert (project / entry.location / f"asset_{i:05d}.bin").is_file(), entry.name
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets",  type=int,   default=100)
+    parser.add_argument("--size-kb", type=int,   default=64)
+    parser.add_argument("--startup", type=float, default=0.3, help="simulated seconds per megatools run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        entries = build_assets(work / "remote", args.assets, args.size_kb * 1024)
+        os.environ["FAKE_MEGA_ROOT"]    = str(work / "remote")
+        os.environ["FAKE_MEGA_STARTUP"] = str(args.startup)
+        os.environ[MegaProvider.ENV_COMMAND] = shlex.join([sys.executable, str(FAKE_TOOL)])
+
+        single  = sync(work, entries, batch=False)
+        batched = sync(work, entries, batch=True)
+
+    print(f"{args.assets} assets x {args.size_kb} KB, {args.startup:.2f} s startup per run")
+    print(f"  one run per asset: {single:7.2f} s")
+    print(f"  batched:           {batched:7.2f} s   ({single / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
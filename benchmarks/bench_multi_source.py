@@ -0,0 +1,79 @@
+"""
+One slow source vs the same entry with several sources.
+
+Three local servers hold the same payload with different per-connection
+caps. The slowest answers probes quickest (the others get a connection
+delay), as a congested nearby edge would, so a cold run starts there and
+has to hedge its way to a faster source; a warm run starts on the
+fastest host thanks to the throughput HostStats kept. Run from the repo
+root:
+
+    python benchmarks/bench_multi_source.py --size-mb 32 --rates-mb 0.5 4 16
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import AssetEntry               # noqa: E402
+from host_stats import HostStats            # noqa: E402
+from http_provider import HttpProvider      # noqa: E402
+from local_server import serve, write_random_file    # noqa: E402
+from multi_source import MultiSourceProvider         # noqa: E402
+
+MB = 1024 * 1024
+
+
+def _quiet(_line: str) -> None:
+    pass
+
+
+def _download(provider, url: str, dest: Path, entry: AssetEntry, size: int) -> float:
+    began  = time.perf_counter()
+    result = provider.download(url, dest, _quiet, entry)
+    took   = time.perf_counter() - began
+    if result is None or result.stat().st_size != size:
+        raise SystemExit("download failed")
+    return took
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb",     type=int,   default=32)
+    parser.add_argument("--rates-mb",    type=float, nargs="+", default=[0.5, 4.0, 16.0],
+                        help="per-connection cap of each server, MB/s; the first is the entry's own url")
+    parser.add_argument("--hedge-below", type=float, default=1.0, help="MB/s")
+    parser.add_argument("--warm-runs",   type=int,   default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as servers:
+        tmp     = Path(tmp)
+        payload = write_random_file(tmp / "srv" / "payload.bin", args.size_mb * MB)
+        size    = payload.stat().st_size
+        urls    = []
+        for i, rate in enumerate(args.rates_mb):
+            base = servers.enter_context(serve(payload.parent, rate=rate * MB, handshake=0.02 if i else 0.0))
+            urls.append(f"{base}/payload.bin")
+        entry   = AssetEntry("bench", "", "HTTP", urls[0], sources=[{"url": url} for url in urls[1:]])
+        stats   = HostStats(tmp)
+
+        def multi() -> MultiSourceProvider:
+            return MultiSourceProvider([(HttpProvider(), url) for url in urls], stats, args.hedge_below * MB)
+
+        print(f"{args.size_mb} MB payload, servers at " + ", ".join(f"{r:g}" for r in args.rates_mb) + " MB/s\n")
+        print(f"{'run':<16}  {'s':>7}  {'MB/s':>7}  {'speedup':>8}")
+        single = _download(HttpProvider(), urls[0], tmp / "single", entry, size)
+        print(f"{'one source':<16}  {single:>7.2f}  {args.size_mb / single:>7.1f}  {1:>7.2f}x")
+        labels = ["cold, hedged"] + [f"warm #{i + 1}" for i in range(args.warm_runs)]
+        for i, label in enumerate(labels):
+            took = _download(multi(), urls[0], tmp / f"multi-{i}", entry, size)
+            print(f"{label:<16}  {took:>7.2f}  {args.size_mb / took:>7.1f}  {single / took:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
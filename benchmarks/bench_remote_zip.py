@@ -0,0 +1,88 @@
+"""
+Full download + filtered unzip vs reading only the selected members of a remote ZIP by range.
+
+Builds a ZIP of several equally sized top-level folders of random
+members, serves it from a local server with a bandwidth cap and a
+first-byte latency, and installs one folder both ways: downloading the
+whole archive and unpacking the matching members (what a server without
+range support gets), and extract_ranged(), which fetches the central
+directory and then only that folder's members. Run from the repo root:
+
+    python benchmarks/bench_remote_zip.py --size-mb 256 --folders 16 --members 64 --rate-mb 32
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from base_extractor import MemberFilter         # noqa: E402
+from extractor import extract, extract_ranged   # noqa: E402
+from http_provider import HttpProvider          # noqa: E402
+from local_server import serve                  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def _quiet(_line: str) -> None:
+    pass
+
+
+def build_archive(path: Path, folders: int, members: int, total_bytes: int) -> None:
+    """Half random, half zeros per member: deflates ~2:1."""
+    size = max(1, total_bytes // (folders * members))
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for f in range(folders):
+            for m in range(members):
+                zf.writestr(f"Folder{f:02}/member{m:04}.bin", os.urandom(size // 2) + bytes(size - size // 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int,   default=256, help="uncompressed size of the archive")
+    parser.add_argument("--folders", type=int,   default=16)
+    parser.add_argument("--members", type=int,   default=64, help="per folder")
+    parser.add_argument("--rate-mb", type=float, default=32.0, help="server bandwidth cap, MB/s")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds before each response's first byte")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp     = Path(tmp)
+        archive = tmp / "srv" / "big.zip"
+        archive.parent.mkdir()
+        build_archive(archive, args.folders, args.members, args.size_mb * MB)
+        select  = MemberFilter(["Folder03"], [])
+        size    = archive.stat().st_size
+
+        with serve(archive.parent, rate=args.rate_mb * MB, latency=args.latency) as base:
+            url   = f"{base}/big.zip"
+            began = time.perf_counter()
+            file  = HttpProvider().download(url, tmp / "dl", _quiet)
+            full  = extract(file, tmp / "full", _quiet, select=select)
+            whole = time.perf_counter() - began
+
+            began = time.perf_counter()
+            with HttpProvider().open_ranged(url, _quiet) as ranged:
+                partial = extract_ranged(ranged, tmp / "ranged", _quiet, select=select)
+            took = time.perf_counter() - began
+
+        if full is None or partial is None or sorted(full.files) != sorted(partial.files):
+            raise SystemExit("extraction failed")
+        shutil.rmtree(tmp / "dl")
+
+        print(f"{size / MB:.0f} MB archive, {args.folders} folders, one selected "
+              f"({len(partial.files)} members), {args.rate_mb:g} MB/s\n")
+        print(f"{'run':<24}  {'s':>7}  {'MB in':>7}  {'requests':>8}  {'speedup':>8}")
+        print(f"{'download + unzip':<24}  {whole:>7.2f}  {size / MB:>7.1f}  {1:>8}  {1:>7.2f}x")
+        print(f"{'byte ranges':<24}  {took:>7.2f}  {ranged.fetched / MB:>7.1f}  {ranged.requests:>8}  "
+              f"{whole / took:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Single-stream vs segmented HttpProvider downloads.
+
+A local range-capable server caps every connection at --rate bytes/s,
+standing in for a high-latency link where one TCP stream can't fill
+the pipe. Run from the repo root:
+
+    python benchmarks/bench_segmented_http.py --size-mb 64 --rate-mb 8 --segments 1 4 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import AssetEntry              # noqa: E402
+from http_provider import HttpProvider     # noqa: E402
+from local_server import serve, write_random_file   # noqa: E402
+
+MB = 1024 * 1024
+
+
+def _quiet(_line: str) -> None:
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb",  type=int,   default=64)
+    parser.add_argument("--rate-mb",  type=float, default=8.0, help="per-connection cap, MB/s")
+    parser.add_argument("--latency",  type=float, default=0.05, help="first-byte latency, s")
+    parser.add_argument("--segments", type=int,   nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat",   type=int,   default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp     = Path(tmp)
+        payload = write_random_file(tmp / "srv" / "payload.bin", args.size_mb * MB)
+
+        with serve(payload.parent, rate=args.rate_mb * MB, latency=args.latency) as base:
+            url = f"{base}/payload.bin"
+            print(f"{args.size_mb} MB payload, {args.rate_mb:g} MB/s per connection\n")
+            print(f"{'segments':>8}  {'best s':>8}  {'MB/s':>8}  {'speedup':>8}")
+
+            baseline = None
+            for segments in args.segments:
+                entry = AssetEntry("bench", "", "HTTP", url,
+                                   segments=segments, min_segment_size=MB)
+                times = []
+                for i in range(args.repeat):
+                    dest = tmp / f"dl-{segments}-{i}"
+                    began = time.perf_counter()
+                    result = HttpProvider().download(url, dest, _quiet, entry)
+                    times.append(time.perf_counter() - began)
+                    if result is None or result.stat().st_size != payload.stat().st_size:
+                        raise SystemExit(f"download failed at segments={segments}")
+                    result.unlink()
+
+                best = min(times)
+                baseline = baseline or best
+                print(f"{segments:>8}  {best:>8.2f}  {args.size_mb / best:>8.1f}  {baseline / best:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
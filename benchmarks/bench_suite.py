@@ -0,0 +1,242 @@
+"""
+End-to-end benchmark suite for the download → extract → install pipeline.
+
+Generates synthetic catalogs (see synthetic.PROFILES) with loose files and
+archives in every supported format, serves them from a local HTTP server
+(local_server.py) or the fake megatools (fake_megatools.py), and syncs
+them with SyncRunner in each mode. Every sync runs in a fresh child
+process, which reports
+
+    seconds        wall time of SyncRunner.run() (median of --repeat runs)
+    peak_rss_mb    the process's peak resident memory
+    bytes_written  bytes written to files by the process and the tools it ran
+                   (Linux /proc/self/io; not measured elsewhere)
+
+Results can be saved as a baseline and later runs compared against it;
+anything slower / bigger than the baseline by more than --tolerance is
+flagged and the exit code is 1, so CI can gate on it. Keep one baseline
+per machine — timings don't transfer. Run from the repo root:
+
+    python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --profiles many-small --modes sequential async --scale 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+from local_server import serve       # noqa: E402
+import synthetic                     # noqa: E402
+
+FAKE_TOOL = HERE / "fake_megatools.py"
+
+# mode → SyncRunner keyword arguments
+MODES = {
+    "sequential": {},
+    "pipelined":  {"jobs": 4, "extract_jobs": 2},
+    "async":      {"async_jobs": 16, "extract_jobs": 2},
+    "stream":     {"stream": True},
+    "batch":      {"batch": True},
+    "resync":     {},           # second run over an installed project: the up-to-date checks
+}
+
+# modes that only make sense for one provider (fake Mega links can't be probed, so never count as up to date)
+_ONLY = {"stream": "HTTP", "batch": "Mega", "resync": "HTTP"}
+
+# a timing counts as a regression only past this absolute slack too, so
+# sub-second scenarios don't flap on scheduler noise
+_SLACK_SECONDS = 0.05
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles",  nargs="+", default=list(synthetic.PROFILES), choices=list(synthetic.PROFILES))
+    parser.add_argument("--modes",     nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--scale",     type=float, default=1.0, help="grow / shrink every profile")
+    parser.add_argument("--repeat",    type=int,   default=3)
+    parser.add_argument("--seed",      type=int,   default=1)
+    parser.add_argument("--mega-startup", type=float, default=0.05, help="simulated seconds per megatools run")
+    parser.add_argument("--baseline",  type=Path,  help="compare against this baseline file")
+    parser.add_argument("--save-baseline", type=Path, help="write the results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown / growth vs the baseline")
+    parser.add_argument("--child",     action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(json.load(sys.stdin))
+        return
+
+    meta = {"scale": args.scale, "seed": args.seed, "mega_startup": args.mega_startup,
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count()}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name in args.profiles:
+            results.update(_run_profile(synthetic.PROFILES[name], args, tmp / name))
+
+    _print_table(results)
+    report = {"meta": meta, "results": results}
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=4), encoding="utf-8")
+        print(f"\nBaseline written to {args.save_baseline}")
+    if args.baseline:
+        regressions = _compare(json.loads(args.baseline.read_text(encoding="utf-8")), report, args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+# ── scenarios ─────────────────────────────────────────────────────────
+
+def _run_profile(profile: synthetic.Profile, args, work: Path) -> dict:
+    began = time.perf_counter()
+    made  = synthetic.build_remote(profile, work / "remote", args.scale, args.seed)
+    size  = sum(f.stat().st_size for f in (work / "remote").rglob("*") if f.is_file())
+    print(f"{profile.name}: {len(made)} asset(s), {size / synthetic.MB:.1f} MB "
+          f"(generated in {time.perf_counter() - began:.1f} s)", flush=True)
+
+    env = dict(os.environ)
+    if profile.provider == "Mega":
+        env["FAKE_MEGA_ROOT"]      = str(work / "remote")
+        env["FAKE_MEGA_STARTUP"]   = str(args.mega_startup)
+        env["ASSETPULL_MEGATOOLS"] = shlex.join([sys.executable, str(FAKE_TOOL)])
+
+    results = {}
+    with ExitStack() as stack:
+        base    = None if profile.provider == "Mega" else stack.enter_context(serve(work / "remote"))
+        entries = synthetic.entries_for(profile, made, base)
+        for mode in args.modes:
+            if _ONLY.get(mode, profile.provider) != profile.provider:
+                continue
+            runs = [_run_child(work / f"{mode}-{n}", entries, mode, env) for n in range(args.repeat)]
+            results[f"{profile.name}/{mode}"] = {
+                "seconds":       round(statistics.median(r["seconds"] for r in runs), 4),
+                "peak_rss_mb":   round(max(r["peak_rss"] for r in runs) / synthetic.MB, 1),
+                "bytes_written": runs[0]["bytes_written"],
+            }
+            print(f"  {mode:<11} {results[f'{profile.name}/{mode}']['seconds']:8.3f} s", flush=True)
+    return results
+
+
+def _run_child(project: Path, entries: list[dict], mode: str, env: dict) -> dict:
+    spec = {"project": str(project), "entries": entries, "mode": mode}
+    proc = subprocess.run([sys.executable, __file__, "--child"], input=json.dumps(spec),
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise SystemExit(f"{mode} run failed:\n{proc.stdout[-2000:]}{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _child(spec: dict) -> None:
+    """One sync in this (fresh) process; prints its measurements as the last JSON line."""
+    from config import AssetEntry
+    from sync_runner import SyncRunner
+    from sync_state import SyncState
+
+    project = Path(spec["project"])
+    entries = [AssetEntry(**entry) for entry in spec["entries"]]
+    options = dict(MODES[spec["mode"]])
+
+    def sync():
+        state   = SyncState(project / "Config") if spec["mode"] == "resync" else None
+        runner  = SyncRunner(project, project / "Temp", log_callback=lambda _: None, state=state, **options)
+        summary = runner.run(entries)
+        if summary.failed:
+            raise SystemExit(f"{len(summary.failed)} asset(s) failed: {summary.failed[:5]}")
+        return summary
+
+    if spec["mode"] == "resync":
+        sync()                          # install first; only the second run is measured
+
+    written = _bytes_written()
+    began   = time.perf_counter()
+    summary = sync()
+    seconds = time.perf_counter() - began
+    if spec["mode"] == "resync" and len(summary.up_to_date) != len(entries):
+        raise SystemExit("resync re-installed assets that were up to date")
+    after   = _bytes_written()
+
+    print(json.dumps({"seconds": seconds, "peak_rss": _peak_rss(),
+                      "bytes_written": None if written is None else after - written}))
+
+
+# ── measurements ──────────────────────────────────────────────────────
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes (0 where it can't be read)."""
+    try:
+        import resource
+    except ImportError:                 # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _bytes_written() -> int | None:
+    """
+    Bytes this process has passed to write() so far, including reaped child
+    processes (megatools), from /proc/self/io; None where that's unavailable.
+    """
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "wchar":
+                    return int(value)
+    except OSError:
+        pass
+    return None
+
+
+# ── reporting ─────────────────────────────────────────────────────────
+
+def _print_table(results: dict) -> None:
+    print(f"\n{'scenario':<28} {'seconds':>9} {'peak RSS':>10} {'written':>11}")
+    for key, r in results.items():
+        written = "—" if r["bytes_written"] is None else f"{r['bytes_written'] / synthetic.MB:8.1f} MB"
+        print(f"{key:<28} {r['seconds']:9.3f} {r['peak_rss_mb']:7.1f} MB {written:>11}")
+
+
+def _compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Print the changes against the baseline; returns the regressions."""
+    if baseline.get("meta", {}).get("scale") != current["meta"]["scale"]:
+        print("\nBaseline was recorded at a different --scale; not comparing.")
+        return []
+
+    print(f"\nAgainst the baseline (tolerance {tolerance:.0%}):")
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            print(f"  {key:<28} new scenario")
+            continue
+        for metric, slack in (("seconds", _SLACK_SECONDS), ("peak_rss_mb", 1.0), ("bytes_written", 0)):
+            old, new = before.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            flag   = new > old * (1 + tolerance) and new - old > slack
+            if flag:
+                regressions.append(f"{key} {metric}")
+            if flag or abs(change) > tolerance:
+                print(f"  {key:<28} {metric:<14} {old:>12g} → {new:<12g} "
+                      f"{change:+.0%}{'  REGRESSION' if flag else ''}")
+    print(f"  {len(regressions)} regression(s)" if regressions else "  no regressions")
+    return regressions
+
+
+if __name__ == "__main__":
+    main()
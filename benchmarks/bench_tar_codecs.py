@@ -0,0 +1,117 @@
+"""
+Unpacking the same tarball compressed as .tar.gz, .tar.xz, .tar.zst and .tar.lz4.
+
+Builds one synthetic tar (mixed small and large, moderately compressible
+members), compresses it with each codec available here and times
+extractor.extract on every archive. .tar.zst is written twice: as one
+frame (what `zstd` writes) and as independent frames of --frame-mb each
+(what `pzstd` writes), the latter timed for each --workers count. zstd
+and lz4 rows need `pip install zstandard lz4`. Run from the repo root:
+
+    python benchmarks/bench_tar_codecs.py --members 2000 --size-mb 256 --workers 1 4 8
+"""
+
+import argparse
+import gzip
+import importlib.util
+import lzma
+import os
+import random
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from extractor import extract   # noqa: E402
+
+MB = 1024 * 1024
+
+
+def build_tar(path: Path, members: int, total_bytes: int, seed: int = 1) -> None:
+    """~90% small members, ~10% large ones carrying most of the bytes."""
+    rng   = random.Random(seed)
+    large = max(1, members // 10)
+    sizes = [rng.randint(1024, 16 * 1024) for _ in range(members - large)]
+    rest  = max(0, total_bytes - sum(sizes))
+    sizes += [rest // large] * large
+    rng.shuffle(sizes)
+
+    # half random, half zeros: compresses ~2:1 and still costs real decode time
+    block = os.urandom(MB // 2) + bytes(MB // 2)
+    src   = path.with_suffix(".src")
+    for i, size in enumerate(sizes):
+        member = src / f"dir{i % 97:02d}" / f"member{i:06d}.bin"
+        member.parent.mkdir(parents=True, exist_ok=True)
+        member.write_bytes((block * (size // len(block) + 1))[:size])
+    with tarfile.open(path, "w") as tf:
+        tf.add(src, arcname="pack")
+    shutil.rmtree(src)
+
+
+def compress(tar: Path, out_dir: Path, frame_mb: int) -> dict[str, Path]:
+    """Label → archive, for every codec available here."""
+    made = {}
+
+    def write(label: str, name: str, opener) -> None:
+        made[label] = out_dir / name
+        with open(tar, "rb") as src, opener(made[label]) as out:
+            shutil.copyfileobj(src, out, MB)
+
+    write("tar.gz", "bench.tar.gz", lambda p: gzip.open(p, "wb", compresslevel=6))
+    write("tar.xz", "bench.tar.xz", lambda p: lzma.open(p, "wb", preset=6))
+    if importlib.util.find_spec("zstandard") is not None:
+        import zstandard
+        cctx = zstandard.ZstdCompressor(level=3)
+        write("tar.zst", "bench.tar.zst", lambda p: cctx.stream_writer(open(p, "wb")))
+        made["tar.zst frames"] = out_dir / "frames.tar.zst"
+        with open(tar, "rb") as src, open(made["tar.zst frames"], "wb") as out:
+            while chunk := src.read(frame_mb * MB):
+                out.write(cctx.compress(chunk))
+    if importlib.util.find_spec("lz4") is not None:
+        import lz4.frame
+        write("tar.lz4", "bench.tar.lz4", lambda p: lz4.frame.open(p, "wb"))
+    return made
+
+
+def _time(archive: Path, dest: Path, workers: int) -> float:
+    shutil.rmtree(dest, ignore_errors=True)
+    began = time.perf_counter()
+    if extract(archive, dest, lambda _: None, workers=workers) is None:
+        sys.exit(f"extracting {archive.name} failed")
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members",  type=int, default=2000)
+    parser.add_argument("--size-mb",  type=int, default=128)
+    parser.add_argument("--frame-mb", type=int, default=4, help="frame size of the multi-frame .tar.zst")
+    parser.add_argument("--workers",  type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--repeat",   type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        tar = tmp / "bench.tar"
+        build_tar(tar, args.members, args.size_mb * MB)
+        archives = compress(tar, tmp, args.frame_mb)
+        print(f"{args.members} members, {tar.stat().st_size / MB:.0f} MB tar, {os.cpu_count()} CPUs\n")
+
+        runs = [(label, 1) for label in archives if label != "tar.zst frames"]
+        runs += [("tar.zst frames", workers) for workers in args.workers if "tar.zst frames" in archives]
+        baseline = None
+        print(f"{'archive':>16}  {'threads':>7}  {'MB':>6}  {'best s':>8}  {'vs tar.gz':>9}")
+        for label, workers in runs:
+            archive = archives[label]
+            best = min(_time(archive, tmp / "out", workers) for _ in range(args.repeat))
+            baseline = baseline or best         # tar.gz runs first
+            print(f"{label:>16}  {workers:>7}  {archive.stat().st_size / MB:>6.1f}  "
+                  f"{best:>8.2f}  {baseline / best:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
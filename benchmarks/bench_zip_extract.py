@@ -0,0 +1,82 @@
+"""
+ZipFile.extractall vs extractor.extract with a thread pool.
+
+Builds a synthetic many-member deflated ZIP (mixed small and large,
+moderately compressible members) and unpacks it repeatedly. Run from
+the repo root:
+
+    python benchmarks/bench_zip_extract.py --members 20000 --size-mb 512 --workers 1 4 8 16
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from extractor import extract   # noqa: E402
+
+MB = 1024 * 1024
+
+
+def build_archive(path: Path, members: int, total_bytes: int, seed: int = 1) -> None:
+    """~90% small members, ~10% large ones carrying most of the bytes."""
+    rng   = random.Random(seed)
+    large = max(1, members // 10)
+    sizes = [rng.randint(1024, 16 * 1024) for _ in range(members - large)]
+    rest  = max(0, total_bytes - sum(sizes))
+    sizes += [rest // large] * large
+    rng.shuffle(sizes)
+
+    # half random, half zeros: compresses ~2:1 and still costs real inflate time
+    block = os.urandom(MB // 2) + bytes(MB // 2)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for i, size in enumerate(sizes):
+            data = (block * (size // len(block) + 1))[:size]
+            zf.writestr(f"pack/dir{i % 97:02d}/member{i:06d}.bin", data)
+
+
+def _time(fn, dest: Path) -> float:
+    shutil.rmtree(dest, ignore_errors=True)
+    began = time.perf_counter()
+    fn(dest)
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--repeat",  type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp     = Path(tmp)
+        archive = tmp / "synthetic.zip"
+        build_archive(archive, args.members, args.size_mb * MB)
+        print(f"{args.members} members, {args.size_mb} MB uncompressed, "
+              f"{archive.stat().st_size / MB:.0f} MB archive, {os.cpu_count()} CPUs\n")
+
+        def extractall(dest: Path):
+            with zipfile.ZipFile(archive) as zf:
+                zf.extractall(dest)
+
+        baseline = min(_time(extractall, tmp / "out") for _ in range(args.repeat))
+        print(f"{'method':>16}  {'best s':>8}  {'speedup':>8}")
+        print(f"{'extractall':>16}  {baseline:>8.2f}  {1:>7.2f}x")
+
+        for workers in args.workers:
+            run = lambda dest: extract(archive, dest, lambda _: None, workers=workers)   # noqa: E731
+            best = min(_time(run, tmp / "out") for _ in range(args.repeat))
+            print(f"{f'{workers} thread(s)':>16}  {best:>8.2f}  {baseline / best:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Resume and retry checks for HttpProvider against a failing local server.
+
+Each scenario downloads a random payload from local_server.serve() set
+up to misbehave — cutting every response off partway, answering 503, or
+changing the file between attempts — and checks the download ends up
+byte-identical to what the server holds, and that it got there the
+intended way (resumed rather than restarted, backed off, ...). Exits 1
+on the first scenario that fails. Run from the repo root:
+
+    python benchmarks/check_http_resume.py --size-mb 8 --cut-kb 768
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import AssetEntry              # noqa: E402
+from http_provider import HttpProvider, _meta_path, _write_meta   # noqa: E402
+from integrity import StreamHash           # noqa: E402
+from local_server import serve, write_random_file   # noqa: E402
+
+MB = 1024 * 1024
+KB = 1024
+
+
+class _FastRetries(HttpProvider):
+    BACKOFF_BASE = 0.01
+    MAX_RETRIES  = 100
+
+
+class _NoRetries(HttpProvider):
+    MAX_RETRIES = 0
+
+
+class _Log(list):
+    def __call__(self, line: str) -> None:
+        self.append(line)
+
+    def count(self, pattern: str) -> int:
+        return sum(1 for line in self if re.search(pattern, line))
+
+
+def _same(path: Path | None, payload: Path) -> bool:
+    return path is not None and path.read_bytes() == payload.read_bytes()
+
+
+def check_drops(tmp: Path, payload: Path, cut: int) -> str:
+    """Every response is cut after `cut` bytes: one run keeps resuming until it's complete."""
+    log = _Log()
+    with serve(payload.parent, cut_after=cut) as base:
+        result = _FastRetries().download(f"{base}/{payload.name}", tmp / "drops", log)
+    if not _same(result, payload):
+        raise AssertionError("download differs from the payload")
+    expected = -(-payload.stat().st_size // cut) - 1
+    if log.count(r"Resuming at") != expected:
+        raise AssertionError(f"{log.count('Resuming at')} resumes, expected {expected}")
+    return f"{expected} drops, resumed each time"
+
+
+def check_across_runs(tmp: Path, payload: Path, cut: int) -> str:
+    """A run that gives up leaves .part + sidecar; the next run continues from them."""
+    dest = tmp / "runs"
+    log  = _Log()
+    with serve(payload.parent, cut_after=cut, cuts=1) as base:
+        url = f"{base}/{payload.name}"
+        if _NoRetries().download(url, dest, _Log()) is not None:
+            raise AssertionError("first run should have failed")
+        part = dest / (payload.name + HttpProvider.PARTIAL_SUFFIX)
+        if part.stat().st_size != cut:
+            raise AssertionError(f".part holds {part.stat().st_size} bytes, expected {cut}")
+        result = HttpProvider().download(url, dest, log)
+    if not _same(result, payload) or not log.count(rf"Resuming at {cut} bytes"):
+        raise AssertionError("second run didn't resume the .part file")
+    return f"second run resumed at {cut} bytes"
+
+
+def check_changed_remote(tmp: Path, payload: Path, cut: int) -> str:
+    """If-Range: a .part of an older version of the file is discarded, not spliced."""
+    dest = tmp / "changed"
+    log  = _Log()
+    with serve(payload.parent, cut_after=cut, cuts=1) as base:
+        url = f"{base}/{payload.name}"
+        _NoRetries().download(url, dest, _Log())
+        write_random_file(payload, payload.stat().st_size)      # same size, new content and ETag
+        result = HttpProvider().download(url, dest, log)
+    if not _same(result, payload) or log.count(r"Resuming at"):
+        raise AssertionError("stale .part wasn't restarted from zero")
+    return "stale .part restarted from zero"
+
+
+def check_shrunk_remote(tmp: Path, payload: Path, cut: int) -> str:
+    """A .part longer than the file (416 to its Range) is dropped and the download retried."""
+    dest = tmp / "shrunk"
+    log  = _Log()
+    with serve(payload.parent, cut_after=cut, cuts=1) as base:
+        url = f"{base}/{payload.name}"
+        _NoRetries().download(url, dest, _Log())
+        part = dest / (payload.name + HttpProvider.PARTIAL_SUFFIX)
+        with open(part, "ab") as f:                             # now past the end of the file,
+            f.write(os.urandom(payload.stat().st_size))         # with the sidecar still matching
+        result = _FastRetries().download(url, dest, log)
+    if not _same(result, payload) or not log.count(r"shrank"):
+        raise AssertionError("416 didn't restart the download")
+    return "416 restarted from zero"
+
+
+def check_complete_part(tmp: Path, payload: Path) -> str:
+    """A .part already as long as the file is promoted only after the server confirms it."""
+    dest = tmp / "complete"
+    part = dest / (payload.name + HttpProvider.PARTIAL_SUFFIX)
+    with serve(payload.parent) as base:
+        url = f"{base}/{payload.name}"
+
+        def leave_complete_part() -> None:
+            dest.mkdir(exist_ok=True)
+            shutil.copyfile(payload, part)
+            os.utime(part, (0, 0))                              # a rewrite would show in the mtime
+            etag = HttpProvider().probe(url, _Log())["etag"]
+            _write_meta(_meta_path(part), {"url": url, "validator": etag, "total": payload.stat().st_size})
+
+        leave_complete_part()
+        result = HttpProvider().download(url, dest, _Log())
+        if not _same(result, payload) or result.stat().st_mtime != 0:
+            raise AssertionError("a current complete .part wasn't promoted as it was")
+
+        leave_complete_part()
+        write_random_file(payload, payload.stat().st_size)      # same size, new content and ETag
+        result = HttpProvider().download(url, dest, _Log())
+        if not _same(result, payload):
+            raise AssertionError("a stale complete .part was promoted")
+    return "current part kept, stale part downloaded again"
+
+
+def check_backoff(tmp: Path, payload: Path) -> str:
+    """503s are retried with doubling delays."""
+    log = _Log()
+    with serve(payload.parent, fail_first=3) as base:
+        result = _FastRetries().download(f"{base}/{payload.name}", tmp / "backoff", log)
+    delays = [float(m.group(1)) for line in log if (m := re.search(r"retrying in ([\d.]+)s", line))]
+    if not _same(result, payload) or delays != [0.01, 0.02, 0.04]:
+        raise AssertionError(f"retry delays {delays}")
+    return "delays " + ", ".join(f"{d:g}s" for d in delays)
+
+
+def check_segmented(tmp: Path, payload: Path, cut: int) -> str:
+    """Segmented mode: every range is cut short and resumed from where it stopped."""
+    log = _Log()
+    entry = AssetEntry("check", "", "HTTP", "", segments=4, min_segment_size=cut)
+    with serve(payload.parent, cut_after=cut) as base:
+        entry.url = f"{base}/{payload.name}"
+        result = _FastRetries().download(entry.url, tmp / "segmented", log, entry)
+    if not _same(result, payload):
+        raise AssertionError("segmented download differs from the payload")
+    return f"{log.count('retrying')} segment retries"
+
+
+def check_async(tmp: Path, payload: Path, cut: int) -> str:
+    """Async mode: the same drops, resumed, with the hash rewound over each kept .part."""
+    log    = _Log()
+    digest = StreamHash()
+
+    async def run(url: str) -> Path | None:
+        try:
+            return await _FastRetries().download_async(url, tmp / "async", log, None, None, digest)
+        finally:
+            await HttpProvider.close_async()
+
+    with serve(payload.parent, cut_after=cut) as base:
+        result = asyncio.run(run(f"{base}/{payload.name}"))
+    if not _same(result, payload):
+        raise AssertionError("async download differs from the payload")
+    if digest.hexdigest() != hashlib.sha256(payload.read_bytes()).hexdigest():
+        raise AssertionError("streamed hash doesn't match the payload")
+    return f"{log.count('Resuming at')} drops resumed, hash matches"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--cut-kb",  type=int, default=768, help="bytes of each response before the drop")
+    args = parser.parse_args()
+
+    cut = args.cut_kb * KB
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp     = Path(tmp)
+        payload = write_random_file(tmp / "srv" / "payload.bin", args.size_mb * MB)
+        checks  = [
+            ("dropped connections",   lambda: check_drops(tmp, payload, cut)),
+            ("resume across runs",    lambda: check_across_runs(tmp, payload, cut)),
+            ("remote changed",        lambda: check_changed_remote(tmp, payload, cut)),
+            ("remote shrank (416)",   lambda: check_shrunk_remote(tmp, payload, cut)),
+            ("complete .part",        lambda: check_complete_part(tmp, payload)),
+            ("backoff on 503",        lambda: check_backoff(tmp, payload)),
+            ("segmented, dropped",    lambda: check_segmented(tmp, payload, cut)),
+            ("async, dropped",        lambda: check_async(tmp, payload, cut)),
+        ]
+        for name, check in checks:
+            try:
+                print(f"{name:<22}  ok    {check()}")
+            except AssertionError as e:
+                print(f"{name:<22}  FAIL  {e}")
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
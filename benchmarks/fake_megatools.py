@@ -0,0 +1,70 @@
+"""
+Stand-in for `megatools dl`, for exercising MegaProvider without Mega.
+
+Links resolve to files under $FAKE_MEGA_ROOT: the link
+https://mega.nz/file/<handle>#<key> serves the single file in
+<root>/<handle>/. Output mimics megatools: progress lines, then
+"Downloaded <name>" per link, or "ERROR: Download failed for '<link>'"
+on stderr. $FAKE_MEGA_STARTUP adds that many seconds of simulated
+startup / handshake per invocation.
+
+Point AssetPull at it with:
+
+    ASSETPULL_MEGATOOLS="python benchmarks/fake_megatools.py"
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+
+_HANDLE_RE = re.compile(r"mega(?:\.co)?\.nz/(?:file/|#!)(?P<handle>[\w-]+)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="megatools")
+    parser.add_argument("command", choices=["dl"])
+    parser.add_argument("--path", default=".")
+    parser.add_argument("--no-progress", action="store_true")
+    parser.add_argument("links", nargs="+")
+    args = parser.parse_args()
+
+    root = Path(os.environ.get("FAKE_MEGA_ROOT", "."))
+    time.sleep(float(os.environ.get("FAKE_MEGA_STARTUP", "0")))
+
+    failed = 0
+    for link in args.links:
+        m      = _HANDLE_RE.search(link)
+        folder = root / m.group("handle") if m else None
+        files  = sorted(folder.iterdir()) if folder is not None and folder.is_dir() else []
+        if not files:
+            print(f"ERROR: Download failed for '{link}': Not found", file=sys.stderr, flush=True)
+            failed += 1
+            continue
+
+        source = files[0]
+        target = Path(args.path) / source.name
+        if target.exists():
+            print(f"ERROR: Download failed for '{link}': File already exists at {target}",
+                  file=sys.stderr, flush=True)
+            failed += 1
+            continue
+
+        total = source.stat().st_size
+        if not args.no_progress:
+            for pct in (50, 100):
+                done = total * pct // 100
+                print(f"\r{source.name}: {pct:.2f}% - {done / 1048576:.1f} MiB ({done} bytes) "
+                      f"of {total / 1048576:.1f} MiB (1.0 MiB/s)", end="", flush=True)
+            print("\r", end="")
+        shutil.copyfile(source, target)
+        print(f"Downloaded {source.name}", flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
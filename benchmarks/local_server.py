@@ -0,0 +1,160 @@
+"""
+Local HTTP file server for benchmarks.
+
+Serves a directory with HEAD / Range / If-Range support and an optional
+per-connection bandwidth cap plus first-byte latency, which is what makes
+a single stream slow on a real high-latency link. A per-connection
+handshake delay stands in for TCP + TLS setup to a distant host.
+
+For failure testing it can also cut response bodies off after a number
+of bytes (closing the connection, as a dropped link would) and answer
+the first few GETs with 503.
+"""
+
+import http.server
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+_BLOCK    = 64 * 1024
+
+
+def _make_handler(root: Path, rate: float | None, latency: float, handshake: float,
+                  cut_after: int | None, cuts: int | None, fail_first: int):
+    budget = {"cuts": cuts, "failures": fail_first}     # None: no limit
+    lock   = threading.Lock()
+
+    def spend(key: str) -> bool:
+        with lock:
+            if budget[key] is None:
+                return True
+            if budget[key] <= 0:
+                return False
+            budget[key] -= 1
+            return True
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True     # headers and body go out in separate writes
+
+        def setup(self):
+            if handshake:
+                time.sleep(handshake)
+            super().setup()
+
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            self._serve(body=False)
+
+        def do_GET(self):
+            if spend("failures"):
+                self.send_error(503)
+                return
+            self._serve(body=True)
+
+        def _serve(self, body: bool):
+            path = root / self.path.split("?")[0].lstrip("/")
+            if not path.is_file():
+                self.send_error(404)
+                return
+
+            st    = path.stat()
+            size  = st.st_size
+            etag  = f'"{st.st_mtime_ns:x}-{size:x}"'
+            start, end, status = 0, size - 1, 200
+
+            rng = _RANGE_RE.match(self.headers.get("Range", ""))
+            if rng and (rng.group(1) or rng.group(2)) and self.headers.get("If-Range", etag) == etag:
+                if rng.group(1):
+                    start = int(rng.group(1))
+                    end   = min(int(rng.group(2)) if rng.group(2) else size - 1, size - 1)
+                else:                                   # suffix range: the last N bytes
+                    start = max(0, size - int(rng.group(2)))
+                if start >= size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+
+            self.send_response(status)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(end - start + 1))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if not body:
+                return
+
+            if latency:
+                time.sleep(latency)
+            with open(path, "rb") as f:
+                f.seek(start)
+                left  = end - start + 1
+                if cut_after is not None and cut_after < left and spend("cuts"):
+                    left = cut_after
+                    self.close_connection = True    # short of Content-Length: the client sees a drop
+                began = time.perf_counter()
+                sent  = 0
+                while left:
+                    block = f.read(min(_BLOCK, left))
+                    try:
+                        self.wfile.write(block)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return          # the client gave up on this transfer
+                    sent += len(block)
+                    left -= len(block)
+                    if rate:
+                        ahead = sent / rate - (time.perf_counter() - began)
+                        if ahead > 0:
+                            time.sleep(ahead)
+
+    return Handler
+
+
+@contextmanager
+def serve(root: Path, rate: float | None = None, latency: float = 0.0, handshake: float = 0.0,
+          cut_after: int | None = None, cuts: int | None = None, fail_first: int = 0):
+    """
+    Serve `root` on an ephemeral localhost port for the duration of the block.
+
+    Args:
+        rate:       per-connection cap in bytes/s (None = unlimited).
+        latency:    seconds to wait before sending each response body.
+        handshake:  seconds to wait once per new connection.
+        cut_after:  drop the connection after sending this many bytes of a body (None = never).
+        cuts:       how many bodies to cut short that way (None = all of them).
+        fail_first: answer this many GETs with 503 before serving normally.
+
+    Yields the base URL, e.g. "http://127.0.0.1:54321".
+    """
+    handler = _make_handler(Path(root), rate, latency, handshake, cut_after, cuts, fail_first)
+    server  = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def write_random_file(path: Path, size: int) -> Path:
+    """Incompressible payload of `size` bytes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        left = size
+        while left:
+            n = min(left, 1024 * 1024)
+            f.write(os.urandom(n))
+            left -= n
+    return path
@@ -0,0 +1,164 @@
+"""
+Synthetic remote assets for the benchmark suite.
+
+Writes reproducible (seeded) loose files and archives in every format the
+extractor supports, laid out for local_server.serve() (HTTP) or
+fake_megatools.py (Mega), and returns the matching Database.json entries.
+"""
+
+import importlib.util
+import io
+import random
+import shutil
+import subprocess
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import extractor_registry      # bench_suite puts src/ on sys.path
+
+KB = 1024
+MB = 1024 * KB
+
+
+@dataclass(frozen=True)
+class Profile:
+    """A catalog shape: how many assets, how many members each, how big, in which formats."""
+    name:        str
+    assets:      int
+    members:     int            # per archive; loose files have one
+    member_size: int            # average bytes per member
+    formats:     tuple[str, ...] | None = None      # None: every format writers() offers
+    provider:    str = "HTTP"
+
+
+def writers() -> dict[str, Callable[[Path, list[tuple[str, bytes]]], None]]:
+    """Format → writer(path, members) for every format that can be produced and unpacked here."""
+    table = {
+        "file":    _write_file,
+        "zip":     _write_zip,
+        "tar":     lambda path, members: _write_tar(path, members, "w"),
+        "tar.gz":  lambda path, members: _write_tar(path, members, "w:gz"),
+        "tgz":     lambda path, members: _write_tar(path, members, "w:gz"),
+        "tar.bz2": lambda path, members: _write_tar(path, members, "w:bz2"),
+        "tar.xz":  lambda path, members: _write_tar(path, members, "w:xz"),
+    }
+    if importlib.util.find_spec("zstandard") is not None:
+        table["tar.zst"] = _write_tar_zst
+    if importlib.util.find_spec("lz4") is not None:
+        table["tar.lz4"] = _write_tar_lz4
+    if importlib.util.find_spec("py7zr") is not None:
+        table["7z"] = _write_7z
+    if shutil.which("rar"):
+        table["rar"] = _write_rar
+    unpackable = set(extractor_registry.available_formats())
+    return {fmt: write for fmt, write in table.items()
+            if fmt == "file" or extractor_registry.format_for_name(f"x.{fmt}") in unpackable}
+
+
+PROFILES = {
+    "many-small":   Profile("many-small",   120, 8,    8 * KB),
+    "few-large":    Profile("few-large",    7,   4,    4 * MB),
+    "many-members": Profile("many-members", 2,   5000, 2 * KB, ("zip", "tar.gz")),
+    "mega":         Profile("mega",         40,  4,    16 * KB, ("file", "zip"), provider="Mega"),
+}
+
+
+def build_remote(profile: Profile, remote: Path, scale: float = 1.0, seed: int = 1) -> list[tuple[str, str]]:
+    """
+    Write the profile's assets under `remote`. `scale` multiplies the asset
+    count (or, for profiles with only a few assets, the member size).
+    Returns (asset name, path relative to `remote`) pairs.
+    """
+    rng     = random.Random(seed)
+    table   = writers()
+    formats = [fmt for fmt in (profile.formats or table) if fmt in table]
+    assets  = max(1, round(profile.assets * scale)) if profile.assets >= 10 else profile.assets
+    size    = profile.member_size if profile.assets >= 10 else max(KB, int(profile.member_size * scale))
+
+    made = []
+    for i in range(assets):
+        fmt  = formats[i % len(formats)]
+        name = f"{profile.name}-{i:05d}"
+        members = [(f"{name}/dir{j % 16:02d}/member{j:05d}.bin", _payload(rng, rng.randint(size // 2, size * 3 // 2)))
+                   for j in range(1 if fmt == "file" else profile.members)]
+        # Mega links name a folder holding the single file to serve
+        folder = remote / (f"H{i:05d}" if profile.provider == "Mega" else profile.name)
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / (f"{name}.bin" if fmt == "file" else f"{name}.{fmt}")
+        table[fmt](path, members)
+        made.append((name, path.relative_to(remote).as_posix()))
+    return made
+
+
+def entries_for(profile: Profile, made: list[tuple[str, str]], base_url: str | None = None) -> list[dict]:
+    """Database.json entries for build_remote()'s assets; HTTP ones need the server's base URL."""
+    entries = []
+    for name, rel in made:
+        if profile.provider == "Mega":
+            url = f"https://mega.nz/file/{rel.split('/')[0]}#key"
+        else:
+            url = f"{base_url}/{rel}"
+        entries.append({"name": name, "location": f"Content/{name}", "type": profile.provider, "url": url})
+    return entries
+
+
+# ── writers ───────────────────────────────────────────────────────────
+
+def _payload(rng: random.Random, size: int) -> bytes:
+    # half random, half repetitive: compresses ~2:1 like typical game data
+    half = size // 2
+    return rng.randbytes(half) + (b"asset data " * (size // 11 + 1))[:size - half]
+
+
+def _write_file(path: Path, members: list[tuple[str, bytes]]) -> None:
+    path.write_bytes(members[0][1])
+
+
+def _write_zip(path: Path, members: list[tuple[str, bytes]]) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for name, data in members:
+            zf.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data,
+                        compress_type=zipfile.ZIP_DEFLATED)
+
+
+def _write_tar(path: Path, members: list[tuple[str, bytes]], mode: str) -> None:
+    with tarfile.open(path, mode) as tf:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size, info.mtime = len(data), 1704067200
+            tf.addfile(info, io.BytesIO(data))
+
+
+def _write_tar_zst(path: Path, members: list[tuple[str, bytes]]) -> None:
+    import zstandard
+    _write_tar(path.with_suffix(".raw"), members, "w")
+    with open(path.with_suffix(".raw"), "rb") as src, open(path, "wb") as out:
+        zstandard.ZstdCompressor().copy_stream(src, out)
+    path.with_suffix(".raw").unlink()
+
+
+def _write_tar_lz4(path: Path, members: list[tuple[str, bytes]]) -> None:
+    import lz4.frame
+    _write_tar(path.with_suffix(".raw"), members, "w")
+    with open(path.with_suffix(".raw"), "rb") as src, lz4.frame.open(path, "wb") as out:
+        shutil.copyfileobj(src, out)
+    path.with_suffix(".raw").unlink()
+
+
+def _write_7z(path: Path, members: list[tuple[str, bytes]]) -> None:
+    import py7zr
+    with py7zr.SevenZipFile(path, "w") as sz:
+        for name, data in members:
+            sz.writestr(data, name)
+
+
+def _write_rar(path: Path, members: list[tuple[str, bytes]]) -> None:
+    staging = path.with_suffix(".src")
+    for name, data in members:
+        (staging / name).parent.mkdir(parents=True, exist_ok=True)
+        (staging / name).write_bytes(data)
+    subprocess.run(["rar", "a", "-r", "-idq", str(path.resolve()), "."], cwd=staging, check=True)
+    shutil.rmtree(staging)
@@ -7,13 +7,31 @@ Usage:
 
     # CLI mode (syncs everything in the config, no prompts)
     python main.py --root_folder <PROJECT_ROOT> --config_folder <CONFIG_PATH>
+
+    # CLI mode, pipelined: 4 parallel downloads, 2 parallel extractions
+    python main.py --root_folder <PROJECT_ROOT> --config_folder <CONFIG_PATH> --jobs 4 --extract-jobs 2
+
+    # LAN mirror: serve this machine's download cache to the team...
+    python main.py --root_folder <PROJECT_ROOT> --config_folder <CONFIG_PATH> --cache-dir <CACHE> --serve 8765
+
+    # ...and sync from it first on the other workstations
+    python main.py --root_folder <PROJECT_ROOT> --config_folder <CONFIG_PATH> --peer http://build-pc:8765
 """
 
 import argparse
+import sys
 from pathlib import Path
 
+import provider_registry
+from chunk_store import ChunkStore
 from config import load_config
+from download_cache import DownloadCache
+from host_stats import HostStats
+from peer_server import PeerServer
+from progress import ConsoleProgress
 from sync_runner import SyncRunner
+from sync_state import SyncState
+from telemetry import Telemetry
 
 
 def main():
@@ -23,6 +41,24 @@ def main():
     parser.add_argument("--app",           action="store_true", help="Launch GUI")
     parser.add_argument("--root_folder",   required=True,       help="Project root directory")
     parser.add_argument("--config_folder", required=True,       help="Config directory (Database.json lives here)")
+    parser.add_argument("--jobs",          type=int,            help="CLI: parallel downloads (enables pipelined sync)")
+    parser.add_argument("--extract-jobs",  type=int,            help="CLI: parallel extractions (enables pipelined sync)")
+    parser.add_argument("--async-jobs",    type=int,            help="CLI: run up to N downloads concurrently on one event loop, reusing HTTP connections")
+    parser.add_argument("--force",         action="store_true", help="CLI: re-sync assets even if they are up to date")
+    parser.add_argument("--stream",        action="store_true", help="CLI: unpack HTTP tarballs while downloading (no temp archive)")
+    parser.add_argument("--delta",         action="store_true", help="CLI: only rewrite files whose content differs from the archive")
+    parser.add_argument("--cache-dir",                          help="CLI: machine-wide download cache shared between checkouts")
+    parser.add_argument("--cache-max-gb",  type=float, default=50.0, help="CLI: evict least recently used cache entries past this size")
+    parser.add_argument("--hardlink",      action="store_true", help="CLI: install cached plain-file assets as hardlinks to the --cache-dir copy (no extra disk space)")
+    parser.add_argument("--chunk-store",                        help="CLI: where chunked assets keep their chunks (default: <config_folder>/ChunkStore)")
+    parser.add_argument("--batch",         action="store_true", help="CLI: fetch all Mega file links in one megatools run")
+    parser.add_argument("--verify",        action="store_true", help="CLI: hash installed files when checking/recording sync state")
+    parser.add_argument("--report",                             help="CLI: write per-entry timings / bytes / retries as JSON (or append to a .jsonl file)")
+    parser.add_argument("--hedge-below",   type=float, default=1.0, metavar="MBPS",
+                        help="CLI: race the next source of a multi-source asset when a download runs slower than this (MB/s)")
+    parser.add_argument("--serve",         metavar="[HOST:]PORT", help="CLI: serve the --cache-dir download cache to LAN peers instead of syncing")
+    parser.add_argument("--peer",          action="append", default=[], metavar="URL",
+                        help="CLI: try this LAN mirror (a machine running --serve) before each asset's source; repeatable")
 
     args = parser.parse_args()
 
@@ -30,19 +66,74 @@ def main():
     config_dir = Path(args.config_folder).resolve()
     temp_dir   = config_dir / "Temp"
 
-    if args.app:
+    provider_registry.set_mirrors(args.peer)
+    provider_registry.set_host_stats(HostStats(config_dir), hedge_below=args.hedge_below * 1024 ** 2)
+
+    if args.serve:
+        # ── LAN mirror mode — serve the download cache ────────────
+        if not args.cache_dir:
+            print("--serve needs --cache-dir: the download cache is what gets served")
+            sys.exit(1)
+        host, _, port = args.serve.rpartition(":")
+        cache = DownloadCache(Path(args.cache_dir).resolve(), int(args.cache_max_gb * 1024 ** 3))
+        try:
+            server = PeerServer(cache, host or "0.0.0.0", int(port), print)
+        except (ValueError, OSError) as e:
+            print(f"Can't serve on {args.serve}: {e}")
+            sys.exit(1)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopped.")
+    elif args.app:
         # ── GUI mode ──────────────────────────────────────────────
         from main_window import MainWindow
         MainWindow.show_window(root_dir, config_dir)
     else:
         # ── CLI mode — sync everything ────────────────────────────
-        entries = load_config(config_dir)
+        try:
+            entries = load_config(config_dir)
+        except ValueError as e:
+            print(f"Invalid config: {e}")
+            sys.exit(1)
         if not entries:
             print("No assets in config. Nothing to do.")
             return
 
-        runner = SyncRunner(root_dir, temp_dir, log_callback=print)
-        runner.run(entries)
+        jobs = args.jobs
+        if jobs is None and args.extract_jobs is not None:
+            jobs = 1
+
+        if args.hardlink and not args.cache_dir:
+            print("--hardlink needs --cache-dir: installed files are linked to the cache's copies")
+            sys.exit(1)
+        cache = None
+        if args.cache_dir:
+            cache = DownloadCache(Path(args.cache_dir).resolve(), int(args.cache_max_gb * 1024 ** 3),
+                                  hardlink=args.hardlink)
+
+        chunk_store = ChunkStore(Path(args.chunk_store).resolve()) if args.chunk_store else None
+
+        telemetry = Telemetry()
+        telemetry.settings = {key: value for key, value in vars(args).items()
+                              if key not in ("app", "report") and value}
+
+        state   = SyncState(config_dir, verify=args.verify)
+        console = ConsoleProgress()
+        runner  = SyncRunner(root_dir, temp_dir, log_callback=console.log,
+                             progress_callback=console.update,
+                             jobs=jobs, extract_jobs=args.extract_jobs or 1,
+                             state=state, force=args.force, stream=args.stream,
+                             delta=args.delta, cache=cache, batch=args.batch,
+                             async_jobs=args.async_jobs, telemetry=telemetry,
+                             chunk_store=chunk_store)
+        summary = runner.run(entries)
+        if args.report:
+            report = Path(args.report).resolve()
+            telemetry.write(report)
+            print(f"Report written to {report}")
+        if summary.failed:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    QRect,
+    QSortFilterProxyModel,
+    Qt,
+)
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem
+
+from config import AssetEntry
+
+# ── columns ───────────────────────────────────────────────────────────
+
+COL_CHECK, COL_NAME, COL_LOCATION, COL_TYPE, COL_URL = range(5)
+_HEADERS = ["", "Name", "Location", "Type", "URL"]
+_FIELDS  = {COL_NAME: "name", COL_LOCATION: "location", COL_TYPE: "type", COL_URL: "url"}
+
+# data() runs for every painted cell and role; looking enum members up on
+# Qt each time costs more than the rest of the call, so resolve them once
+_CHECK_ROLE  = Qt.ItemDataRole.CheckStateRole
+_TEXT_ROLES  = (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole)
+_CHECKED     = Qt.CheckState.Checked
+_UNCHECKED   = Qt.CheckState.Unchecked
+
+
+# ── model ─────────────────────────────────────────────────────────────
+# Rows are the AssetEntry list itself; the view asks only for the cells it
+# paints, so opening the window or ticking every box costs no widgets.
+
+class AssetTableModel(QAbstractTableModel):
+
+    def __init__(self, entries: list[AssetEntry] | None = None, parent=None):
+        super().__init__(parent)
+        self._entries: list[AssetEntry] = list(entries or [])
+        self._checked: list[bool]       = [False] * len(self._entries)
+
+    # ── Qt interface ────────────────────────────────────────────────
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return _HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == COL_CHECK:
+            if role == _CHECK_ROLE:
+                return _CHECKED if self._checked[row] else _UNCHECKED
+            return None
+        if role in _TEXT_ROLES:
+            return getattr(self._entries[row], _FIELDS[col])
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or index.column() != COL_CHECK or role != _CHECK_ROLE:
+            return False
+        self._checked[index.row()] = Qt.CheckState(value) == _CHECKED
+        self.dataChanged.emit(index, index, [_CHECK_ROLE])
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == COL_CHECK:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    # ── entries ─────────────────────────────────────────────────────
+
+    def set_entries(self, entries: list[AssetEntry]) -> None:
+        self.beginResetModel()
+        self._entries = list(entries)
+        self._checked = [False] * len(self._entries)
+        self.endResetModel()
+
+    def entry(self, row: int) -> AssetEntry:
+        return self._entries[row]
+
+    def append(self, entry: AssetEntry, checked: bool = False) -> None:
+        row = len(self._entries)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._entries.append(entry)
+        self._checked.append(checked)
+        self.endInsertRows()
+
+    def replace(self, row: int, entry: AssetEntry) -> None:
+        self._entries[row] = entry
+        self.dataChanged.emit(self.index(row, COL_NAME), self.index(row, COL_URL))
+
+    def refresh(self, entries: list[AssetEntry]) -> None:
+        """
+        Swap in the current version of every row's entry — same rows, same
+        order, e.g. after a rename rewrote other entries' depends_on.
+        Check state is kept; only rows whose entry changed repaint.
+        """
+        changed = [row for row, (old, new) in enumerate(zip(self._entries, entries)) if old is not new]
+        self._entries = list(entries)
+        if changed:
+            self.dataChanged.emit(self.index(min(changed), COL_NAME), self.index(max(changed), COL_URL))
+
+    def remove(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._entries[row]
+        del self._checked[row]
+        self.endRemoveRows()
+
+    # ── check state ─────────────────────────────────────────────────
+
+    def is_checked(self, row: int) -> bool:
+        return self._checked[row]
+
+    def set_checked(self, rows, state: bool) -> None:
+        """Tick / untick many rows with a single repaint."""
+        rows = list(rows)
+        if not rows:
+            return
+        for row in rows:
+            self._checked[row] = state
+        self.dataChanged.emit(self.index(min(rows), COL_CHECK), self.index(max(rows), COL_CHECK),
+                              [_CHECK_ROLE])
+
+    def checked_entries(self) -> list[AssetEntry]:
+        return [e for e, checked in zip(self._entries, self._checked) if checked]
+
+
+# ── filter / sort ─────────────────────────────────────────────────────
+
+class AssetFilterProxy(QSortFilterProxyModel):
+    """Live case-insensitive substring filter over name, location and type."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+
+    def set_filter_text(self, text: str) -> None:
+        self._needle = text.strip().casefold()
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row: int, _source_parent: QModelIndex) -> bool:
+        if not self._needle:
+            return True
+        entry = self.sourceModel().entry(source_row)
+        return any(self._needle in value.casefold() for value in (entry.name, entry.location, entry.type))
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        if left.column() == COL_CHECK:
+            model = self.sourceModel()
+            return model.is_checked(left.row()) < model.is_checked(right.row())
+        return super().lessThan(left, right)
+
+
+# ── checkbox delegate ─────────────────────────────────────────────────
+# Paints the check indicator centred in its cell and toggles it on click
+# or Space, writing straight to the model — no QCheckBox per row.
+
+class CheckBoxDelegate(QStyledItemDelegate):
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+
+        # background (selection / alternating colour) without the default left-aligned check
+        opt.features &= ~QStyleOptionViewItem.HasCheckIndicator
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, opt, painter, opt.widget)
+
+        check = QStyleOptionButton()
+        check.rect   = self._indicator_rect(option)
+        check.state  = QStyle.State_Enabled | (QStyle.State_On if opt.checkState == Qt.Checked else QStyle.State_Off)
+        style.drawPrimitive(QStyle.PE_IndicatorItemViewItemCheck, check, painter, opt.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not index.flags() & Qt.ItemIsUserCheckable:
+            return False
+        if event.type() == QEvent.MouseButtonRelease:
+            if event.button() != Qt.LeftButton or not option.rect.contains(event.position().toPoint()):
+                return False
+        elif event.type() == QEvent.MouseButtonDblClick:
+            return True             # consumed, like Qt's own check handling
+        elif event.type() == QEvent.KeyPress:
+            if event.key() not in (Qt.Key_Space, Qt.Key_Select):
+                return False
+        else:
+            return False
+
+        state = Qt.CheckState(index.data(Qt.CheckStateRole))
+        return model.setData(index, Qt.Unchecked if state == Qt.Checked else Qt.Checked, Qt.CheckStateRole)
+
+    @staticmethod
+    def _indicator_rect(option) -> QRect:
+        style = option.widget.style() if option.widget else QApplication.style()
+        size  = style.pixelMetric(QStyle.PM_IndicatorWidth, option, option.widget)
+        rect  = QRect(0, 0, size, size)
+        rect.moveCenter(option.rect.center())
+        return rect
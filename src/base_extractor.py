@@ -0,0 +1,211 @@
+import os
+import re
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from progress import ProgressCallback
+from ranged_file import RangedFile
+
+COPY_BUFSIZE = 1024 * 1024
+
+
+@dataclass
+class ExtractResult:
+    """What an extraction put on disk."""
+    files:         list[str] = field(default_factory=list)  # every regular file, relative to dest_dir
+    written:       int = 0     # files (re)written
+    skipped:       int = 0     # files already identical on disk (delta mode)
+    bytes_written: int = 0
+    bytes_skipped: int = 0
+    excluded:      int = 0     # files left out by the entry's include / exclude patterns
+
+    def count(self, size: int, skipped: bool) -> None:
+        if skipped:
+            self.skipped       += 1
+            self.bytes_skipped += size
+        else:
+            self.written       += 1
+            self.bytes_written += size
+
+    def merge(self, other: "ExtractResult") -> None:
+        self.files.extend(other.files)
+        self.written       += other.written
+        self.skipped       += other.skipped
+        self.bytes_written += other.bytes_written
+        self.bytes_skipped += other.bytes_skipped
+        self.excluded      += other.excluded
+
+
+@dataclass(frozen=True)
+class ArchiveFormat:
+    """How to recognise a format: magic bytes first, the file name as a fallback."""
+    name:     str
+    magic:    tuple[tuple[int, bytes], ...]    # (offset, bytes) — any one matching is enough
+    suffixes: tuple[str, ...]
+
+    def matches(self, head: bytes) -> bool:
+        return any(head[offset:offset + len(sig)] == sig for offset, sig in self.magic)
+
+
+class BaseExtractor(ABC):
+    """
+    Abstract base for archive backends. A backend unpacks one or more
+    formats (by ArchiveFormat.name); extractor_registry picks, for each
+    archive, the first registered backend that handles its format and is
+    available on this machine.
+    """
+
+    formats: tuple[str, ...] = ()
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Human-readable backend name, e.g. 'zipfile', 'py7zr'."""
+        ...
+
+    def unavailable(self) -> str | None:
+        """Why this backend can't run here (a missing module or tool), or None if it can."""
+        return None
+
+    @abstractmethod
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: "MemberFilter | None" = None,
+                meter: "Meter", current: Path) -> ExtractResult:
+        """
+        Unpack `archive` (of format `fmt`) into dest and return an
+        ExtractResult listing every regular file, written or — with delta,
+        when the file at the same path under `current` is already
+        identical — skipped. Members `select` rejects are left out (and
+        counted as excluded) without being decompressed where the format
+        allows. Feed meter.add() the uncompressed bytes as they're
+        handled. Raise on failure.
+        """
+        ...
+
+    # ── optional: streaming ───────────────────────────────────────────
+    # Backends that can read an archive front to back from a
+    # non-seekable stream let SyncRunner unpack while downloading.
+
+    def can_stream(self, fmt: str) -> bool:
+        return False
+
+    def extract_stream(self, stream: BinaryIO, fmt: str, dest: Path, log_callback, *,
+                       delta: bool = False, select: "MemberFilter | None" = None,
+                       meter: "Meter", current: Path) -> ExtractResult:
+        raise NotImplementedError(f"{self.name} can't unpack {fmt} from a stream")
+
+    # ── optional: random access ───────────────────────────────────────
+    # Backends whose format indexes its members (ZIP's central directory)
+    # let SyncRunner read just the members an entry selects out of a
+    # remote archive, by byte ranges.
+
+    def can_read_ranged(self, fmt: str) -> bool:
+        return False
+
+    def extract_ranged(self, file: RangedFile, fmt: str, dest: Path, log_callback, *,
+                       delta: bool = False, select: "MemberFilter | None" = None,
+                       meter: "Meter", current: Path) -> ExtractResult:
+        raise NotImplementedError(f"{self.name} can't unpack {fmt} by byte ranges")
+
+
+# ── helpers for backends ──────────────────────────────────────────────
+
+class Meter:
+    """Thread-safe running byte count feeding an optional ProgressCallback."""
+
+    def __init__(self, progress: ProgressCallback | None, total: int = 0):
+        self.total     = total
+        self._progress = progress
+        self._done     = 0
+        self._lock     = threading.Lock()
+
+    def add(self, n: int) -> None:
+        if self._progress is None:
+            return
+        with self._lock:
+            self._done += n
+            done = self._done
+        self._progress(done, self.total)
+
+
+def member_target(dest: Path, member_name: str) -> Path | None:
+    """
+    Where an archive member lands under dest — same rules as ZipFile.extract():
+    drive letters, leading slashes, "." and ".." components are dropped.
+    """
+    parts = _member_parts(member_name)
+    return dest.joinpath(*parts) if parts else None
+
+
+class MemberFilter:
+    """
+    Which members of an archive an entry wants, from its `include` /
+    `exclude` glob patterns. Patterns match member paths as they land
+    under the destination ("/"-separated, see member_target), case-
+    sensitively: `*` and `?` stay within one path component, `**` spans
+    any number of them. A pattern matching a folder matches everything
+    below it, so "Textures/Characters" takes that whole subtree.
+    No include patterns means every member; exclude wins over include.
+    """
+
+    def __init__(self, include: list[str], exclude: list[str]):
+        self._include = _compile_globs(include) if include else None
+        self._exclude = _compile_globs(exclude) if exclude else None
+
+    def __call__(self, member_name: str) -> bool:
+        path = "/".join(_member_parts(member_name))
+        if self._include is not None and not self._include.match(path):
+            return False
+        return self._exclude is None or not self._exclude.match(path)
+
+
+def crc_unchanged(target: Path, size: int, crc: int) -> bool:
+    """Size first (a stat), then the CRC32 of the file on disk against the archive's."""
+    try:
+        if target.stat().st_size != size:
+            return False
+        value = 0
+        with open(target, "rb") as f:
+            while chunk := f.read(COPY_BUFSIZE):
+                value = zlib.crc32(chunk, value)
+        return value == crc
+    except OSError:
+        return False
+
+
+def mtime_unchanged(target: Path, size: int, mtime: float) -> bool:
+    """For formats without a usable checksum: size + mtime (which the backend restores)."""
+    try:
+        st = target.stat()
+    except OSError:
+        return False
+    return st.st_size == size and int(st.st_mtime) == int(mtime)
+
+
+# ── internals ─────────────────────────────────────────────────────────
+
+def _member_parts(member_name: str) -> list[str]:
+    name = os.path.splitdrive(member_name.replace("\\", "/"))[1]
+    return [p for p in name.split("/") if p not in ("", ".", "..")]
+
+
+def _compile_globs(patterns: list[str]) -> re.Pattern:
+    """One regex matching a member path that any of the patterns, or a folder above it, matches."""
+    alternatives = []
+    for pattern in patterns:
+        parts = _member_parts(pattern)
+        regex = "" if parts else ".*"           # "", "/" or ".": the whole archive
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1
+            if part == "**":
+                regex += ".*" if last else "(?:[^/]+/)*"
+                continue
+            regex += "".join("[^/]*" if c == "*" else "[^/]" if c == "?" else re.escape(c) for c in part)
+            if not last:
+                regex += "/"
+        alternatives.append(regex)
+    return re.compile("(?:" + "|".join(alternatives) + r")(?:/.*)?\Z", re.DOTALL)
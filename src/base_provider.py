@@ -1,13 +1,26 @@
+import asyncio
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import BinaryIO
+
+from config import AssetEntry
+from integrity import StreamHash
+from progress import ProgressCallback
+from ranged_file import RangedFile
 
 
 class BaseProvider(ABC):
     """
     Abstract base for all download providers.
     Each provider knows how to fetch a single asset from its source.
+
+    Providers that can resume keep in-progress downloads in dest_dir as
+    `<name>.part` (plus an optional `<name>.part.json` sidecar).
+    SyncRunner leaves those in place between runs so they can be picked up.
     """
 
+    PARTIAL_SUFFIX = ".part"
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -15,7 +28,10 @@ class BaseProvider(ABC):
         ...
 
     @abstractmethod
-    def download(self, url: str, dest_dir: Path, log_callback) -> Path | None:
+    def download(self, url: str, dest_dir: Path, log_callback,
+                 entry: AssetEntry | None = None,
+                 progress: ProgressCallback | None = None,
+                 digest: StreamHash | None = None) -> Path | None:
         """
         Download the file at `url` into `dest_dir`.
 
@@ -23,8 +39,101 @@ class BaseProvider(ABC):
             url:          Source URL / link for this provider.
             dest_dir:     Directory where the downloaded file should land.
             log_callback: Callable(str) — provider pushes progress lines here.
+            entry:        The asset being synced, for per-asset tuning
+                          (e.g. HTTP segment count). May be None.
+            progress:     Callable(done_bytes, total_bytes) for byte progress;
+                          total is 0 when unknown. May be None. Progress
+                          goes here, not through log_callback. If it
+                          raises, the download is abandoned (None).
+            digest:       If given, feed it every byte of the returned file
+                          as it's written, so it can be verified without
+                          reading it again. Providers that can't simply
+                          leave it alone.
 
         Returns:
             Path to the downloaded file, or None on failure.
         """
         ...
+
+    def probe(self, url: str, log_callback) -> dict | None:
+        """
+        Cheaply describe the remote file without downloading it.
+
+        Returns a small JSON-serialisable validator (ETag, size, node
+        handle, ...) that changes whenever the remote content changes,
+        or None if this provider can't tell. Entries without a validator
+        are always re-downloaded.
+        """
+        return None
+
+    # ── optional: streaming ───────────────────────────────────────────
+    # Providers that can hand out the raw response body let SyncRunner
+    # unpack tar archives while they download, skipping the temp file.
+
+    def remote_filename(self, url: str) -> str | None:
+        """Name the downloaded file will have, if known without a request."""
+        return None
+
+    def open_stream(self, url: str, log_callback,
+                    entry: AssetEntry | None = None,
+                    progress: ProgressCallback | None = None) -> BinaryIO | None:
+        """
+        Open the remote file as a readable binary stream (caller closes it).
+        Returns None if this provider can't stream or the request failed.
+        """
+        return None
+
+    # ── optional: random access ───────────────────────────────────────
+    # Providers that can serve byte ranges let SyncRunner read just the
+    # members an entry's include / exclude patterns select out of a
+    # remote ZIP instead of downloading all of it.
+
+    def open_ranged(self, url: str, log_callback) -> RangedFile | None:
+        """
+        Open the remote file for reading by byte ranges (caller closes it).
+        Returns None if this provider or the server can't serve ranges.
+        """
+        return None
+
+    # ── optional: batching ────────────────────────────────────────────
+    # Providers with a high fixed cost per download (process startup,
+    # login) can fetch many URLs in one go when SyncRunner runs in batch mode.
+
+    def can_batch(self, url: str) -> bool:
+        """Whether `url` may be fetched as part of download_batch()."""
+        return False
+
+    def download_batch(self, urls: list[str], dest_dirs: list[Path], log_callback,
+                       progress: list[ProgressCallback | None] | None = None) -> list[Path | None]:
+        """
+        Download urls[i] into dest_dirs[i] for every i.
+
+        Returns one result per URL, in order: the downloaded file, or None
+        if that URL failed or its result couldn't be identified (SyncRunner
+        then retries it with a plain download()). The default simply calls
+        download() for each URL.
+        """
+        progress = progress or [None] * len(urls)
+        return [self.download(url, dest_dir, log_callback, progress=report)
+                for url, dest_dir, report in zip(urls, dest_dirs, progress)]
+
+    # ── optional: async ───────────────────────────────────────────────
+    # SyncRunner's async mode drives many downloads on one event loop.
+    # The defaults adapt the blocking methods by running them on a worker
+    # thread, so sync-only providers work there unchanged.
+
+    async def download_async(self, url: str, dest_dir: Path, log_callback,
+                             entry: AssetEntry | None = None,
+                             progress: ProgressCallback | None = None,
+                             digest: StreamHash | None = None) -> Path | None:
+        """Async counterpart of download(); same arguments and result."""
+        return await asyncio.to_thread(self.download, url, dest_dir, log_callback,
+                                       entry, progress, digest)
+
+    async def probe_async(self, url: str, log_callback) -> dict | None:
+        """Async counterpart of probe()."""
+        return await asyncio.to_thread(self.probe, url, log_callback)
+
+    @classmethod
+    async def close_async(cls) -> None:
+        """Release whatever instances of this provider share on the running loop (e.g. connection pools)."""
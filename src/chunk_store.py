@@ -0,0 +1,358 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from base_extractor import ExtractResult, MemberFilter, Meter, member_target
+from base_provider import BaseProvider
+from install_strategy import move_file
+from integrity import IntegrityError
+from progress import ProgressCallback
+
+
+# ── published layout ──────────────────────────────────────────────────
+#
+# <base>/<asset>.manifest.json    what an asset version is made of (the entry's url)
+# <base>/chunks/ab/abcdef...      zlib-compressed chunks, named by the sha256 of their content
+#
+# <asset>.manifest.json:
+# {
+#     "format":   "assetpull-chunks",
+#     "version":  1,
+#     "chunking": {"min": 262144, "avg": 1048576, "max": 4194304},
+#     "files":    [{"path": "textures/rock.png", "size": 123, "chunks": ["<sha256>", ...]}],
+#     "chunks":   {"<sha256>": [<size>, <compressed size>]}
+# }
+#
+# Chunk URLs are resolved against the manifest's URL, so any static file
+# server (or bucket) serving the folder publish_chunks.py wrote will do.
+#
+# ── local store ───────────────────────────────────────────────────────
+#
+# <store>/chunks/ab/abcdef...     chunks as downloaded
+# <store>/manifests/<entry>.json  the manifest each entry was last installed from
+
+MANIFEST_FORMAT  = "assetpull-chunks"
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX  = ".manifest.json"
+
+_CHUNKS_DIR    = "chunks"
+_MANIFESTS_DIR = "manifests"
+
+_FETCH_WORKERS = 8
+
+
+# ── content-defined chunking ──────────────────────────────────────────
+# Every byte is mapped to one bit through a fixed table (half the byte
+# values give 1), and a chunk ends after a run of ones long enough to
+# occur about once per `avg_size` bytes — harder to hit before the
+# average size, easier after, as in FastCDC's normalised chunking. Where
+# a cut falls depends only on the few bytes before it, so an edit changes
+# the chunks it touches and the ones after resynchronise. translate() and
+# find() do the scanning in C: a per-byte rolling hash in Python would be
+# ~25× slower.
+
+_BITS = bytes(hashlib.sha256(bytes([i])).digest()[0] & 1 for i in range(256))
+
+
+@dataclass(frozen=True)
+class ChunkParams:
+    min_size: int = 256 * 1024
+    avg_size: int = 1024 * 1024
+    max_size: int = 4 * 1024 * 1024
+
+    def to_json(self) -> dict:
+        return {"min": self.min_size, "avg": self.avg_size, "max": self.max_size}
+
+
+def split(f: BinaryIO, params: ChunkParams = ChunkParams()) -> Iterator[bytes]:
+    """Cut a stream into content-defined chunks (the last one may be shorter than min_size)."""
+    run    = max(4, params.avg_size.bit_length() - 2)
+    strict = b"\x01" * (run + 1)
+    loose  = b"\x01" * (run - 1)
+    buf    = bytearray()
+    eof    = False
+    while True:
+        while not eof and len(buf) < params.max_size:
+            data = f.read(params.max_size)
+            eof  = not data
+            buf += data
+        if not buf:
+            return
+        cut = _cut_point(buf, params, strict, loose)
+        yield bytes(buf[:cut])
+        del buf[:cut]
+
+
+def _cut_point(buf: bytearray, params: ChunkParams, strict: bytes, loose: bytes) -> int:
+    end = min(len(buf), params.max_size)
+    if end <= params.min_size:
+        return end
+    bits = buf[:end].translate(_BITS)
+    for run, start, stop in ((strict, params.min_size, min(params.avg_size, end)),
+                             (loose, params.avg_size, end)):
+        i = bits.find(run, start - len(run), stop)
+        if i >= 0:
+            return i + len(run)
+    return end
+
+
+# ── manifest ──────────────────────────────────────────────────────────
+
+@dataclass
+class ChunkedFile:
+    path:   str
+    size:   int
+    chunks: list[str]
+
+
+@dataclass
+class Manifest:
+    """One version of a chunked asset: its files, as lists of chunk hashes."""
+    files:  list[ChunkedFile] = field(default_factory=list)
+    chunks: dict[str, tuple[int, int]] = field(default_factory=dict)  # sha256 → (size, compressed size)
+    params: ChunkParams = ChunkParams()
+
+    @property
+    def compressed_size(self) -> int:
+        """What downloading every chunk costs — the size of a full download."""
+        return sum(stored for _, stored in self.chunks.values())
+
+    def selected(self, select: MemberFilter) -> "Manifest":
+        """The files `select` accepts, with only the chunks they're made of."""
+        files = [f for f in self.files if select(f.path)]
+        used  = {digest for f in files for digest in f.chunks}
+        return Manifest(files, {digest: sizes for digest, sizes in self.chunks.items() if digest in used},
+                        self.params)
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        """Parse a manifest file; ValueError if it isn't one this version understands."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != MANIFEST_FORMAT or data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"{path.name} isn't a version {MANIFEST_VERSION} chunk manifest")
+        chunking = data.get("chunking", {})
+        return cls(
+            files=[ChunkedFile(f["path"], f["size"], f["chunks"]) for f in data["files"]],
+            chunks={digest: (size, stored) for digest, (size, stored) in data["chunks"].items()},
+            params=ChunkParams(chunking.get("min", 0), chunking.get("avg", 0), chunking.get("max", 0)),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the manifest atomically (temp file + rename)."""
+        data = {
+            "format":   MANIFEST_FORMAT,
+            "version":  MANIFEST_VERSION,
+            "chunking": self.params.to_json(),
+            "files":    [{"path": f.path, "size": f.size, "chunks": f.chunks} for f in self.files],
+            "chunks":   {digest: list(sizes) for digest, sizes in self.chunks.items()},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def chunk_path(root: Path, digest: str) -> Path:
+    """Where chunk `digest` lives under a published folder or a store."""
+    return root / _CHUNKS_DIR / digest[:2] / digest
+
+
+# ── local chunk store ─────────────────────────────────────────────────
+
+@dataclass
+class FetchStats:
+    """What bringing a manifest's chunks into the store took."""
+    chunks:     int = 0     # chunks the manifest needs
+    fetched:    int = 0     # of which were downloaded
+    bytes_in:   int = 0     # compressed bytes downloaded
+    bytes_full: int = 0     # compressed bytes of every chunk — a full download
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_full - self.bytes_in
+
+
+class ChunkStore:
+    """
+    Chunks downloaded for chunked assets, kept between runs so that a new
+    version of an asset only downloads the chunks it doesn't share with
+    the version installed before (or with any other installed asset).
+
+    Each entry's last installed manifest is kept too: chunks no longer
+    referenced by any of them are dropped by prune(). The store holds a
+    compressed copy of every installed chunked asset. Thread-safe; one
+    store shouldn't be shared by processes syncing at the same time.
+    """
+
+    def __init__(self, root: Path):
+        self._root      = root
+        self._manifests = root / _MANIFESTS_DIR
+        self._live: set[str] = set()        # chunks of manifests fetched by this process
+        self._lock = threading.Lock()
+
+    # ── public ────────────────────────────────────────────────────────
+
+    def fetch(self, manifest: Manifest, manifest_url: str, provider: BaseProvider,
+              work_dir: Path, log_callback,
+              progress: ProgressCallback | None = None) -> FetchStats:
+        """
+        Download the chunks of `manifest` missing from the store, through
+        `provider`, a few at a time. Each chunk is checked against its
+        hash before it's added. Raises on the first chunk that fails.
+        """
+        with self._lock:
+            self._live.update(manifest.chunks)
+        missing = [digest for digest in manifest.chunks if not chunk_path(self._root, digest).exists()]
+        stats   = FetchStats(chunks=len(manifest.chunks), fetched=len(missing),
+                             bytes_full=manifest.compressed_size)
+        if not missing:
+            return stats
+
+        meter = Meter(progress, total=sum(manifest.chunks[d][1] for d in missing))
+        work_dir.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(_FETCH_WORKERS, thread_name_prefix="chunks") as pool:
+            futures = [pool.submit(self._fetch_one, digest, manifest.chunks[digest], manifest_url,
+                                   provider, work_dir, meter)
+                       for digest in missing]
+            try:
+                for future in as_completed(futures):
+                    stats.bytes_in += future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return stats
+
+    def assemble(self, manifest: Manifest, dest: Path, *, delta: bool = False,
+                 previous: Manifest | None = None, current: Path | None = None,
+                 progress: ProgressCallback | None = None) -> ExtractResult:
+        """
+        Write the files of `manifest` into dest from the store's chunks.
+        With delta, a file whose chunk list is unchanged since `previous`
+        and whose copy under `current` still hashes to those chunks is
+        skipped.
+        """
+        before = {f.path: f.chunks for f in previous.files} if delta and previous is not None else {}
+        meter  = Meter(progress, total=sum(f.size for f in manifest.files))
+        result = ExtractResult()
+        for file in manifest.files:
+            target = member_target(dest, file.path)
+            if target is None:
+                continue
+            rel = target.relative_to(dest).as_posix()
+            result.files.append(rel)
+            unchanged = (before.get(file.path) == file.chunks
+                         and _has_chunks(current / rel, file, manifest.chunks))
+            result.count(file.size, skipped=unchanged)
+            if unchanged:
+                meter.add(file.size)
+                continue
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "wb") as out:
+                for digest in file.chunks:
+                    data = self._read(digest)
+                    out.write(data)
+                    meter.add(len(data))
+        return result
+
+    def installed(self, name: str) -> Manifest | None:
+        """The manifest entry `name` was last installed from, if any."""
+        try:
+            return Manifest.load(self._manifests / f"{name}.json")
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def record(self, name: str, manifest: Manifest) -> None:
+        """Remember that entry `name` is now installed from `manifest`."""
+        manifest.save(self._manifests / f"{name}.json")
+
+    def prune(self, log_callback) -> None:
+        """Delete chunks that no recorded manifest, nor one fetched by this process, refers to."""
+        chunks_dir = self._root / _CHUNKS_DIR
+        if not chunks_dir.is_dir():
+            return
+        with self._lock:
+            keep = set(self._live)
+        for path in self._manifests.glob("*.json") if self._manifests.is_dir() else ():
+            try:
+                keep.update(Manifest.load(path).chunks)
+            except (OSError, ValueError, KeyError):
+                return              # can't tell what it needs: keep everything
+
+        dropped = freed = 0
+        for path in chunks_dir.glob("*/*"):
+            if path.name not in keep:
+                freed += path.stat().st_size
+                path.unlink(missing_ok=True)
+                dropped += 1
+        if dropped:
+            log_callback(f"  [Chunks] Pruned {dropped} unreferenced chunk(s), {freed / 1024 ** 2:.1f} MB")
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _fetch_one(self, digest: str, sizes: tuple[int, int], manifest_url: str,
+                   provider: BaseProvider, work_dir: Path, meter: Meter) -> int:
+        url   = urllib.parse.urljoin(manifest_url, f"{_CHUNKS_DIR}/{digest[:2]}/{digest}")
+        lines = []              # per-chunk chatter is only worth showing when it fails
+        # a folder of its own: providers keep .part files and scratch folders next to the download
+        scratch = Path(tempfile.mkdtemp(prefix=".chunk-", dir=work_dir))
+        try:
+            file = provider.download(url, scratch, lines.append)
+            if file is None:
+                raise RuntimeError(f"chunk {digest[:12]} couldn't be downloaded"
+                                   + (f" ({lines[-1].strip()})" if lines else ""))
+            data = file.read_bytes()
+            if len(data) != sizes[1] or _decompressed(data, digest) is None:
+                raise IntegrityError(f"chunk {digest[:12]} doesn't match its hash")
+            target = chunk_path(self._root, digest)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            move_file(file, target)             # the store may be on another volume than Temp
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        meter.add(len(data))
+        return len(data)
+
+    def _read(self, digest: str) -> bytes:
+        path = chunk_path(self._root, digest)
+        data = _decompressed(path.read_bytes(), digest)
+        if data is None:
+            path.unlink(missing_ok=True)        # so the next run downloads it again
+            raise IntegrityError(f"stored chunk {digest[:12]} is corrupt")
+        return data
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+def _decompressed(compressed: bytes, digest: str) -> bytes | None:
+    """A chunk's content, if it decompresses and hashes to `digest`."""
+    try:
+        data = zlib.decompress(compressed)
+    except zlib.error:
+        return None
+    return data if hashlib.sha256(data).hexdigest() == digest else None
+
+
+def _has_chunks(path: Path, file: ChunkedFile, chunks: dict[str, tuple[int, int]]) -> bool:
+    """Whether the file at `path` is exactly `file`: its size, then the hash of every chunk's span."""
+    try:
+        if path.stat().st_size != file.size:
+            return False
+        with open(path, "rb") as f:
+            for digest in file.chunks:
+                if hashlib.sha256(f.read(chunks[digest][0])).hexdigest() != digest:
+                    return False
+        return True
+    except (OSError, KeyError):
+        return False
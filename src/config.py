@@ -1,5 +1,8 @@
+import gc
 import json
-from dataclasses import dataclass, asdict
+import os
+from contextlib import contextmanager
+from dataclasses import MISSING, dataclass, field, fields, replace
 from pathlib import Path
 
 
@@ -13,6 +16,26 @@ class AssetEntry:
     type:     str   # provider name: "Mega", "HTTP", ...
     url:      str   # source URL / link
 
+    # ── optional tuning — omitted from Database.json while at the default ──
+    segments:         int = 1                  # HTTP: parallel byte-range connections
+    min_segment_size: int = 8 * 1024 * 1024    # HTTP: don't split below this many bytes
+
+    # ── optional integrity — checked before anything is installed ──
+    sha256: str | None = None    # hex sha256 of the downloaded file
+    size:   int | None = None    # its size in bytes
+
+    # ── optional scheduling ──
+    priority:   int = 0                                    # higher syncs earlier
+    depends_on: list[str] = field(default_factory=list)    # names of assets to install before this one
+
+    # ── optional delivery ──
+    chunked: bool = False    # `url` is a chunk manifest (publish_chunks.py), not the payload itself
+    sources: list[dict] = field(default_factory=list)    # more sources of the same file: {"type", "url"}
+
+    # ── optional selection — archives / chunked assets: which member paths to install ──
+    include: list[str] = field(default_factory=list)    # glob patterns; empty: everything
+    exclude: list[str] = field(default_factory=list)    # glob patterns, applied after include
+
 
 # ── JSON keys ─────────────────────────────────────────────────────────
 
@@ -20,29 +43,352 @@ _JSON_FILE  = "Database.json"
 _JSON_KEY   = "Assets"
 
 
+# ── catalog ───────────────────────────────────────────────────────────
+
+class Catalog:
+    """
+    Database.json as an ordered collection of entries indexed by name.
+
+    Loading only parses the JSON; AssetEntry objects are built the first
+    time an entry is read, and the file text is cut into per-entry pieces
+    only when the catalog is first saved. Saving re-encodes only entries
+    that were added or changed since their text was last produced and
+    splices in the cached text of the rest, then replaces the file
+    atomically (temp file + rename). The file layout is exactly what
+    json.dump(indent=4) writes and keeps the file's entry order, so an
+    edit only touches the lines of the entries it changed.
+
+    Entry names are unique — they key sync state and temp folders too.
+    Every name in an entry's `depends_on` must exist and dependencies
+    can't form a cycle, and every item of `sources` needs a "url"; loading
+    or an edit that breaks this raises ValueError. Renaming an entry renames it in the lists that refer to it.
+    """
+
+    def __init__(self, config_dir: Path, entries: list[AssetEntry] | None = None):
+        """Load config_dir's Database.json, or start from `entries` instead if given."""
+        self._path   = config_dir / _JSON_FILE
+        self._slots: dict[str, _Slot] = {}
+        self._dirty  = False
+        self._source: tuple[str, list[_Slot]] | None = None   # file text + its slots, split on first save
+
+        if entries is not None:
+            self.replace_all(entries)
+        elif self._path.exists():
+            with open(self._path, "r", encoding="utf-8") as f:
+                text = f.read()
+            # bulk-creating ~100k small objects otherwise triggers many pointless GC passes
+            with _gc_paused():
+                raws  = json.loads(text).get(_JSON_KEY, [])
+                slots = list(map(_Slot, raws))
+                self._slots = dict(zip((raw["name"] for raw in raws), slots))
+            if len(self._slots) != len(raws):
+                _raise_duplicate(raw["name"] for raw in raws)
+            _check_dependencies(_dependency_graph(self._slots))
+            for raw in raws:
+                if "sources" in raw:
+                    _check_sources(raw["name"], raw["sources"])
+            self._source = (text, slots)
+
+    # ── reading ───────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slots
+
+    def __iter__(self):
+        return (slot.get() for slot in self._slots.values())
+
+    def names(self) -> list[str]:
+        return list(self._slots)
+
+    def get(self, name: str) -> AssetEntry | None:
+        slot = self._slots.get(name)
+        return slot.get() if slot is not None else None
+
+    def entries(self) -> list[AssetEntry]:
+        with _gc_paused():
+            return list(self)
+
+    # ── editing ───────────────────────────────────────────────────────
+
+    def add(self, entry: AssetEntry) -> None:
+        """Append a new entry; ValueError if the name is taken."""
+        if entry.name in self._slots:
+            raise ValueError(f"an asset named '{entry.name}' already exists")
+        missing = [d for d in entry.depends_on if d not in self._slots]
+        if missing:
+            raise ValueError(f"'{entry.name}' depends on unknown asset '{missing[0]}'")
+        _check_sources(entry.name, entry.sources)
+        self._slots[entry.name] = _Slot.of(entry)
+        self._dirty = True
+
+    def update(self, name: str, entry: AssetEntry) -> None:
+        """Replace entry `name` in place; `entry` may carry a new name."""
+        if name not in self._slots:
+            raise KeyError(name)
+        _check_sources(entry.name, entry.sources)
+        slots = self._slots
+        if entry.name != name:
+            if entry.name in slots:
+                raise ValueError(f"an asset named '{entry.name}' already exists")
+            # rebuild to keep the entry's position under its new key
+            slots = {(entry.name if k == name else k): v for k, v in slots.items()}
+            for key, slot in slots.items():
+                if name in slot.depends_on():
+                    old = slot.get()
+                    slots[key] = _Slot.of(replace(old, depends_on=[entry.name if d == name else d
+                                                                   for d in old.depends_on]))
+        else:
+            slots = dict(slots)
+        slots[entry.name] = _Slot.of(entry)
+        _check_dependencies(_dependency_graph(slots))
+        self._slots = slots
+        self._dirty = True
+
+    def remove(self, name: str) -> None:
+        """Drop entry `name`; ValueError if other entries depend on it."""
+        dependents = [k for k, slot in self._slots.items() if name in slot.depends_on()]
+        if dependents:
+            raise ValueError(f"'{name}' is required by {', '.join(dependents)}")
+        del self._slots[name]
+        self._dirty = True
+
+    def replace_all(self, entries: list[AssetEntry]) -> None:
+        """Make the catalog exactly `entries`, in that order, reusing cached text where unchanged."""
+        slots = {}
+        for entry in entries:
+            if entry.name in slots:
+                raise ValueError(f"duplicate asset name '{entry.name}'")
+            _check_sources(entry.name, entry.sources)
+            old = self._slots.get(entry.name)
+            slots[entry.name] = old if old is not None and old.get() == entry else _Slot.of(entry)
+        _check_dependencies(_dependency_graph(slots))
+        self._slots = slots
+        self._dirty = True
+
+    # ── saving ────────────────────────────────────────────────────────
+
+    def save(self, force: bool = False) -> None:
+        """Write Database.json if anything changed (or `force`), atomically."""
+        if not (self._dirty or force):
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._adopt_source()
+
+        if self._slots:
+            text = (_HEADER + _OPEN + _SEPARATOR.join(slot.text() for slot in self._slots.values())
+                    + _CLOSE + _FOOTER)
+        else:
+            text = f'{{\n    "{_JSON_KEY}": []\n}}'
+
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, self._path)
+        self._dirty = False
+
+    def _adopt_source(self) -> None:
+        """Hand each slot loaded from the file its own text, so unchanged entries are written back as they were."""
+        if self._source is None:
+            return
+        text, slots  = self._source
+        self._source = None
+        for slot, entry_text in zip(slots, _split_entries(text, len(slots)) or ()):
+            slot.adopt(entry_text)
+
+
+class _Slot:
+    """
+    One entry as parsed JSON, as AssetEntry and as file text (its lines
+    between the braces) — each produced on demand.
+    """
+
+    __slots__ = ("_raw", "_entry", "_text")
+
+    def __init__(self, raw: dict | None, entry: AssetEntry | None = None, text: str | None = None):
+        self._raw   = raw
+        self._entry = entry
+        self._text  = text
+
+    @classmethod
+    def of(cls, entry: AssetEntry) -> "_Slot":
+        return cls(None, entry)
+
+    def get(self) -> AssetEntry:
+        if self._entry is None:
+            self._entry = AssetEntry(**self._raw)
+        return self._entry
+
+    def depends_on(self) -> list[str]:
+        """Without building the AssetEntry if it hasn't been yet."""
+        if self._entry is None:
+            return self._raw.get("depends_on", [])
+        return self._entry.depends_on
+
+    def adopt(self, text: str) -> None:
+        if self._text is None:
+            self._text = text
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = _entry_text(_entry_to_json(self.get()))
+        return self._text
+
+
+# the layout json.dump(indent=4) gives {"Assets": [...]}
+_HEADER    = f'{{\n    "{_JSON_KEY}": [\n'
+_FOOTER    = "\n    ]\n}"
+_OPEN      = "        {\n"
+_CLOSE     = "\n        }"
+_SEPARATOR = _CLOSE + ",\n" + _OPEN
+
+
 # ── public API ────────────────────────────────────────────────────────
 
 def load_config(config_dir: Path) -> list[AssetEntry]:
     """
     Read Database.json from config_dir.
     Returns an empty list if the file doesn't exist yet.
+
+    For read-only callers: builds the entries straight from the parsed
+    JSON, without the per-entry bookkeeping Catalog keeps for saving.
     """
     path = config_dir / _JSON_FILE
     if not path.exists():
         return []
-
     with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    return [AssetEntry(**entry) for entry in data.get(_JSON_KEY, [])]
+        text = f.read()
+    with _gc_paused():
+        entries = [AssetEntry(**raw) for raw in json.loads(text).get(_JSON_KEY, [])]
+        graph   = {entry.name: entry.depends_on for entry in entries}
+    if len(graph) != len(entries):
+        _raise_duplicate(entry.name for entry in entries)
+    _check_dependencies(graph)
+    for entry in entries:
+        _check_sources(entry.name, entry.sources)
+    return entries
 
 
 def save_config(config_dir: Path, entries: list[AssetEntry]) -> None:
-    """Write the current asset list to Database.json."""
-    config_dir.mkdir(parents=True, exist_ok=True)
-    path = config_dir / _JSON_FILE
+    """Write the given asset list to Database.json (atomically)."""
+    Catalog(config_dir, entries).save()
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+_SCALARS = (str, int, float, bool, type(None))
+_ENCODER = json.JSONEncoder(ensure_ascii=False)     # reused: json.dumps(ensure_ascii=False) builds one per call
+
+
+def _entry_text(data: dict) -> str:
+    """
+    The lines of one entry exactly as json.dump(indent=4) lays them out
+    inside the "Assets" array, but encoding scalar values with the C
+    encoder instead of json's much slower pure-Python indenting one.
+    """
+    lines = []
+    for key, value in data.items():
+        if isinstance(value, _SCALARS):
+            encoded = _ENCODER.encode(value)
+        else:
+            encoded = json.dumps(value, indent=4, ensure_ascii=False).replace("\n", "\n            ")
+        lines.append(f"            {_ENCODER.encode(key)}: {encoded}")
+    return ",\n".join(lines)
+
+
+def _split_entries(text: str, count: int) -> list[str] | None:
+    """
+    Cut a file in the layout save() writes into the text of its `count`
+    entries, so untouched entries are written back byte for byte without
+    being re-encoded. None if the file is laid out any other way. The
+    separator can't occur inside an entry: JSON strings hold no raw
+    newlines and nested values sit deeper than 8 spaces.
+    """
+    head, tail = _HEADER + _OPEN, _CLOSE + _FOOTER
+    if count == 0 or not text.startswith(head) or not text.endswith(tail):
+        return None
+    parts = text[len(head):-len(tail)].split(_SEPARATOR)
+    return parts if len(parts) == count else None
+
+
+def _dependency_graph(slots: dict[str, "_Slot"]) -> dict[str, list[str]]:
+    return {name: slot.depends_on() for name, slot in slots.items()}
+
+
+def _raise_duplicate(names) -> None:
+    seen = set()
+    for name in names:
+        if name in seen:
+            raise ValueError(f"{_JSON_FILE}: duplicate asset name '{name}'")
+        seen.add(name)
+
+
+def _check_sources(name: str, sources) -> None:
+    """ValueError unless `sources` is a list of {"url", optional "type"} objects."""
+    if not isinstance(sources, list):
+        raise ValueError(f"'{name}': sources must be a list")
+    for source in sources:
+        if not isinstance(source, dict) or not isinstance(source.get("url"), str) or not source["url"]:
+            raise ValueError(f"'{name}': every source needs a \"url\"")
+        if not isinstance(source.get("type", ""), str):
+            raise ValueError(f"'{name}': a source's \"type\" must be a string")
+
+
+def _check_dependencies(depends_on: dict[str, list[str]]) -> None:
+    """ValueError on a depends_on naming an unknown asset, or a dependency cycle."""
+    graph = {name: deps for name, deps in depends_on.items() if deps}
+    for name, deps in graph.items():
+        for dep in deps:
+            if dep not in depends_on:
+                raise ValueError(f"'{name}' depends on unknown asset '{dep}'")
+
+    # iterative DFS; a name met again while still on the path closes a cycle
+    done: set[str] = set()
+    for root in graph:
+        if root in done:
+            continue
+        path, on_path = [root], {root}
+        stack = [iter(graph[root])]
+        while stack:
+            dep = next(stack[-1], None)
+            if dep is None:
+                done.add(path[-1])
+                on_path.discard(path.pop())
+                stack.pop()
+            elif dep in on_path:
+                cycle = path[path.index(dep):] + [dep]
+                raise ValueError(f"dependency cycle: {' → '.join(cycle)}")
+            elif dep not in done:
+                path.append(dep)
+                on_path.add(dep)
+                stack.append(iter(graph.get(dep, ())))
+
+
+@contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
-    data = {_JSON_KEY: [asdict(e) for e in entries]}
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+def _entry_to_json(entry: AssetEntry) -> dict:
+    """Required fields always, optional ones only when they differ from the default."""
+    data = {}
+    for f in fields(entry):
+        value = getattr(entry, f.name)
+        if f.default is not MISSING:
+            default = f.default
+        elif f.default_factory is not MISSING:
+            default = f.default_factory()
+        else:
+            data[f.name] = value            # required
+            continue
+        if value != default:
+            data[f.name] = value
+    return data
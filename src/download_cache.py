@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from install_strategy import copy_file, link_file
+from integrity import StreamHash
+
+
+# ── on-disk layout ────────────────────────────────────────────────────
+#
+# <cache_dir>/
+#     index.json              which blob each (url, validator) resolved to + LRU stamps
+#     index.lock              cross-process lock guarding index.json and blobs/
+#     blobs/ab/abcdef...      downloaded artifacts, named by their sha256
+#
+# index.json:
+# {
+#     "keys":  {"<sha256 of url + validator>": {"blob": "<sha256>", "name": "textures.zip",
+#                                               "url": "...", "validator": {...}}},
+#     "blobs": {"<sha256>": {"size": 123, "mtime_ns": 1700000000000000000,
+#                            "last_used": 1700000000.0, "name": "textures.zip"}}
+# }
+
+_INDEX_FILE = "index.json"
+_LOCK_FILE  = "index.lock"
+_BLOBS_DIR  = "blobs"
+
+_HASH_CHUNK = 1024 * 1024
+
+
+class DownloadCache:
+    """
+    Machine-wide cache of downloaded artifacts, shared by every checkout
+    and worktree that points at the same directory.
+
+    Artifacts are stored once by content hash; a (URL, remote validator)
+    pair maps onto a blob, so a URL is only served from the cache while the
+    remote still reports the same version. Entries that publish a sha256
+    are served straight by that hash, whatever URL they came from. Least recently used blobs are
+    evicted once the cache grows past `max_bytes`. Index reads and writes
+    hold an OS file lock, so several processes can share one cache.
+
+    Blobs are copied in and out with install_strategy.copy_file (a reflink
+    where the filesystem can), or with `hardlink` hardlinked: a hit then
+    costs no disk space at all, but the installed file *is* the blob. A
+    blob whose size or mtime no longer match the index — edited through
+    such a link — is dropped instead of served.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, hardlink: bool = False):
+        self._root      = cache_dir
+        self._blobs     = cache_dir / _BLOBS_DIR
+        self._index     = cache_dir / _INDEX_FILE
+        self._lock_path = cache_dir / _LOCK_FILE
+        self._max_bytes = max_bytes
+        self._place     = link_file if hardlink else copy_file
+        self._thread_lock = threading.Lock()
+        self._blobs.mkdir(parents=True, exist_ok=True)
+
+    # ── public ────────────────────────────────────────────────────────
+
+    def lookup(self, url: str, validator: dict | None, dest_dir: Path, log_callback,
+               sha256: str | None = None, digest: StreamHash | None = None) -> Path | None:
+        """
+        Copy (or link) the cached artifact into dest_dir; None on a miss. Found by
+        `sha256` when given, else by URL + validator. A passed `digest` is
+        set to the blob's hash, so the copy needn't be hashed again. The
+        copy happens outside the lock, so other users of the cache don't
+        wait for it.
+        """
+        with self._locked():
+            index = self._read_index()
+            if sha256 is not None:
+                blob_id = sha256.lower()
+                name    = index["blobs"].get(blob_id, {}).get("name")
+            elif validator is not None:
+                hit     = index["keys"].get(_key(url, validator)) or {}
+                blob_id = hit.get("blob")
+                name    = hit.get("name")
+            else:
+                return None
+            if name is None or blob_id not in index["blobs"]:
+                return None
+            blob = self._blob_path(blob_id)
+            if not self._intact(blob, index["blobs"][blob_id]):
+                del index["blobs"][blob_id]
+                blob.unlink(missing_ok=True)
+                self._write_index(index)
+                log_callback(f"  [Cache] Dropped {name} ({blob_id[:12]}): changed since it was stored")
+                return None
+
+            index["blobs"][blob_id]["last_used"] = time.time()
+            self._write_index(index)
+
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            dest_file = dest_dir / name
+            # copy outside the lock, from a hardlink of the blob that eviction can't take away
+            pin = blob.with_name(f".{blob_id}.{uuid.uuid4().hex}.pin")
+            try:
+                os.link(blob, pin)
+            except OSError:
+                pin = None                      # no hardlinks here: copy while holding the lock
+                how = self._place(blob, dest_file)
+
+        if pin is not None:
+            try:
+                how = self._place(pin, dest_file)
+            finally:
+                pin.unlink(missing_ok=True)
+
+        if digest is not None:
+            digest.set_known(blob_id, dest_file.stat().st_size, "cached blob")
+        log_callback(f"  [Cache] Hit: {name} ({blob_id[:12]}, {how})")
+        return dest_file
+
+    def store(self, url: str, validator: dict | None, file: Path, log_callback,
+              sha256: str | None = None) -> None:
+        """
+        Add a freshly downloaded artifact, under its URL + validator when
+        there is one. Pass `sha256` if it's already known to skip hashing
+        the file again. Failures are logged, never raised.
+        """
+        if validator is None and sha256 is None:
+            return
+        try:
+            digest = sha256 or _sha256(file)
+            blob   = self._blob_path(digest)
+
+            # copy outside the lock — it can take a while — then publish with a rename
+            with self._locked():
+                known = self._read_index()["blobs"].get(digest)
+            staging = None
+            if known is None or not self._intact(blob, known):
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                staging = blob.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+                self._place(file, staging)
+
+            with self._locked():
+                if staging is not None:
+                    os.replace(staging, blob)
+                index = self._read_index()
+                if validator is not None:
+                    index["keys"][_key(url, validator)] = {"blob": digest, "name": file.name,
+                                                           "url": url, "validator": validator}
+                stat = blob.stat()
+                index["blobs"][digest] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                          "last_used": time.time(), "name": file.name}
+                evicted = self._evict(index)
+                self._write_index(index)
+
+            log_callback(f"  [Cache] Stored {file.name} ({digest[:12]})"
+                         + (f", evicted {evicted} old artifact(s)" if evicted else ""))
+        except OSError as e:
+            log_callback(f"  [Cache] Couldn't store {file.name}: {e}")
+
+    def artifacts(self, url: str | None = None, sha256: str | None = None) -> list[dict]:
+        """
+        What the cache holds for `url` (every version it was stored under)
+        or for the blob `sha256`: {"sha256", "size", "name"} plus the
+        "validator" it was stored under for a URL. Read-only — this is
+        what the --serve mode hands to LAN peers.
+        """
+        with self._locked():
+            index = self._read_index()
+        blobs = index["blobs"]
+        if sha256 is not None:
+            blob = blobs.get(sha256.lower())
+            return [{"sha256": sha256.lower(), "size": blob["size"], "name": blob["name"]}] if blob else []
+        return [{"sha256": key["blob"], "size": blobs[key["blob"]]["size"], "name": key["name"],
+                 "validator": key["validator"]}
+                for key in index["keys"].values()
+                if key.get("url") == url and key["blob"] in blobs]
+
+    def blob(self, sha256: str) -> Path | None:
+        """The stored artifact with this hash, if the cache has it."""
+        digest = sha256.lower()
+        if len(digest) != 64 or digest.strip("0123456789abcdef"):
+            return None                 # not a hash: never a path outside blobs/
+        path = self._blob_path(digest)
+        return path if path.is_file() else None
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._blobs / digest[:2] / digest
+
+    @staticmethod
+    def _intact(blob: Path, record: dict) -> bool:
+        """Whether the blob is still what was stored (cheap: size and mtime, no hashing)."""
+        try:
+            stat = blob.stat()
+        except OSError:
+            return False
+        return stat.st_size == record["size"] and record.get("mtime_ns", stat.st_mtime_ns) == stat.st_mtime_ns
+
+    def _evict(self, index: dict) -> int:
+        """Drop least recently used blobs until the cache fits max_bytes. Caller holds the lock."""
+        blobs = index["blobs"]
+        total = sum(b["size"] for b in blobs.values())
+        evicted = 0
+        for digest in sorted(blobs, key=lambda d: blobs[d]["last_used"]):
+            if total <= self._max_bytes:
+                break
+            total -= blobs.pop(digest)["size"]
+            self._blob_path(digest).unlink(missing_ok=True)
+            evicted += 1
+
+        index["keys"] = {k: v for k, v in index["keys"].items() if v["blob"] in blobs}
+        return evicted
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("keys", {})
+        index.setdefault("blobs", {})
+        return index
+
+    def _write_index(self, index: dict) -> None:
+        tmp = self._index.with_name(self._index.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, self._index)
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive across threads of this process and across processes."""
+        with self._thread_lock, open(self._lock_path, "a+b") as f:
+            _lock_file(f)
+            try:
+                yield
+            finally:
+                _unlock_file(f)
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+def _key(url: str, validator: dict) -> str:
+    raw = json.dumps([url, validator], sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock_file(f) -> None:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)   # gives up after ~10 s
+                return
+            except OSError:
+                continue
+
+    def _unlock_file(f) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
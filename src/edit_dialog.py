@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -19,6 +21,7 @@ class EditDialog(QDialog):
         self.setWindowTitle("Edit Asset" if entry else "Add Asset")
         self.setObjectName("editDialog")
         self.setMinimumWidth(440)
+        self._entry = entry
 
         # ── inputs ──────────────────────────────────────────────────
         self._name     = QLineEdit(entry.name     if entry else "")
@@ -49,10 +52,13 @@ class EditDialog(QDialog):
     # ── public ──────────────────────────────────────────────────────
 
     def get_entry(self) -> AssetEntry:
-        """Read current form state as an AssetEntry."""
-        return AssetEntry(
+        """Read current form state as an AssetEntry (optional fields carried over when editing)."""
+        values = dict(
             name=self._name.text().strip(),
             location=self._location.text().strip(),
             type=self._type.currentText(),
             url=self._url.text().strip(),
         )
+        if self._entry is not None:
+            return replace(self._entry, **values)
+        return AssetEntry(**values)
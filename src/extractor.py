@@ -1,82 +1,218 @@
-import shutil
-import zipfile
-import tarfile
-import subprocess
-import sys
+import os
 from pathlib import Path
+from typing import BinaryIO
 
+from base_extractor import ExtractResult, MemberFilter, Meter
+from progress import ProgressCallback
+from ranged_file import RangedFile
+import extractor_registry
 
-def extract(archive_path: Path, dest_dir: Path, log_callback) -> bool:
+
+def is_archive(file_path: Path) -> bool:
+    """True if the file's name marks it as an archive to unpack (anything else is installed as is)."""
+    return extractor_registry.format_for_name(file_path.name) is not None
+
+
+def extract(archive_path: Path, dest_dir: Path, log_callback,
+            workers: int | None = None, delta: bool = False,
+            progress: ProgressCallback | None = None,
+            current_dir: Path | None = None,
+            select: MemberFilter | None = None) -> ExtractResult | None:
     """
     Extract an archive into dest_dir.
-    Format is detected by file extension — no guessing.
-
-    Supported: .zip, .tar, .tar.gz, .tgz, .tar.bz2, .rar
-    Returns True on success, False on failure.
+    The format is recognised by its magic bytes (by the file name only
+    when they don't tell) and unpacked by the first backend registered
+    for it in extractor_registry that's available here.
+
+    Supported: .zip, .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz, .tar.zst, .tar.lz4, .7z, .rar
+    Large ZIPs and multi-frame .tar.zst are decompressed on up to
+    `workers` threads (default: one per CPU core).
+
+    With delta=True, members whose file in dest_dir already matches the
+    archive's metadata are skipped without being written: size + CRC32
+    where the format stores one (ZIP, 7z), size + mtime otherwise (tar,
+    RAR). The files compared against are those in `current_dir` when
+    given (extracting into a staging folder for an install elsewhere),
+    else those in dest_dir.
+
+    With `select`, only the members it accepts are unpacked. ZIP, 7z and
+    RAR skip the others without decompressing them; tarballs still have
+    to be read through.
+
+    progress(done, total) receives uncompressed bytes handled so far
+    (total is 0 when the format doesn't tell up front).
+    Returns an ExtractResult on success, None on failure.
     """
     dest_dir.mkdir(parents=True, exist_ok=True)
-    name = archive_path.name.lower()
 
     try:
-        if name.endswith(".zip"):
-            _extract_zip(archive_path, dest_dir, log_callback)
+        with open(archive_path, "rb") as f:
+            head = f.read(extractor_registry.MAGIC_BYTES)
+        fmt = _detect(head, archive_path.name, log_callback)
+        if fmt is None:
+            return None
+        backend = _backend(fmt, archive_path.name, log_callback)
+        if backend is None:
+            return None
+
+        result = backend.extract(archive_path, fmt, dest_dir, log_callback,
+                                 workers=workers or os.cpu_count() or 1, delta=delta, select=select,
+                                 meter=Meter(progress), current=current_dir or dest_dir)
+        _log_result(result, delta, log_callback)
+        return result
 
-        elif name.endswith((".tar.gz", ".tgz")):
-            _extract_tar(archive_path, dest_dir, log_callback, mode="r:gz")
+    except Exception as e:
+        log_callback(f"  [Extract] ERROR: {e}")
+        return None
 
-        elif name.endswith(".tar.bz2"):
-            _extract_tar(archive_path, dest_dir, log_callback, mode="r:bz2")
 
-        elif name.endswith(".tar"):
-            _extract_tar(archive_path, dest_dir, log_callback, mode="r:")
+def can_stream(filename: str) -> bool:
+    """True if an archive with this name can be unpacked while it's still downloading."""
+    fmt = extractor_registry.format_for_name(filename)
+    if fmt is None:
+        return False
+    backend, _ = extractor_registry.get_backend(fmt)
+    return backend is not None and backend.can_stream(fmt)
 
-        elif name.endswith(".rar"):
-            _extract_rar(archive_path, dest_dir, log_callback)
 
-        else:
-            log_callback(f"  [Extract] Unknown format: {archive_path.name}")
-            return False
+def extract_stream(stream: BinaryIO, filename: str, dest_dir: Path, log_callback,
+                   delta: bool = False,
+                   progress: ProgressCallback | None = None,
+                   current_dir: Path | None = None,
+                   select: MemberFilter | None = None) -> ExtractResult | None:
+    """
+    Extract an archive read sequentially from `stream` (e.g. an HTTP
+    response body) into dest_dir, without the archive ever touching disk.
+    Its first bytes decide the format, as in extract(); only formats whose
+    backend can stream (tarballs) are supported — for anything else this
+    returns None having read just those first bytes.
+    delta, current_dir and select work as in extract(); skipped members
+    are still read off the stream, just not written.
+    Returns an ExtractResult on success, None on failure.
+    """
+    try:
+        head = _read_head(stream, extractor_registry.MAGIC_BYTES)
+        fmt  = _detect(head, filename, log_callback)
+        if fmt is None:
+            return None
+        backend = _backend(fmt, filename, log_callback)
+        if backend is None:
+            return None
+        if not backend.can_stream(fmt):
+            log_callback(f"  [Extract] Can't stream format: {filename} ({fmt})")
+            return None
+
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        log_callback(f"  [Extract] Unpacking {filename} from the download stream")
+        result = backend.extract_stream(_Replay(head, stream), fmt, dest_dir, log_callback,
+                                        delta=delta, select=select, meter=Meter(progress),
+                                        current=current_dir or dest_dir)
+        _log_result(result, delta, log_callback)
+        return result
+    except Exception as e:
+        log_callback(f"  [Extract] ERROR: {e}")
+        return None
+
+
+def can_read_ranged(filename: str) -> bool:
+    """True if selected members of an archive with this name can be read out of it by byte ranges."""
+    fmt = extractor_registry.format_for_name(filename)
+    if fmt is None:
+        return False
+    backend, _ = extractor_registry.get_backend(fmt)
+    return backend is not None and backend.can_read_ranged(fmt)
 
-        return True
 
+def extract_ranged(file: RangedFile, dest_dir: Path, log_callback,
+                   delta: bool = False,
+                   progress: ProgressCallback | None = None,
+                   current_dir: Path | None = None,
+                   select: MemberFilter | None = None) -> ExtractResult | None:
+    """
+    Extract a remote archive read by byte ranges (provider.open_ranged)
+    into dest_dir, fetching only its index and the members `select`
+    accepts — with delta, only those that changed. The format goes by
+    the file's name; only formats whose backend can read ranges (ZIP)
+    are supported. Options work as in extract(); the caller closes `file`.
+    Returns an ExtractResult on success, None on failure.
+    """
+    try:
+        fmt = extractor_registry.format_for_name(file.name)
+        backend = _backend(fmt, file.name, log_callback) if fmt is not None else None
+        if backend is None or not backend.can_read_ranged(fmt):
+            log_callback(f"  [Extract] Can't read {file.name} by byte ranges")
+            return None
+
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        result = backend.extract_ranged(file, fmt, dest_dir, log_callback,
+                                        delta=delta, select=select, meter=Meter(progress),
+                                        current=current_dir or dest_dir)
+        log_callback(f"  [Extract] Fetched {_format_size(file.fetched)} of {_format_size(file.size)} "
+                     f"in {file.requests} request(s)")
+        _log_result(result, delta, log_callback)
+        return result
     except Exception as e:
         log_callback(f"  [Extract] ERROR: {e}")
-        return False
+        return None
 
 
-# ── format handlers ──────────────────────────────────────────────────
+# ── helpers ──────────────────────────────────────────────────────────
 
-def _extract_zip(archive: Path, dest: Path, log_callback):
-    log_callback(f"  [Extract] Unzipping {archive.name}")
-    with zipfile.ZipFile(archive, "r") as zf:
-        zf.extractall(dest)
+def _detect(head: bytes, filename: str, log_callback) -> str | None:
+    fmt = extractor_registry.detect(head, filename)
+    if fmt is None:
+        log_callback(f"  [Extract] Unknown format: {filename}")
+        return None
+    named = extractor_registry.format_for_name(filename)
+    if named is not None and named != fmt:
+        log_callback(f"  [Extract] {filename} is a {fmt} archive despite its name")
+    return fmt
 
 
-def _extract_tar(archive: Path, dest: Path, log_callback, mode: str = "r:"):
-    log_callback(f"  [Extract] Untarring {archive.name}")
-    with tarfile.open(archive, mode) as tf:
-        tf.extractall(dest)
+def _backend(fmt: str, filename: str, log_callback):
+    backend, reasons = extractor_registry.get_backend(fmt)
+    if backend is None:
+        log_callback(f"  [Extract] Can't unpack {filename}: no {fmt} backend available here "
+                     f"({'; '.join(reasons)})")
+    return backend
 
 
-def _extract_rar(archive: Path, dest: Path, log_callback):
-    """
-    RAR extraction via unrar CLI.
-    unrar must be installed separately (not bundled — closed-source tool).
-    """
-    log_callback(f"  [Extract] Unraring {archive.name} (requires 'unrar' in PATH)")
+def _read_head(stream: BinaryIO, size: int) -> bytes:
+    head = b""
+    while len(head) < size and (chunk := stream.read(size - len(head))):
+        head += chunk
+    return head
 
-    try:
-        result = subprocess.run(
-            ["unrar", "x", "-o+", str(archive), str(dest)],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            log_callback(f"  [Extract] unrar error: {result.stderr.strip()}")
-            raise RuntimeError(f"unrar exited with code {result.returncode}")
-
-    except FileNotFoundError:
-        raise RuntimeError(
-            "'unrar' not found in PATH. "
-            "Install it: https://www.win-rar.com/unrarfree.html"
-        )
+
+class _Replay:
+    """Read-only stream giving back `head` before the rest of `stream` — a peek at a non-seekable stream."""
+
+    def __init__(self, head: bytes, stream: BinaryIO):
+        self._head   = head
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._head:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._head = self._head + self._stream.read(), b""
+            return data
+        data, self._head = self._head[:size], self._head[size:]
+        if len(data) < size:
+            data += self._stream.read(size - len(data))
+        return data
+
+
+def _log_result(result: ExtractResult, delta: bool, log_callback) -> None:
+    if result.excluded:
+        log_callback(f"  [Extract] {result.excluded} file(s) left out by the include / exclude patterns")
+    if delta:
+        log_callback(f"  [Extract] {result.written} written, {result.skipped} unchanged "
+                     f"({_format_size(result.bytes_skipped)} not rewritten)")
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,76 @@
+from base_extractor import ArchiveFormat, BaseExtractor
+from libarchive_extractor import LibarchiveExtractor
+from sevenzip_extractor import SevenZipExtractor
+from tar_extractor import Lz4TarExtractor, TarExtractor, ZstdTarExtractor
+from unrar_extractor import UnrarExtractor
+from zip_extractor import ZipExtractor
+
+# ── formats ───────────────────────────────────────────────────────────
+# How each archive format is recognised: by its magic bytes, or — only
+# when no signature matches (e.g. pre-POSIX tar files) — by file name.
+# To add a format: describe it here and register a backend for it below.
+
+_FORMATS: list[ArchiveFormat] = [
+    ArchiveFormat("zip",     ((0, b"PK\x03\x04"), (0, b"PK\x05\x06")), (".zip",)),
+    ArchiveFormat("7z",      ((0, b"7z\xbc\xaf\x27\x1c"),),            (".7z",)),
+    ArchiveFormat("rar",     ((0, b"Rar!\x1a\x07\x00"), (0, b"Rar!\x1a\x07\x01\x00")), (".rar",)),
+    ArchiveFormat("tar.gz",  ((0, b"\x1f\x8b"),),                      (".tar.gz", ".tgz")),
+    ArchiveFormat("tar.bz2", ((0, b"BZh"),),                           (".tar.bz2",)),
+    ArchiveFormat("tar.xz",  ((0, b"\xfd7zXZ\x00"),),                  (".tar.xz", ".txz")),
+    ArchiveFormat("tar.zst", ((0, b"\x28\xb5\x2f\xfd"),),              (".tar.zst", ".tzst")),
+    ArchiveFormat("tar.lz4", ((0, b"\x04\x22\x4d\x18"),),              (".tar.lz4",)),
+    ArchiveFormat("tar",     ((257, b"ustar"),),                       (".tar",)),
+]
+
+# how much of a file's head detect() needs to see
+MAGIC_BYTES = max(offset + len(sig) for fmt in _FORMATS for offset, sig in fmt.magic)
+
+# ── backends ──────────────────────────────────────────────────────────
+# For each format, the first backend in this list that handles it and is
+# available on this machine is used: in-process ones before CLI tools.
+# To add a backend: import it, add one line here. Done.
+
+_BACKENDS: list[BaseExtractor] = [
+    ZipExtractor(),
+    TarExtractor(),
+    ZstdTarExtractor(),
+    Lz4TarExtractor(),
+    SevenZipExtractor(),
+    LibarchiveExtractor(),
+    UnrarExtractor(),
+]
+
+
+def detect(head: bytes, filename: str) -> str | None:
+    """Format of an archive from its first MAGIC_BYTES bytes, else from its name; None if neither tells."""
+    for fmt in _FORMATS:
+        if fmt.matches(head):
+            return fmt.name
+    return format_for_name(filename)
+
+
+def format_for_name(filename: str) -> str | None:
+    """Format an archive's file name suggests, or None if it isn't a known archive name."""
+    name = filename.lower()
+    for fmt in _FORMATS:
+        if name.endswith(fmt.suffixes):
+            return fmt.name
+    return None
+
+
+def get_backend(fmt: str) -> tuple[BaseExtractor | None, list[str]]:
+    """The backend to use for `fmt` (None if there's none here), and why the ones before it were skipped."""
+    reasons = []
+    for backend in _BACKENDS:
+        if fmt not in backend.formats:
+            continue
+        reason = backend.unavailable()
+        if reason is None:
+            return backend, reasons
+        reasons.append(f"{backend.name}: {reason}")
+    return None, reasons
+
+
+def available_formats() -> list[str]:
+    """Formats that at least one backend can unpack on this machine."""
+    return [fmt.name for fmt in _FORMATS if get_backend(fmt.name)[0] is not None]
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+
+
+# ── on-disk layout ────────────────────────────────────────────────────
+# HostStats.json lives next to Database.json but is machine-local —
+# throughput depends on where this machine is, so don't commit it.
+#
+# {
+#     "Hosts": {
+#         "cdn.example.com": {"rate": 12345678.0, "samples": 7, "failures": 0, "updated": 1700000000.0}
+#     }
+# }
+
+_STATS_FILE = "HostStats.json"
+_STATS_KEY  = "Hosts"
+
+_WEIGHT     = 0.3                  # share of a new sample in the running average
+_MIN_SAMPLE = 1024 * 1024          # bytes; smaller transfers measure latency, not throughput
+
+
+class HostStats:
+    """
+    Download throughput per host, averaged over runs, so entries with
+    several sources start on the one that has been fastest from here.
+
+    rate() is the exponentially weighted average in bytes/s, None for
+    hosts never measured. A failed or abandoned attempt halves the
+    host's rate. Every update is written straight back (atomically);
+    without a config_dir the stats only live for this process.
+    Thread-safe.
+    """
+
+    def __init__(self, config_dir: Path | None = None):
+        self._path  = config_dir / _STATS_FILE if config_dir is not None else None
+        self._lock  = threading.Lock()
+        self._hosts = self._load()
+
+    def rate(self, url: str) -> float | None:
+        with self._lock:
+            record = self._hosts.get(host_of(url))
+        return record["rate"] if record else None
+
+    def record(self, url: str, size: int, seconds: float) -> None:
+        """A transfer of `size` bytes from url's host took `seconds`."""
+        if size < _MIN_SAMPLE or seconds <= 0:
+            return
+        sample = size / seconds
+        with self._lock:
+            record = self._hosts.setdefault(host_of(url), {"rate": sample, "samples": 0, "failures": 0})
+            record["rate"]     = sample if not record["samples"] else \
+                                 (1 - _WEIGHT) * record["rate"] + _WEIGHT * sample
+            record["samples"] += 1
+            record["updated"]  = time.time()
+            self._save()
+
+    def record_failure(self, url: str) -> None:
+        """A transfer from url's host failed or was abandoned as too slow."""
+        with self._lock:
+            record = self._hosts.get(host_of(url))
+            if record is None:
+                return                  # nothing to demote: unmeasured hosts rank by probe latency
+            record["rate"]     /= 2
+            record["failures"] += 1
+            record["updated"]   = time.time()
+            self._save()
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _load(self) -> dict:
+        if self._path is None or not self._path.exists():
+            return {}
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f).get(_STATS_KEY, {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        """Caller holds the lock."""
+        if self._path is None:
+            return
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({_STATS_KEY: self._hosts}, f, indent=1)
+            os.replace(tmp, self._path)
+        except OSError:
+            pass                        # only a ranking hint: never worth failing a sync over
+
+
+def host_of(url: str) -> str:
+    """What throughput is tracked by: the URL's host (and port)."""
+    return urllib.parse.urlsplit(url).netloc.lower() or url
@@ -0,0 +1,310 @@
+import asyncio
+import http.client
+import io
+import ssl
+import urllib.error
+import urllib.parse
+import weakref
+from collections import deque
+
+
+class ConnectionPool:
+    """
+    Minimal keep-alive HTTP/1.1 client for one asyncio event loop.
+
+    Connections are kept per (scheme, host, port) and handed to later
+    requests, so fetching many files from the same CDN pays for the TCP
+    and TLS handshake a few times instead of once per file. At most
+    `per_host` connections to one host are open at a time; further
+    requests wait for a free one.
+
+    Deliberately small: GET/HEAD, Content-Length, chunked and
+    read-until-close bodies, redirects. No proxies, cookies or
+    compression. HTTP error statuses raise urllib.error.HTTPError so
+    callers can share their urllib error handling.
+    """
+
+    MAX_REDIRECTS = 10
+    DRAIN_LIMIT   = 64 * 1024   # unread body bytes worth reading to keep a connection
+
+    def __init__(self, per_host: int = 8, timeout: float = 60.0, user_agent: str = "AssetPull/1.0"):
+        self.per_host   = per_host
+        self.timeout    = timeout
+        self.user_agent = user_agent
+        self.opened     = 0     # connections opened so far
+        self.requests   = 0     # requests sent so far
+
+        self._idle:  dict[tuple, deque[_Connection]] = {}
+        self._slots: dict[tuple, asyncio.Semaphore] = {}
+        self._ssl:   ssl.SSLContext | None = None
+
+    # ── public ────────────────────────────────────────────────────────
+
+    async def request(self, method: str, url: str, headers: dict | None = None) -> "Response":
+        """
+        Send a request and return once the response headers are in,
+        following redirects. Use the response as an async context manager
+        (or call aclose()) so its connection goes back to the pool.
+        """
+        for _ in range(self.MAX_REDIRECTS + 1):
+            response = await self._send(method, url, headers or {})
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                await response.aclose()
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if response.status >= 400:
+                await response.aclose()
+                raise urllib.error.HTTPError(url, response.status, response.reason,
+                                             response.headers, None)
+            return response
+        raise http.client.HTTPException(f"more than {self.MAX_REDIRECTS} redirects")
+
+    async def aclose(self) -> None:
+        """Close every idle connection."""
+        for idle in self._idle.values():
+            while idle:
+                await idle.popleft().aclose()
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    async def _send(self, method: str, url: str, headers: dict) -> "Response":
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key  = (parts.scheme, parts.hostname, port)
+
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host   = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        lines  = [f"{method} {target} HTTP/1.1", f"Host: {host}",
+                  f"User-Agent: {self.user_agent}", "Accept-Encoding: identity"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        raw_request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        slot = self._slots.setdefault(key, asyncio.Semaphore(self.per_host))
+        await slot.acquire()
+        try:
+            while True:
+                conn   = self._take_idle(key)
+                reused = conn is not None
+                if conn is None:
+                    conn = await self._open(key)
+                try:
+                    conn.writer.write(raw_request)
+                    await conn.writer.drain()
+                    status_line = await conn.readline(self.timeout)
+                    if not status_line:
+                        raise http.client.RemoteDisconnected("server closed the connection")
+                except (ConnectionError, http.client.RemoteDisconnected):
+                    await conn.aclose()
+                    if reused:
+                        continue    # the server dropped an idle connection; use a fresh one
+                    raise
+                break
+
+            self.requests += 1
+            try:
+                version, status, reason = _parse_status(status_line)
+                header_lines = []
+                while (line := await conn.readline(self.timeout)) not in (b"\r\n", b"\n", b""):
+                    header_lines.append(line)
+                parsed = http.client.parse_headers(io.BytesIO(b"".join(header_lines) + b"\r\n"))
+            except BaseException:
+                await conn.aclose()
+                raise
+            return Response(self, key, conn, slot, method, version, status, reason, parsed)
+        except BaseException:
+            slot.release()
+            raise
+
+    def _take_idle(self, key: tuple) -> "_Connection | None":
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                return conn
+            conn.writer.close()
+        return None
+
+    async def _open(self, key: tuple) -> "_Connection":
+        scheme, host, port = key
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context, limit=2 ** 16),
+            self.timeout,
+        )
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, key: tuple, conn: "_Connection") -> None:
+        self._idle.setdefault(key, deque()).append(conn)
+
+
+class Response:
+    """Status, headers and a readable body of one pooled request."""
+
+    def __init__(self, pool: ConnectionPool, key: tuple, conn: "_Connection",
+                 slot: asyncio.Semaphore, method: str, version: str,
+                 status: int, reason: str, headers: http.client.HTTPMessage):
+        self.status  = status
+        self.reason  = reason
+        self.headers = headers
+
+        self._pool   = pool
+        self._key    = key
+        self._conn   = conn
+        self._slot   = slot
+        self._closed = False
+
+        connection = headers.get("Connection", "").lower()
+        self._keep_alive = version == "HTTP/1.1" and "close" not in connection
+
+        # body framing, RFC 9112 §6.3
+        self._chunked   = False
+        self._remaining: int | None = None     # None: read until the server closes
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            self._remaining = 0
+        elif "chunked" in headers.get("Transfer-Encoding", "").lower():
+            self._chunked   = True
+            self._remaining = 0                # bytes left in the current chunk
+            self._last_chunk = False
+        elif headers.get("Content-Length") is not None:
+            self._remaining = int(headers["Content-Length"])
+        else:
+            self._keep_alive = False
+
+    @property
+    def finished(self) -> bool:
+        if self._chunked:
+            return self._last_chunk
+        return self._remaining == 0
+
+    async def read(self, size: int = 64 * 1024) -> bytes:
+        """Up to `size` bytes of body; b"" once the body is complete."""
+        conn = self._conn
+        if self._chunked:
+            if self._last_chunk:
+                return b""
+            if self._remaining == 0:
+                line = await conn.readline(self._pool.timeout)
+                try:
+                    self._remaining = int(line.split(b";")[0].strip(), 16)
+                except ValueError:
+                    raise http.client.HTTPException(f"bad chunk header {line!r}") from None
+                if self._remaining == 0:
+                    # trailers up to the blank line
+                    while await conn.readline(self._pool.timeout) not in (b"\r\n", b"\n", b""):
+                        pass
+                    self._last_chunk = True
+                    return b""
+            data = await conn.read(min(size, self._remaining), self._pool.timeout)
+            if not data:
+                raise http.client.IncompleteRead(b"", self._remaining)
+            self._remaining -= len(data)
+            if self._remaining == 0:
+                await conn.readline(self._pool.timeout)     # CRLF after the chunk
+            return data
+
+        if self._remaining == 0:
+            return b""
+        want = size if self._remaining is None else min(size, self._remaining)
+        data = await conn.read(want, self._pool.timeout)
+        if self._remaining is None:
+            if not data:
+                self._remaining = 0
+            return data
+        if not data:
+            raise http.client.IncompleteRead(b"", self._remaining)
+        self._remaining -= len(data)
+        return data
+
+    async def aclose(self) -> None:
+        """Hand the connection back to the pool if it can carry another request."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            reusable = self._keep_alive
+            if reusable and not self.finished:
+                reusable = await self._drain()
+            if reusable:
+                self._pool._release(self._key, self._conn)
+            else:
+                await self._conn.aclose()
+        finally:
+            self._slot.release()
+
+    async def _drain(self) -> bool:
+        """Read a small unread rest of the body so the connection stays usable."""
+        left = self._pool.DRAIN_LIMIT
+        try:
+            while not self.finished and left > 0:
+                left -= len(await self.read(left))
+        except Exception:
+            return False
+        return self.finished
+
+    async def __aenter__(self) -> "Response":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+# ── per-loop pools ────────────────────────────────────────────────────
+# asyncio streams belong to the loop that opened them, so every event loop
+# gets its own pool.
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ConnectionPool]" = weakref.WeakKeyDictionary()
+
+
+def get_pool(**settings) -> ConnectionPool:
+    """The running loop's pool, created with `settings` on first use."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = ConnectionPool(**settings)
+    return pool
+
+
+async def close_pool() -> None:
+    """Close the running loop's pool, if it has one."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.aclose()
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def readline(self, timeout: float) -> bytes:
+        return await asyncio.wait_for(self.reader.readline(), timeout)
+
+    async def read(self, size: int, timeout: float) -> bytes:
+        return await asyncio.wait_for(self.reader.read(size), timeout)
+
+    async def aclose(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+def _parse_status(line: bytes) -> tuple[str, int, str]:
+    try:
+        version, status, *reason = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        if not version.startswith("HTTP/"):
+            raise ValueError
+        return version, int(status), reason[0] if reason else ""
+    except ValueError:
+        raise http.client.BadStatusLine(repr(line)) from None
@@ -1,8 +1,26 @@
+import asyncio
+import contextvars
+import http.client
+import json
+import os
+import re
+import threading
+import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
+import http_pool
 from base_provider import BaseProvider
+import integrity
+from config import AssetEntry
+from integrity import StreamHash
+from progress import ProgressCallback
+from ranged_file import RangedFile
+from telemetry import note_retry
 
 
 class HttpProvider(BaseProvider):
@@ -10,51 +28,681 @@ class HttpProvider(BaseProvider):
     Downloads assets over plain HTTPS.
     Works with any direct download URL — no special cloud auth required.
     Uses only stdlib (urllib) — no extra dependencies.
+
+    Downloads land in `<file>.part` first. If a transfer dies, the next
+    attempt (in this run or a later one) continues from the end of the
+    .part file with a Range request, guarded by If-Range so a changed
+    remote file restarts from zero instead of producing a spliced mess.
+    A .part that is already complete is only promoted once the server
+    confirms it, by answering the same guarded request with a 416.
+    Transient failures are retried with exponential backoff.
+
+    Entries with `segments` > 1 opt into segmented mode: if the server
+    accepts byte ranges, the file is split into up to that many ranges
+    (none smaller than `min_segment_size`) that are fetched over parallel
+    connections straight into their offsets of a preallocated .part file.
+    Segment progress is kept in the sidecar, so segmented downloads resume
+    across runs too.
+
+    download_async()/probe_async() do the same on an event loop, reusing
+    keep-alive connections from a per-loop pool instead of opening a new
+    connection (and TLS handshake) for every file.
     """
 
-    CHUNK_SIZE = 8 * 1024  # 8 KB read chunks
+    CHUNK_SIZE = 64 * 1024  # 64 KB read chunks
+    USER_AGENT = "AssetPull/1.0"
+    TIMEOUT    = 60        # seconds without data before a read is considered dead
+
+    MAX_RETRIES  = 5
+    BACKOFF_BASE = 1.0     # seconds; doubles every attempt
+    BACKOFF_MAX  = 60.0
+
+    POOL_PER_HOST = 8      # async mode: keep-alive connections per host
+    WRITE_BUFFER  = 1024 * 1024     # async mode: bytes gathered before a thread writes and hashes them
 
     @property
     def name(self) -> str:
         return "HTTP"
 
-    def download(self, url: str, dest_dir: Path, log_callback) -> Path | None:
+    def download(self, url: str, dest_dir: Path, log_callback,
+                 entry: AssetEntry | None = None,
+                 progress: ProgressCallback | None = None,
+                 digest: StreamHash | None = None) -> Path | None:
         dest_dir.mkdir(parents=True, exist_ok=True)
 
-        # derive filename from URL, fall back to "download" if path is empty
-        url_path = url.split("?")[0]                          # strip query params
-        filename = url_path.split("/")[-1] or "download"
-        dest_file = dest_dir / filename
+        dest_file = dest_dir / _filename_from_url(url)
+        part_file = dest_file.with_name(dest_file.name + self.PARTIAL_SUFFIX)
 
         log_callback(f"  [HTTP] Downloading: {url}")
 
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": "AssetPull/1.0"})
-            with urllib.request.urlopen(req) as response:
-                total = int(response.headers.get("Content-Length", 0))
-                downloaded = 0
+            plan = None
+            if entry is not None and entry.segments > 1:
+                plan = self._plan_segments(url, entry, log_callback)
 
-                with open(dest_file, "wb") as out:
-                    while True:
-                        chunk = response.read(self.CHUNK_SIZE)
-                        if not chunk:
-                            break
-                        out.write(chunk)
-                        downloaded += len(chunk)
+            if plan is not None:
+                # ranges land out of order, so `digest` is left for a hash after the fact
+                _SegmentedDownload(self, url, part_file, *plan, log_callback, progress).run()
+            else:
+                self._with_retries(
+                    lambda: self._fetch(url, part_file, log_callback, progress, entry, digest),
+                    log_callback,
+                )
 
-                        if total > 0:
-                            pct = int(downloaded / total * 100)
-                            log_callback(f"  [HTTP] {pct}% ({downloaded}/{total} bytes)")
+        except Exception as e:
+            log_callback(f"  [HTTP] ERROR: {_describe_error(e)}")
+            return None
 
-            log_callback(f"  [HTTP] Saved: {dest_file}")
-            return dest_file
+        os.replace(part_file, dest_file)
+        _meta_path(part_file).unlink(missing_ok=True)
 
-        except urllib.error.HTTPError as e:
-            log_callback(f"  [HTTP] ERROR: HTTP {e.code} — {e.reason}")
+        log_callback(f"  [HTTP] Saved: {dest_file}")
+        return dest_file
+
+    def probe(self, url: str, log_callback) -> dict | None:
+        """HEAD the URL and return whichever of ETag / Last-Modified / size it reports."""
+        try:
+            req = urllib.request.Request(url, method="HEAD", headers={"User-Agent": self.USER_AGENT})
+            with urllib.request.urlopen(req, timeout=self.TIMEOUT) as response:
+                headers = response.headers
+        except Exception as e:
+            log_callback(f"  [HTTP] Probe failed: {e}")
+            return None
+        return _probe_validator(headers)
+
+    def remote_filename(self, url: str) -> str | None:
+        return _filename_from_url(url)
+
+    def open_stream(self, url: str, log_callback,
+                    entry: AssetEntry | None = None,
+                    progress: ProgressCallback | None = None) -> BinaryIO | None:
+        log_callback(f"  [HTTP] Streaming: {url}")
+        try:
+            req = urllib.request.Request(url, headers={"User-Agent": self.USER_AGENT})
+            response = self._with_retries(
+                lambda: urllib.request.urlopen(req, timeout=self.TIMEOUT), log_callback
+            )
+        except Exception as e:
+            log_callback(f"  [HTTP] ERROR: {_describe_error(e)}")
+            return None
+        return _ProgressStream(response, progress)
+
+    def open_ranged(self, url: str, log_callback) -> RangedFile | None:
+        """
+        One suffix-range request for the file's tail tells its size and the
+        version (strong ETag, else Last-Modified) every later range is
+        pinned to with If-Range.
+        """
+        log_callback(f"  [HTTP] Reading byte ranges of {url}")
+        try:
+            tail = self._with_retries(lambda: self._fetch_tail(url), log_callback)
+        except Exception as e:
+            log_callback(f"  [HTTP] ERROR: {_describe_error(e)}")
+            return None
+        if tail is None:
+            log_callback("  [HTTP] Server doesn't serve byte ranges")
+            return None
+        size, validator, data = tail
+
+        def fetch(start: int, end: int) -> BinaryIO:
+            return self._with_retries(lambda: self._open_range(url, start, end, size, validator),
+                                      log_callback)
+
+        return RangedFile(_filename_from_url(url), size, fetch, data)
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _with_retries(self, attempt_fn, log_callback, label: str = "",
+                      cancel: threading.Event | None = None):
+        """
+        Call attempt_fn until it succeeds, backing off between transient
+        failures. Setting `cancel` cuts a backoff short with _Cancelled.
+        """
+        attempt = 0
+        while True:
+            try:
+                return attempt_fn()
+            except Exception as e:
+                if not _is_transient(e) or attempt >= self.MAX_RETRIES:
+                    raise
+
+                delay = min(self.BACKOFF_BASE * 2 ** attempt, self.BACKOFF_MAX)
+                attempt += 1
+                note_retry()
+                log_callback(f"  [HTTP] {label}{_describe_error(e)} — retrying in {delay:g}s "
+                             f"({attempt}/{self.MAX_RETRIES})")
+                if cancel is None:
+                    time.sleep(delay)
+                elif cancel.wait(delay):
+                    raise _Cancelled() from e
+
+    def _plan_segments(self, url: str, entry: AssetEntry, log_callback) -> tuple | None:
+        """(total, validator, count) for a segmented download, None to use a single stream."""
+        try:
+            req = urllib.request.Request(url, method="HEAD", headers={"User-Agent": self.USER_AGENT})
+            with urllib.request.urlopen(req, timeout=self.TIMEOUT) as response:
+                headers = response.headers
+        except Exception as e:
+            log_callback(f"  [HTTP] Range probe failed ({_describe_error(e)}), using one connection")
+            return None
+
+        total = int(headers.get("Content-Length") or 0)
+        integrity.check_size(entry, total)
+        if headers.get("Accept-Ranges", "").lower() != "bytes" or not total:
+            log_callback("  [HTTP] Server doesn't accept byte ranges, using one connection")
+            return None
+
+        count = min(entry.segments, total // max(1, entry.min_segment_size))
+        if count < 2:
             return None
-        except urllib.error.URLError as e:
-            log_callback(f"  [HTTP] ERROR: {e.reason}")
+        return total, _range_validator(headers), count
+
+    def _fetch_tail(self, url: str) -> tuple[int, str | None, bytes] | None:
+        """(size, validator, last bytes) of the remote file; None if the server ignores ranges."""
+        headers = {"User-Agent": self.USER_AGENT, "Range": f"bytes=-{RangedFile.TAIL}"}
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                    timeout=self.TIMEOUT) as response:
+            m = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+            if response.status != 206 or m is None or m.group(3) == "*":
+                return None                     # a 200 is the whole file: don't read it
+            size = int(m.group(3))
+            data = response.read()
+        if len(data) != size - int(m.group(1)):
+            raise http.client.IncompleteRead(data, size - int(m.group(1)) - len(data))
+        return size, _range_validator(response.headers), data
+
+    def _open_range(self, url: str, start: int, end: int, size: int, validator: str | None):
+        """A response for bytes start..end-1 of a file of `size` bytes, still of version `validator`."""
+        headers = {"User-Agent": self.USER_AGENT, "Range": f"bytes={start}-{end - 1}"}
+        if validator:
+            headers["If-Range"] = validator
+        response = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.TIMEOUT)
+        m = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+        if response.status != 206 or m is None or int(m.group(1)) != start or m.group(3) != str(size):
+            response.close()
+            raise _RemoteChanged()
+        return response
+
+    def _fetch(self, url: str, part_file: Path, log_callback,
+               progress: ProgressCallback | None = None,
+               entry: AssetEntry | None = None,
+               digest: StreamHash | None = None) -> None:
+        """One attempt: fill part_file up to the full remote size, resuming if possible."""
+        offset, headers = self._resume_headers(url, part_file)
+
+        try:
+            response = urllib.request.urlopen(
+                urllib.request.Request(url, headers=headers), timeout=self.TIMEOUT
+            )
+        except urllib.error.HTTPError as e:
+            if self._check_range_error(e, part_file, offset):
+                return                                           # finished, just not renamed
+            raise
+
+        with response:
+            total, offset, mode = self._begin_body(response, url, part_file, offset,
+                                                   log_callback, entry, digest)
+
+            downloaded = offset
+            with open(part_file, mode) as out:
+                while True:
+                    chunk = response.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+                    downloaded += len(chunk)
+                    if progress:
+                        progress(downloaded, total)
+
+        if total and downloaded < total:
+            raise http.client.IncompleteRead(b"", total - downloaded)
+
+    def _resume_headers(self, url: str, part_file: Path) -> tuple[int, dict]:
+        """
+        (offset, request headers) for the next attempt. A complete
+        part_file asks for the bytes past its end all the same: the 416
+        that gets is how the server vouches it is still current (see
+        _check_range_error), while a changed remote answers 200.
+        """
+        meta   = _read_meta(_meta_path(part_file))
+        offset = part_file.stat().st_size if part_file.exists() else 0
+
+        headers = {"User-Agent": self.USER_AGENT}
+        if offset and meta.get("url") == url and meta.get("validator") and not meta.get("segments"):
+            headers["Range"]    = f"bytes={offset}-"
+            headers["If-Range"] = meta["validator"]
+        else:
+            offset = 0
+        return offset, headers
+
+    @staticmethod
+    def _check_range_error(error: urllib.error.HTTPError, part_file: Path, offset: int) -> bool:
+        """
+        True if a 416 confirms part_file: the unchanged remote (If-Range
+        held) is exactly `offset` bytes, so the part is the whole file.
+        Any other 416 means our offset is past the remote end — the file
+        changed; start over.
+        """
+        if error.code != 416:
+            return False
+        if offset and error.headers is not None \
+                and error.headers.get("Content-Range") == f"bytes */{offset}":
+            return True
+        part_file.unlink(missing_ok=True)
+        _meta_path(part_file).unlink(missing_ok=True)
+        raise _RestartDownload("remote file shrank since the partial download")
+
+    @staticmethod
+    def _begin_body(response, url: str, part_file: Path, offset: int, log_callback,
+                    entry: AssetEntry | None = None,
+                    digest: StreamHash | None = None) -> tuple[int, int, str]:
+        """
+        Check a (possibly ranged) response; returns (total, offset, file mode)
+        to write with. Rewinds `digest` to match what's already on disk.
+        """
+        meta_file = _meta_path(part_file)
+        try:
+            total = _parse_total(response, offset)
+            if entry is not None:
+                integrity.check_size(entry, total)
+        except (_RestartDownload, integrity.IntegrityError):
+            part_file.unlink(missing_ok=True)
+            meta_file.unlink(missing_ok=True)
+            raise
+        if response.status == 206:
+            log_callback(f"  [HTTP] Resuming at {offset} bytes")
+            mode = "ab"
+        else:
+            # 200: no partial, or If-Range said the remote changed
+            offset = 0
+            mode   = "wb"
+
+        if digest is not None:
+            digest.reset()
+            if offset:
+                digest.update_from_file(part_file, offset)
+
+        _write_meta(meta_file, {
+            "url":       url,
+            "validator": _range_validator(response.headers),
+            "total":     total,
+        })
+        return total, offset, mode
+
+    # ── async ─────────────────────────────────────────────────────────
+    # Same resume and retry rules as above, over keep-alive connections
+    # from the event loop's http_pool.ConnectionPool.
+
+    async def download_async(self, url: str, dest_dir: Path, log_callback,
+                             entry: AssetEntry | None = None,
+                             progress: ProgressCallback | None = None,
+                             digest: StreamHash | None = None) -> Path | None:
+        if entry is not None and entry.segments > 1:
+            # segmented transfers run their own connections on threads
+            return await super().download_async(url, dest_dir, log_callback, entry, progress, digest)
+
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        dest_file = dest_dir / _filename_from_url(url)
+        part_file = dest_file.with_name(dest_file.name + self.PARTIAL_SUFFIX)
+
+        log_callback(f"  [HTTP] Downloading: {url}")
+
+        try:
+            await self._with_retries_async(
+                lambda: self._fetch_async(url, part_file, log_callback, progress, entry, digest),
+                log_callback,
+            )
+        except Exception as e:
+            log_callback(f"  [HTTP] ERROR: {_describe_error(e)}")
             return None
+
+        os.replace(part_file, dest_file)
+        _meta_path(part_file).unlink(missing_ok=True)
+
+        log_callback(f"  [HTTP] Saved: {dest_file}")
+        return dest_file
+
+    async def probe_async(self, url: str, log_callback) -> dict | None:
+        try:
+            async with await self._pool().request("HEAD", url) as response:
+                headers = response.headers
         except Exception as e:
-            log_callback(f"  [HTTP] ERROR: {e}")
+            log_callback(f"  [HTTP] Probe failed: {_describe_error(e)}")
             return None
+        return _probe_validator(headers)
+
+    @classmethod
+    async def close_async(cls) -> None:
+        await http_pool.close_pool()
+
+    def _pool(self) -> http_pool.ConnectionPool:
+        return http_pool.get_pool(per_host=self.POOL_PER_HOST, timeout=self.TIMEOUT,
+                                  user_agent=self.USER_AGENT)
+
+    async def _with_retries_async(self, attempt_fn, log_callback):
+        """Async twin of _with_retries: attempt_fn returns a fresh coroutine per attempt."""
+        attempt = 0
+        while True:
+            try:
+                return await attempt_fn()
+            except Exception as e:
+                if not _is_transient(e) or attempt >= self.MAX_RETRIES:
+                    raise
+
+                delay = min(self.BACKOFF_BASE * 2 ** attempt, self.BACKOFF_MAX)
+                attempt += 1
+                note_retry()
+                log_callback(f"  [HTTP] {_describe_error(e)} — retrying in {delay:g}s "
+                             f"({attempt}/{self.MAX_RETRIES})")
+                await asyncio.sleep(delay)
+
+    async def _fetch_async(self, url: str, part_file: Path, log_callback,
+                           progress: ProgressCallback | None = None,
+                           entry: AssetEntry | None = None,
+                           digest: StreamHash | None = None) -> None:
+        offset, headers = await asyncio.to_thread(self._resume_headers, url, part_file)
+        del headers["User-Agent"]                   # the pool sends its own
+
+        try:
+            response = await self._pool().request("GET", url, headers)
+        except urllib.error.HTTPError as e:
+            if self._check_range_error(e, part_file, offset):
+                return
+            raise
+
+        async with response:
+            # rehashing a resumed part and writing/hashing the body are disk and
+            # CPU work: they go to threads, so the loop keeps serving other transfers
+            total, offset, mode = await asyncio.to_thread(self._begin_body, response, url, part_file,
+                                                          offset, log_callback, entry, digest)
+
+            downloaded = offset
+            buffer     = bytearray()
+            with open(part_file, mode) as out:
+                try:
+                    while chunk := await response.read(self.CHUNK_SIZE):
+                        buffer += chunk
+                        if len(buffer) >= self.WRITE_BUFFER:
+                            await asyncio.to_thread(_write_chunk, out, bytes(buffer), digest)
+                            buffer.clear()
+                        downloaded += len(chunk)
+                        if progress:
+                            progress(downloaded, total)
+                finally:
+                    # keep what arrived before a drop: the next attempt resumes after it
+                    if buffer:
+                        await asyncio.to_thread(_write_chunk, out, bytes(buffer), digest)
+
+        if total and downloaded < total:
+            raise http.client.IncompleteRead(b"", total - downloaded)
+
+
+# ── segmented mode ────────────────────────────────────────────────────
+
+@dataclass
+class _Segment:
+    start: int      # first byte, inclusive
+    end:   int      # last byte, inclusive
+    done:  int = 0  # bytes already written at start..
+
+    @property
+    def finished(self) -> bool:
+        return self.start + self.done > self.end
+
+
+class _SegmentedDownload:
+    """
+    One segmented transfer into a preallocated .part file.
+    Each worker owns one byte range, writes through its own file handle
+    at that range's offset and retries independently. The first segment
+    that gives up cancels the rest; progress so far stays in the sidecar.
+    """
+
+    META_INTERVAL = 1.0  # seconds between sidecar updates
+
+    def __init__(self, provider: HttpProvider, url: str, part_file: Path,
+                 total: int, validator: str | None, count: int, log_callback,
+                 progress: ProgressCallback | None = None):
+        self._provider  = provider
+        self._url       = url
+        self._part      = part_file
+        self._meta_file = _meta_path(part_file)
+        self._total     = total
+        self._validator = validator
+        self._log       = log_callback
+        self._progress  = progress
+
+        self._lock       = threading.Lock()
+        self._cancel     = threading.Event()
+        self._last_save  = 0.0
+        self._segments   = self._resume_or_allocate(count)
+        self._downloaded = sum(seg.done for seg in self._segments)
+
+    def run(self) -> None:
+        pending = [seg for seg in self._segments if not seg.finished]
+        self._log(f"  [HTTP] Segmented download: {len(self._segments)} ranges, "
+                  f"{len(pending)} to fetch")
+
+        error = None
+        with ThreadPoolExecutor(max(1, len(pending)), thread_name_prefix="segment") as pool:
+            # each segment runs in a copy of this context, so its retries count for the entry
+            futures = [pool.submit(contextvars.copy_context().run, self._run_segment, i, seg)
+                       for i, seg in enumerate(self._segments) if not seg.finished]
+            for future in as_completed(futures):
+                if future.exception() is not None and error is None:
+                    error = future.exception()
+                    self._cancel.set()
+
+        if isinstance(error, _RemoteChanged):
+            # the ranges we have belong to an older file — start from zero next time
+            self._part.unlink(missing_ok=True)
+            self._meta_file.unlink(missing_ok=True)
+            raise error
+
+        self._save_meta(force=True)
+        if error is not None:
+            raise error
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _resume_or_allocate(self, count: int) -> list[_Segment]:
+        meta = _read_meta(self._meta_file)
+        if (meta.get("segments") and self._validator
+                and meta.get("url") == self._url
+                and meta.get("validator") == self._validator
+                and meta.get("total") == self._total
+                and self._part.exists() and self._part.stat().st_size == self._total):
+            segments = [_Segment(*seg) for seg in meta["segments"]]
+            self._log(f"  [HTTP] Resuming segmented download at "
+                      f"{sum(seg.done for seg in segments)} bytes")
+            return segments
+
+        step = -(-self._total // count)                       # ceil division
+        segments = [_Segment(start, min(start + step, self._total) - 1)
+                    for start in range(0, self._total, step)]
+        with open(self._part, "wb") as f:
+            f.truncate(self._total)
+        self._save_meta(force=True, segments=segments)
+        return segments
+
+    def _run_segment(self, index: int, seg: _Segment) -> None:
+        label = f"segment {index + 1}: "
+        self._provider._with_retries(lambda: self._fetch_segment(seg), self._log, label, self._cancel)
+
+    def _fetch_segment(self, seg: _Segment) -> None:
+        pos = seg.start + seg.done
+        headers = {"User-Agent": self._provider.USER_AGENT, "Range": f"bytes={pos}-{seg.end}"}
+        if self._validator:
+            headers["If-Range"] = self._validator
+
+        req = urllib.request.Request(self._url, headers=headers)
+        with urllib.request.urlopen(req, timeout=self._provider.TIMEOUT) as response:
+            m = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+            if response.status != 206 or m is None or int(m.group(1)) != pos:
+                raise _RemoteChanged()
+
+            with open(self._part, "r+b") as out:
+                out.seek(pos)
+                while pos <= seg.end:
+                    if self._cancel.is_set():
+                        raise _Cancelled()
+                    chunk = response.read(min(self._provider.CHUNK_SIZE, seg.end - pos + 1))
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    pos += len(chunk)
+                    with self._lock:
+                        seg.done += len(chunk)
+                        self._downloaded += len(chunk)
+                        downloaded = self._downloaded
+                    if self._progress:
+                        self._progress(downloaded, self._total)
+                    self._save_meta()
+
+        if not seg.finished:
+            raise http.client.IncompleteRead(b"", seg.end - pos + 1)
+
+    def _save_meta(self, force: bool = False, segments: list[_Segment] | None = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_save < self.META_INTERVAL:
+                return
+            self._last_save = now
+            segments = segments or self._segments
+            _write_meta(self._meta_file, {
+                "url":       self._url,
+                "validator": self._validator,
+                "total":     self._total,
+                "segments":  [[seg.start, seg.end, seg.done] for seg in segments],
+            })
+
+
+# ── streaming ─────────────────────────────────────────────────────────
+
+class _ProgressStream:
+    """Read-only wrapper around a response that reports byte progress."""
+
+    def __init__(self, response, progress: ProgressCallback | None):
+        self._response = response
+        self._progress = progress
+        self._total    = int(response.headers.get("Content-Length") or 0)
+        self._read     = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._response.read(size)
+        self._read += len(data)
+        if self._progress:
+            self._progress(self._read, self._total)
+        if not data and self._total and self._read < self._total:
+            raise http.client.IncompleteRead(b"", self._total - self._read)
+        return data
+
+    def close(self) -> None:
+        self._response.close()
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+class _RestartDownload(Exception):
+    """The partial file was discarded; the next attempt starts from zero."""
+
+
+class _RemoteChanged(Exception):
+    """A range request came back as a full or mismatched response."""
+
+    def __str__(self):
+        return "remote file changed while its byte ranges were being fetched"
+
+
+class _Cancelled(Exception):
+    """Another segment failed for good; this one stops early, backoff included."""
+
+
+# HTTP statuses worth retrying — everything else (404, 403, ...) fails immediately
+_TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+def _write_chunk(out, data: bytes, digest: StreamHash | None) -> None:
+    out.write(data)
+    if digest is not None:
+        digest.update(data)
+
+
+def _filename_from_url(url: str) -> str:
+    """Derive filename from URL, fall back to "download" if path is empty."""
+    url_path = url.split("?")[0]                              # strip query params
+    return url_path.split("/")[-1] or "download"
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in _TRANSIENT_STATUSES
+    return isinstance(error, (
+        _RestartDownload,
+        urllib.error.URLError,          # DNS hiccup, refused / reset connection
+        http.client.HTTPException,      # IncompleteRead, RemoteDisconnected, ...
+        ConnectionError,
+        TimeoutError,
+    ))
+
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, urllib.error.HTTPError):
+        return f"HTTP {error.code} — {error.reason}"
+    if isinstance(error, urllib.error.URLError):
+        return str(error.reason)
+    if isinstance(error, http.client.IncompleteRead):
+        return f"connection dropped, {error.expected} bytes missing"
+    return str(error) or type(error).__name__
+
+
+def _parse_total(response, offset: int) -> int:
+    """Full size of the remote file, 0 if the server doesn't say."""
+    if response.status == 206:
+        m = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+        if m is None or int(m.group(1)) != offset:
+            raise _RestartDownload("server answered with an unexpected range")
+        return 0 if m.group(3) == "*" else int(m.group(3))
+    return int(response.headers.get("Content-Length", 0))
+
+
+def _probe_validator(headers) -> dict | None:
+    """Whichever of ETag / Last-Modified / size a HEAD response reports."""
+    validator = {}
+    if headers.get("ETag"):
+        validator["etag"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        validator["last_modified"] = headers["Last-Modified"]
+    if headers.get("Content-Length"):
+        validator["size"] = int(headers["Content-Length"])
+    return validator or None
+
+
+def _range_validator(headers) -> str | None:
+    """What to send as If-Range next time: a strong ETag, else Last-Modified."""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def _meta_path(part_file: Path) -> Path:
+    return part_file.with_name(part_file.name + ".json")
+
+
+def _read_meta(meta_file: Path) -> dict:
+    try:
+        with open(meta_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(meta_file: Path, meta: dict) -> None:
+    with open(meta_file, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
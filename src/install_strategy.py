@@ -0,0 +1,121 @@
+import errno
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# ── how files get into place ──────────────────────────────────────────
+#
+# Every install step that relocates a whole file goes through here, with
+# the cheapest mechanism the platform and filesystem allow:
+#
+#   move_file   rename; across filesystems a kernel-side copy + delete
+#   copy_file   reflink (FICLONE: btrfs, XFS, bcachefs...) — shares the blocks,
+#               costs no space; else copy_file_range, sendfile, plain copy
+#   link_file   hardlink (opt-in: both names are then the same file); else copy_file
+#
+# Each returns the mechanism it used, for the log.
+
+_FICLONE    = 0x40049409         # linux/fs.h: _IOW(0x94, 9, int)
+_COPY_CHUNK = 1024 * 1024 * 1024
+
+# errors that mean "this mechanism doesn't work here", not "the copy failed"
+_UNSUPPORTED = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.ENOTTY, errno.EBADF,
+                errno.EOPNOTSUPP, getattr(errno, "ENOTSUP", errno.EOPNOTSUPP), errno.EPERM}
+
+
+def copy_file(src: Path, dst: Path) -> str:
+    """Copy src's content to dst (replacing it) without user-space buffers where possible."""
+    if sys.platform.startswith("linux"):
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            infd, outfd = fin.fileno(), fout.fileno()
+            if _reflink(infd, outfd):
+                return "reflink"
+            size = os.fstat(infd).st_size
+            if _copy_file_range(infd, outfd, size):
+                return "copy_file_range"
+            if _sendfile(infd, outfd, size):
+                return "sendfile"
+    shutil.copyfile(src, dst)       # kernel-side on macOS too (fcopyfile)
+    return "copy"
+
+
+def move_file(src: Path, dst: Path) -> str:
+    """Move src to dst: a rename on one filesystem, else copy_file() + delete (metadata kept)."""
+    try:
+        os.replace(src, dst)
+        return "rename"
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    how = copy_file(src, dst)
+    shutil.copystat(src, dst)
+    os.remove(src)
+    return how
+
+
+def link_file(src: Path, dst: Path) -> str:
+    """Make dst a hardlink to src; copy_file() where that's impossible (other volume, FAT, ...)."""
+    try:
+        if os.path.lexists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        return copy_file(src, dst)
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+def _reflink(infd: int, outfd: int) -> bool:
+    import fcntl
+    try:
+        fcntl.ioctl(outfd, _FICLONE, infd)
+        return True
+    except OSError as e:
+        if e.errno in _UNSUPPORTED:
+            return False
+        raise
+
+
+def _copy_file_range(infd: int, outfd: int, size: int) -> bool:
+    """Kernel-side copy; on NFS/SMB it can be a server-side copy, on some filesystems a clone."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    offset = 0
+    try:
+        while offset < size:
+            done = os.copy_file_range(infd, outfd, min(size - offset, _COPY_CHUNK),
+                                      offset_src=offset, offset_dst=offset)
+            if done == 0:
+                break
+            offset += done
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED or offset:
+            raise
+        return False
+    return offset == size or _restart(outfd)
+
+
+def _sendfile(infd: int, outfd: int, size: int) -> bool:
+    if not hasattr(os, "sendfile"):
+        return False
+    offset = 0
+    try:
+        while offset < size:
+            done = os.sendfile(outfd, infd, offset, min(size - offset, _COPY_CHUNK))
+            if done == 0:
+                break
+            offset += done
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED or offset:
+            raise
+        return False
+    return offset == size or _restart(outfd)
+
+
+def _restart(outfd: int) -> bool:
+    """The source came up short (changed mid-copy?): empty dst and let the next mechanism try."""
+    os.ftruncate(outfd, 0)
+    os.lseek(outfd, 0, os.SEEK_SET)
+    return False
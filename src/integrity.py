@@ -0,0 +1,96 @@
+import hashlib
+from pathlib import Path
+
+from config import AssetEntry
+
+_HASH_CHUNK = 1024 * 1024
+
+
+class IntegrityError(Exception):
+    """Downloaded bytes don't match the size / sha256 published for the entry."""
+
+
+class StreamHash:
+    """
+    Running sha256 and byte count of a file, fed by a provider as it
+    writes the bytes, so verifying a download needs no second read.
+
+    A provider that can't see every byte in order (segmented HTTP,
+    megatools) simply leaves it unfed; verify() then hashes the file.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over, e.g. when a retry rewrites the file from zero."""
+        self._hash  = hashlib.sha256()
+        self._known = None
+        self.source = "streamed"
+        self.size   = 0
+
+    def update(self, data: bytes) -> None:
+        self._hash.update(data)
+        self.size += len(data)
+
+    def update_from_file(self, path: Path, length: int) -> None:
+        """Feed the first `length` bytes already on disk (a resumed partial download)."""
+        with open(path, "rb") as f:
+            while length > 0 and (chunk := f.read(min(_HASH_CHUNK, length))):
+                self.update(chunk)
+                length -= len(chunk)
+
+    def set_known(self, digest: str, size: int, source: str) -> None:
+        """The content was identified by other means (e.g. a cache blob named by its hash)."""
+        self._known = digest
+        self.source = source
+        self.size   = size
+
+    def hexdigest(self) -> str:
+        return self._known or self._hash.hexdigest()
+
+    def covers(self, path: Path) -> bool:
+        """Whether this hash was fed the whole of `path`."""
+        return self.size > 0 and self.size == path.stat().st_size
+
+
+def expects(entry: AssetEntry) -> bool:
+    """Whether the entry publishes anything to verify against."""
+    return bool(entry.sha256) or entry.size is not None
+
+
+def check_size(entry: AssetEntry, total: int) -> None:
+    """Fail before the transfer if the remote reports a size other than the published one."""
+    if entry.size is not None and total and total != entry.size:
+        raise IntegrityError(f"remote file is {total} bytes, expected {entry.size}")
+
+
+def verify(path: Path, entry: AssetEntry, streamed: StreamHash | None, log_callback) -> str:
+    """
+    Check a downloaded file against the entry's size / sha256 and return
+    its sha256. Uses the streamed hash when it covers the whole file,
+    otherwise reads the file once. Raises IntegrityError on a mismatch.
+    """
+    size = path.stat().st_size
+    if entry.size is not None and size != entry.size:
+        raise IntegrityError(f"{path.name} is {size} bytes, expected {entry.size}")
+
+    if streamed is not None and streamed.covers(path):
+        digest, how = streamed.hexdigest(), streamed.source
+    else:
+        digest, how = sha256_file(path), "hashed after download"
+
+    if entry.sha256 and digest != entry.sha256.lower():
+        raise IntegrityError(f"{path.name} has sha256 {digest[:16]}…, expected {entry.sha256[:16]}…")
+
+    log_callback(f"  [Verify] {path.name}: "
+                 + ("sha256 OK" if entry.sha256 else "size OK") + f" ({how})")
+    return digest
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
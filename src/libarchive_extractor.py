@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+
+from base_extractor import BaseExtractor, ExtractResult, MemberFilter, Meter, member_target, mtime_unchanged
+
+
+class LibarchiveExtractor(BaseExtractor):
+    """
+    RAR (v4 and v5) and 7z in-process via libarchive (optional:
+    `pip install libarchive-c`, which loads the system's libarchive).
+
+    Entries are read block by block and each block is written as it
+    arrives, so memory stays flat and progress follows the decompressed
+    bytes. Delta mode compares size + mtime (which extraction restores);
+    skipped entries aren't written. Links and special files are skipped.
+    """
+
+    formats = ("rar", "7z")
+
+    @property
+    def name(self) -> str:
+        return "libarchive"
+
+    def unavailable(self) -> str | None:
+        try:
+            import libarchive  # noqa: F401
+        except (ImportError, OSError) as e:     # OSError: the module is there, the shared library isn't
+            return f"libarchive isn't available ({e}) — pip install libarchive-c"
+        return None
+
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: MemberFilter | None = None,
+                meter: Meter, current: Path) -> ExtractResult:
+        import libarchive
+
+        log_callback(f"  [Extract] Unpacking {archive.name} ({fmt}, libarchive)")
+        result  = ExtractResult()
+        ignored = 0
+        with libarchive.file_reader(str(archive)) as entries:
+            for entry in entries:
+                target = member_target(dest, entry.pathname)
+                if target is None:
+                    continue
+                if select is not None and not select(entry.pathname):
+                    result.excluded += entry.isreg
+                    continue                    # libarchive skips the data without decoding it where it can
+                if entry.isdir:
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+                if not entry.isreg:
+                    ignored += 1
+                    continue
+
+                rel, size = target.relative_to(dest).as_posix(), entry.size or 0
+                result.files.append(rel)
+                unchanged = delta and entry.mtime is not None and mtime_unchanged(current / rel, size, entry.mtime)
+                result.count(size, skipped=unchanged)
+                if unchanged:
+                    meter.add(size)
+                    continue
+
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with open(target, "wb") as out:
+                    for block in entry.get_blocks():
+                        out.write(block)
+                        meter.add(len(block))
+                if entry.mtime is not None:
+                    os.utime(target, (entry.mtime, entry.mtime))
+
+        if ignored:
+            log_callback(f"  [Extract] Skipped {ignored} link(s) / special file(s)")
+        return result
@@ -9,9 +9,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
-    QCheckBox,
+    QTableView,
     QHeaderView,
     QAbstractItemView,
     QDialog,
@@ -19,25 +17,33 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QTextEdit,
     QLabel,
+    QLineEdit,
+    QProgressBar,
 )
-from PySide6 import QtGui
 
-from config import AssetEntry, load_config, save_config
+import provider_registry
+from asset_table import COL_CHECK, AssetFilterProxy, AssetTableModel, CheckBoxDelegate
+from config import AssetEntry, Catalog
+from host_stats import HostStats
+from progress import ProgressEvent
 from sync_runner import SyncRunner
+from sync_state import SyncState
 from edit_dialog import EditDialog
 
 
 # ── worker thread ─────────────────────────────────────────────────────
 # SyncRunner is CPU/IO-bound; run it off the main thread so the log pane
-# stays responsive during downloads.
+# stays responsive during downloads. The runner only ever talks to the UI
+# through this worker's signals, which Qt queues onto the main thread.
 
 class _SyncWorker(QThread):
     log_line = Signal(str)          # emitted per log line
+    progress = Signal(object)       # emitted per (throttled) ProgressEvent
     finished = Signal()             # emitted when all entries are done
 
-    def __init__(self, runner: SyncRunner, entries: list[AssetEntry]):
+    def __init__(self, make_runner: Callable[["_SyncWorker"], SyncRunner], entries: list[AssetEntry]):
         super().__init__()
-        self._runner  = runner
+        self._runner  = make_runner(self)
         self._entries = entries
 
     def run(self):
@@ -55,6 +61,7 @@ class MainWindow(QWidget):
         self._config_dir = config_dir
         self._temp_dir   = config_dir / "Temp"
         self._worker: _SyncWorker | None = None
+        provider_registry.set_host_stats(HostStats(config_dir))
 
         self.setWindowTitle("AssetPull")
         self.setObjectName("mainWindow")
@@ -70,14 +77,30 @@ class MainWindow(QWidget):
     def _build_ui(self):
         main = QVBoxLayout()
 
+        # ── filter ──────────────────────────────────────────────────
+        self._filter = QLineEdit()
+        self._filter.setPlaceholderText("Filter by name, location or type")
+        self._filter.setClearButtonEnabled(True)
+        main.addWidget(self._filter)
+
         # ── asset table ─────────────────────────────────────────────
-        self._table = QTableWidget()
-        self._table.setColumnCount(5)
-        self._table.setHorizontalHeaderLabels(["", "Name", "Location", "Type", "URL"])
-        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self._model = AssetTableModel(parent=self)
+        self._proxy = AssetFilterProxy(self)
+        self._proxy.setSourceModel(self._model)
+
+        self._table = QTableView()
+        self._table.setModel(self._proxy)
+        self._table.setItemDelegateForColumn(COL_CHECK, CheckBoxDelegate(self._table))
+        self._table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)    # file order until a header is clicked
+        self._table.setSortingEnabled(True)
+        self._table.setAlternatingRowColors(True)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self._table.horizontalHeader().setStretchLastSection(True)
         self._table.horizontalHeader().setMinimumHeight(40)
+        self._table.horizontalHeader().setResizeContentsPrecision(200)     # fit columns to a sample of rows
         self._table.verticalHeader().setVisible(False)
+        self._table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self._table.verticalHeader().setDefaultSectionSize(44)
         self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self._table.setSelectionMode(QAbstractItemView.SingleSelection)
         self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -105,10 +128,21 @@ class MainWindow(QWidget):
         self._log.setReadOnly(True)
         main.addWidget(self._log)
 
+        # ── progress ────────────────────────────────────────────────
+        self._progress_label = QLabel()
+        self._progress_bar   = QProgressBar()
+        self._progress_bar.setRange(0, 1000)
+        self._progress_bar.setTextVisible(False)
+        self._progress_label.hide()
+        self._progress_bar.hide()
+        main.addWidget(self._progress_label)
+        main.addWidget(self._progress_bar)
+
         self.setLayout(main)
 
     def _connect_signals(self):
-        self._table.cellDoubleClicked.connect(self._on_double_click)
+        self._table.doubleClicked.connect(self._on_double_click)
+        self._filter.textChanged.connect(self._proxy.set_filter_text)
         self._btn_add.clicked.connect(self._on_add)
         self._btn_delete.clicked.connect(self._on_delete)
         self._btn_select_all.clicked.connect(self._on_select_all)
@@ -118,69 +152,58 @@ class MainWindow(QWidget):
     # ── table helpers ───────────────────────────────────────────────
 
     def _load_table(self):
-        self._table.setRowCount(0)
-        for entry in load_config(self._config_dir):
-            self._append_row(entry)
-
-    def _append_row(self, entry: AssetEntry, checked: bool = False):
-        row = self._table.rowCount()
-        self._table.insertRow(row)
-
-        # checkbox cell
-        cb = QCheckBox()
-        cb.setChecked(checked)
-        wrapper = QWidget()
-        layout  = QHBoxLayout(wrapper)
-        layout.addWidget(cb)
-        layout.setAlignment(Qt.AlignCenter)
-        layout.setContentsMargins(0, 0, 0, 0)
-        self._table.setCellWidget(row, 0, wrapper)
-
-        # data cells
-        for col, value in enumerate([entry.name, entry.location, entry.type, entry.url], start=1):
-            self._table.setItem(row, col, QTableWidgetItem(value))
-
-        self._table.setRowHeight(row, 44)
-
-        # alternating row color
-        bg = "#1E1E1E" if row % 2 else "#121212"
-        wrapper.setStyleSheet(f"background-color: {bg};")
-        for col in range(1, 5):
-            self._table.item(row, col).setBackground(QtGui.QColor(bg))
-
-    def _row_to_entry(self, row: int) -> AssetEntry:
-        return AssetEntry(
-            name=self._table.item(row, 1).text(),
-            location=self._table.item(row, 2).text(),
-            type=self._table.item(row, 3).text(),
-            url=self._table.item(row, 4).text(),
-        )
+        self._catalog = Catalog(self._config_dir)
+        self._model.set_entries(self._catalog.entries())
+        self._table.resizeColumnsToContents()
 
-    def _save_table(self):
-        entries = [self._row_to_entry(r) for r in range(self._table.rowCount())]
-        save_config(self._config_dir, entries)
+    def _source_row(self, index) -> int:
+        return self._proxy.mapToSource(index).row()
 
     # ── button handlers ─────────────────────────────────────────────
 
-    def _on_double_click(self, row: int, _col: int):
-        dialog = EditDialog(entry=self._row_to_entry(row), parent=self)
+    def _on_double_click(self, index):
+        if index.column() == COL_CHECK:
+            return
+        row    = self._source_row(index)
+        entry  = self._model.entry(row)
+        dialog = EditDialog(entry=entry, parent=self)
         if dialog.exec() == QDialog.Accepted:
             updated = dialog.get_entry()
-            for col, val in enumerate([updated.name, updated.location, updated.type, updated.url], start=1):
-                self._table.item(row, col).setText(val)
-            self._save_table()
+            try:
+                self._catalog.update(entry.name, updated)
+            except ValueError as e:
+                self._write_log(f"Not saved: {e}")
+                return
+            if updated.name != entry.name:
+                # the catalog renamed it in other entries' depends_on too
+                self._model.refresh(self._catalog.entries())
+            else:
+                self._model.replace(row, updated)
+            self._catalog.save()
 
     def _on_add(self):
         dialog = EditDialog(parent=self)
         if dialog.exec() == QDialog.Accepted:
-            self._append_row(dialog.get_entry())
-            self._save_table()
+            entry = dialog.get_entry()
+            try:
+                self._catalog.add(entry)
+            except ValueError as e:
+                self._write_log(f"Not added: {e}")
+                return
+            self._model.append(entry)
+            self._catalog.save()
 
     def _on_delete(self):
-        row = self._table.currentRow()
-        if row != -1:
-            self._table.removeRow(row)
-            self._save_table()
+        index = self._table.currentIndex()
+        if index.isValid():
+            row = self._source_row(index)
+            try:
+                self._catalog.remove(self._model.entry(row).name)
+            except ValueError as e:
+                self._write_log(f"Not deleted: {e}")
+                return
+            self._model.remove(row)
+            self._catalog.save()
 
     def _on_select_all(self):
         self._set_all_checkboxes(True)
@@ -189,31 +212,53 @@ class MainWindow(QWidget):
         self._set_all_checkboxes(False)
 
     def _set_all_checkboxes(self, state: bool):
-        for row in range(self._table.rowCount()):
-            cb = self._table.cellWidget(row, 0).layout().itemAt(0).widget()
-            cb.setChecked(state)
+        # only the rows the filter shows
+        rows = (self._source_row(self._proxy.index(r, 0)) for r in range(self._proxy.rowCount()))
+        self._model.set_checked(rows, state)
 
     # ── sync ────────────────────────────────────────────────────────
 
     def _on_sync(self):
-        selected = []
-        for row in range(self._table.rowCount()):
-            cb = self._table.cellWidget(row, 0).layout().itemAt(0).widget()
-            if cb.isChecked():
-                selected.append(self._row_to_entry(row))
+        selected = self._model.checked_entries()
 
         if not selected:
             self._write_log("Nothing selected.")
             return
 
         self._btn_run.setEnabled(False)
-        runner = SyncRunner(self._root_dir, self._temp_dir, self._write_log)
-        self._worker = _SyncWorker(runner, selected)
+        self._worker = _SyncWorker(
+            lambda worker: SyncRunner(self._root_dir, self._temp_dir,
+                                      log_callback=worker.log_line.emit,
+                                      progress_callback=worker.progress.emit,
+                                      state=SyncState(self._config_dir)),
+            selected,
+        )
+        self._worker.log_line.connect(self._write_log)
+        self._worker.progress.connect(self._on_progress)
         self._worker.finished.connect(self._on_sync_finished)
         self._worker.start()
 
     def _on_sync_finished(self):
         self._btn_run.setEnabled(True)
+        self._progress_label.hide()
+        self._progress_bar.hide()
+
+    def _on_progress(self, event: ProgressEvent):
+        if event.finished:
+            self._progress_label.hide()
+            self._progress_bar.hide()
+            return
+        fraction = event.fraction
+        if fraction is None:
+            self._progress_bar.setRange(0, 0)         # busy indicator
+            detail = f"{event.done / (1024 * 1024):.1f} MB"
+        else:
+            self._progress_bar.setRange(0, 1000)
+            self._progress_bar.setValue(int(fraction * 1000))
+            detail = f"{fraction * 100:.0f}%"
+        self._progress_label.setText(f"{event.entry} — {event.phase} {detail}")
+        self._progress_label.show()
+        self._progress_bar.show()
 
     # ── log ─────────────────────────────────────────────────────────
 
@@ -311,9 +356,10 @@ class MainWindow(QWidget):
         }
 
         /* Table */
-        QTableWidget {
+        QTableView {
             border: 1px solid #1B2030;
-            background-color: #0F1115;
+            background-color: #121212;
+            alternate-background-color: #1E1E1E;
             color: #E6EAF2;
             gridline-color: #0F1115;
             border-radius: 10px;
@@ -325,25 +371,25 @@ class MainWindow(QWidget):
             border: none;
             font-weight: 700;
         }
-        QTableWidget::item {
+        QTableView::item {
             padding-left: 10px;
         }
-        QTableWidget::item:selected {
+        QTableView::item:selected {
             background-color: #2A3350;
             color: #E6EAF2;
         }
 
         /* Checkbox */
-        QCheckBox::indicator {
+        QCheckBox::indicator, QTableView::indicator {
             width: 18px;
             height: 18px;
             border-radius: 5px;
         }
-        QCheckBox::indicator:unchecked {
+        QCheckBox::indicator:unchecked, QTableView::indicator:unchecked {
             border: 2px solid #2B3550;
             background-color: #141823;
         }
-        QCheckBox::indicator:checked {
+        QCheckBox::indicator:checked, QTableView::indicator:checked {
             border: 2px solid #6D7CFF;
             background-color: #6D7CFF;
         }
@@ -352,6 +398,18 @@ class MainWindow(QWidget):
         QTextEdit {
             font-family: "Consolas", "Courier New", monospace;
         }
+
+        /* Progress */
+        QProgressBar {
+            background-color: #141823;
+            border: 1px solid #232A3A;
+            border-radius: 6px;
+            max-height: 10px;
+        }
+        QProgressBar::chunk {
+            background-color: #6D7CFF;
+            border-radius: 5px;
+        }
         """)
 
     # ── static entry point ──────────────────────────────────────────
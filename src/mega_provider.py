@@ -1,23 +1,47 @@
+import json
+import os
+import re
+import shlex
+import shutil
 import subprocess
 import sys
+import tempfile
+import urllib.request
 from pathlib import Path
 
 from base_provider import BaseProvider
+from config import AssetEntry
+from integrity import StreamHash
+from progress import ProgressCallback
 
 
 class MegaProvider(BaseProvider):
     """
     Downloads assets from Mega cloud via the megatools CLI.
     megatools.exe (or megadl on Linux) must be available at the configured path.
+
+    Every megatools run pays process startup and the API handshake, so file
+    links can also be fetched in batches: one `megatools dl` run for many
+    links, each result matched to its link by the filename megatools
+    reports for it.
     """
 
+    # Overrides the megatools command line, e.g. "python fake_megatools.py"
+    ENV_COMMAND = "ASSETPULL_MEGATOOLS"
+
     def __init__(self, megatool_path: str | None = None):
         """
         Args:
             megatool_path: Explicit path to megatools binary.
-                           If None, falls back to Tools/megatools/ relative to exe.
+                           If None, uses $ASSETPULL_MEGATOOLS, then falls back
+                           to Tools/megatools/ relative to exe.
         """
-        self._megatool_path = megatool_path or self._default_megatool_path()
+        if megatool_path is not None:
+            self._command = [megatool_path]
+        elif os.environ.get(self.ENV_COMMAND):
+            self._command = shlex.split(os.environ[self.ENV_COMMAND], posix=sys.platform != "win32")
+        else:
+            self._command = [self._default_megatool_path()]
 
     # ── interface ─────────────────────────────────────────────────────
 
@@ -25,44 +49,154 @@ class MegaProvider(BaseProvider):
     def name(self) -> str:
         return "Mega"
 
-    def download(self, url: str, dest_dir: Path, log_callback) -> Path | None:
+    def download(self, url: str, dest_dir: Path, log_callback,
+                 entry: AssetEntry | None = None,
+                 progress: ProgressCallback | None = None,
+                 digest: StreamHash | None = None) -> Path | None:
+        # megatools writes the file itself, so `digest` stays unfed
         dest_dir.mkdir(parents=True, exist_ok=True)
 
-        command = [self._megatool_path, "dl", "--path", str(dest_dir), url]
-        log_callback(f"  [Mega] Running: {' '.join(command)}")
+        ok, names = self._run_dl([url], dest_dir, log_callback, [progress])
+        if not ok:
+            return None
+
+        if names[0] is not None and (dest_dir / names[0]).is_file():
+            return dest_dir / names[0]
+        # folder links (or a megatools build that doesn't report names): take what appeared
+        files = [f for f in dest_dir.iterdir() if f.is_file()]
+        return files[0] if files else None
+
+    def can_batch(self, url: str) -> bool:
+        # folder links expand to many files, so they can't be told apart in a shared run
+        parsed = _parse_link(url)
+        return parsed is not None and parsed[0] == "file"
+
+    def download_batch(self, urls: list[str], dest_dirs: list[Path], log_callback,
+                       progress: list[ProgressCallback | None] | None = None) -> list[Path | None]:
+        if not urls:
+            return []
+        progress = progress or [None] * len(urls)
+        for d in dest_dirs:
+            d.mkdir(parents=True, exist_ok=True)
+
+        # one shared download dir next to the entries' own, so moving out is a rename
+        batch_dir = Path(tempfile.mkdtemp(prefix=".mega-batch-", dir=dest_dirs[0].parent))
+        try:
+            _, names = self._run_dl(urls, batch_dir, log_callback, progress)
+
+            results: list[Path | None] = []
+            for url, dest_dir, name in zip(urls, dest_dirs, names):
+                source = batch_dir / name if name is not None else None
+                if source is None or not source.is_file():
+                    log_callback(f"  [Mega] No file reported for {url}")
+                    results.append(None)
+                    continue
+                results.append(Path(shutil.move(str(source), str(dest_dir / name))))
+            return results
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+
+    def probe(self, url: str, log_callback) -> dict | None:
+        """
+        Ask the Mega API for the node behind a public link.
+        File links yield {handle, size}; folder links add the node count and
+        newest timestamp so any change inside the folder is noticed.
+        """
+        parsed = _parse_link(url)
+        if parsed is None:
+            return None
+        kind, handle = parsed
+
+        try:
+            if kind == "file":
+                node = _api_request([{"a": "g", "p": handle}])[0]
+                if not isinstance(node, dict):
+                    raise RuntimeError(f"API error {node}")
+                return {"handle": handle, "size": node["s"]}
+
+            listing = _api_request([{"a": "f", "c": 1, "r": 1, "ca": 1}], node=handle)[0]
+            if not isinstance(listing, dict):
+                raise RuntimeError(f"API error {listing}")
+            nodes = listing.get("f", [])
+            return {
+                "handle": handle,
+                "size":   sum(n.get("s", 0) for n in nodes),
+                "nodes":  len(nodes),
+                "ts":     max((n.get("ts", 0) for n in nodes), default=0),
+            }
+        except Exception as e:
+            log_callback(f"  [Mega] Probe failed: {e}")
+            return None
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _run_dl(self, urls: list[str], dest_dir: Path, log_callback,
+                progress: list[ProgressCallback | None]) -> tuple[bool, list[str | None]]:
+        """
+        Run one `megatools dl` for all urls into dest_dir.
+
+        Returns (exit status was 0, filename reported per url — None where
+        megatools reported an error or nothing). megatools handles links
+        in the order given, so every "Downloaded" line belongs to the
+        first link that has no outcome yet; error lines are matched by the
+        link they quote.
+        """
+        command = [*self._command, "dl", "--path", str(dest_dir), *urls]
+        log_callback(f"  [Mega] Running: {' '.join(command[:len(self._command) + 3])} "
+                     + (urls[0] if len(urls) == 1 else f"<{len(urls)} links>"))
+
+        names: list[str | None] = [None] * len(urls)
+        current = 0         # index of the link megatools is working on
+        process = None
 
         try:
+            # stderr merged so error lines arrive in order with the rest;
+            # text mode also splits megatools' \r-refreshed progress line
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
             )
 
             for line in process.stdout:
-                stripped = line.rstrip()
-                if stripped:
-                    log_callback(f"  [Mega] {stripped}")
+                stripped = _ANSI_RE.sub("", line).strip()
+                if not stripped:
+                    continue
 
-            process.wait()
+                status = _parse_progress(stripped)
+                if status is not None:
+                    if current < len(urls) and progress[current]:
+                        progress[current](*status)
+                    continue
 
-            if process.returncode != 0:
-                stderr_output = process.stderr.read().strip()
-                log_callback(f"  [Mega] ERROR (exit {process.returncode}): {stderr_output}")
-                return None
+                log_callback(f"  [Mega] {stripped}")
+                done = _DOWNLOADED_RE.match(stripped)
+                if done and current < len(urls):
+                    names[current] = Path(done.group("name")).name
+                    current += 1
+                elif stripped.startswith("ERROR"):
+                    quoted = [i for i, u in enumerate(urls) if u in stripped]
+                    # an error we can't pin on a link: stop guessing, the rest
+                    # stay unresolved rather than risk swapping two files
+                    current = max(current, quoted[0] + 1) if quoted else len(urls)
+
+            process.wait()
 
         except FileNotFoundError:
-            log_callback(f"  [Mega] ERROR: megatools not found at '{self._megatool_path}'")
-            return None
+            log_callback(f"  [Mega] ERROR: megatools not found at '{' '.join(self._command)}'")
+            return False, names
         except Exception as e:
+            # also a progress callback cancelling the download: don't leave megatools running
+            if process is not None:
+                process.kill()
+                process.wait()
             log_callback(f"  [Mega] ERROR: {e}")
-            return None
+            return False, names
 
-        # return the first file that appeared in dest_dir
-        files = [f for f in dest_dir.iterdir() if f.is_file()]
-        return files[0] if files else None
-
-    # ── internals ─────────────────────────────────────────────────────
+        if process.returncode != 0:
+            log_callback(f"  [Mega] ERROR: megatools exited with {process.returncode}")
+        return process.returncode == 0, names
 
     @staticmethod
     def _default_megatool_path() -> str:
@@ -75,3 +209,60 @@ class MegaProvider(BaseProvider):
         # Tools/megatools/ lives one level up from the package root
         binary = "megatools.exe" if sys.platform == "win32" else "megadl"
         return str(base.parent / "Tools" / "megatools" / binary)
+
+
+# ── megatools output ──────────────────────────────────────────────────
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+# e.g. "Downloaded textures.zip"
+_DOWNLOADED_RE = re.compile(r"Downloaded (?P<name>.+)$")
+
+# e.g. "textures.zip: 45.23% - 120.0 MiB (125829120 bytes) of 265.3 MiB (4.2 MiB/s)"
+_PROGRESS_RE = re.compile(r"(?P<pct>\d+(?:\.\d+)?)% - .*?\((?P<done>\d+) bytes\)")
+
+
+def _parse_progress(line: str) -> tuple[int, int] | None:
+    """(done, total) bytes from a megatools progress line, None for any other line."""
+    m = _PROGRESS_RE.search(line)
+    if m is None:
+        return None
+    done, pct = int(m.group("done")), float(m.group("pct"))
+    total = round(done * 100 / pct) if pct else 0
+    return done, total
+
+
+# ── Mega API helpers ──────────────────────────────────────────────────
+
+_API_URL = "https://g.api.mega.co.nz/cs"
+
+# https://mega.nz/file/<handle>#<key>, https://mega.nz/folder/<handle>#<key>
+# and the legacy https://mega.nz/#!<handle>!<key>, https://mega.nz/#F!<handle>!<key>
+_LINK_RE = re.compile(
+    r"mega(?:\.co)?\.nz/(?:(?P<kind>file|folder)/(?P<handle>[\w-]+)"
+    r"|#(?P<legacy>F?)!(?P<legacy_handle>[\w-]+))"
+)
+
+
+def _parse_link(url: str) -> tuple[str, str] | None:
+    """Return ("file" | "folder", handle) for a public Mega link, None otherwise."""
+    m = _LINK_RE.search(url)
+    if m is None:
+        return None
+    if m.group("kind"):
+        return m.group("kind"), m.group("handle")
+    return ("folder" if m.group("legacy") else "file"), m.group("legacy_handle")
+
+
+def _api_request(commands: list[dict], node: str | None = None) -> list:
+    query = "?id=0" + (f"&n={node}" if node else "")
+    req = urllib.request.Request(
+        _API_URL + query,
+        data=json.dumps(commands).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=30) as response:
+        result = json.loads(response.read())
+    if isinstance(result, int):
+        raise RuntimeError(f"API error {result}")
+    return result
@@ -0,0 +1,311 @@
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from base_provider import BaseProvider
+from config import AssetEntry
+from host_stats import HostStats, host_of
+from integrity import StreamHash
+from progress import ProgressCallback
+
+_MB = 1024 * 1024
+
+
+class MultiSourceProvider(BaseProvider):
+    """
+    One entry's equivalent sources — its own type/url followed by its
+    `sources` — behind a single provider, each source fetched with the
+    provider of its type.
+
+    probe() asks every source at once: the first answer in entry order is
+    the validator, and how fast each answered ranks the sources nobody has
+    measured yet. A download starts on the best-ranked source: hosts
+    HostStats has never measured first (quickest probe first — each gets
+    tried once, and hedging covers a bad guess), then the highest
+    throughput, then known-slow hosts, then those that didn't answer.
+    While it runs its throughput is watched:
+      - below `hedge_below`, or well below what its own host or another
+        source managed before, the next source is started alongside it
+        (a hedge);
+      - once both have run a while, one clearly slower than the other is
+        cancelled (a switch); otherwise the first to finish wins;
+      - a source that fails hands over to the next one.
+    Losers are cancelled through their progress callback, which raises;
+    download() doesn't wait for that (a loser may be stalled on a read or
+    backing off), and each deletes its own folder once it has stopped.
+    Every transfer's throughput goes back into HostStats.
+
+    Attempts download into their own subfolders, so they can't collide.
+    Multi-source entries aren't streamed or batched, and the chunks of a
+    chunked one come from next to its own `url`.
+    """
+
+    HEDGE_AFTER  = 3.0      # seconds an attempt runs before its throughput is judged
+    SWITCH_RATIO = 2.0      # this many times slower than the other attempt (or another source's record): replace it
+    PROBE_WAIT   = 5.0      # seconds to wait for probe answers; later ones count as no answer
+    RATE_WINDOW  = 2.0      # seconds of progress the current throughput is measured over
+    POLL         = 0.2
+
+    def __init__(self, sources: list[tuple[BaseProvider, str]], stats: HostStats, hedge_below: float):
+        self._sources     = sources
+        self._stats       = stats
+        self._hedge_below = hedge_below
+        self._latency:    dict[str, float] | None = None      # url → probe seconds; absent: no answer
+        self._validators: dict[str, dict] = {}
+
+    @property
+    def name(self) -> str:
+        return "/".join(dict.fromkeys(provider.name for provider, _ in self._sources))
+
+    def probe(self, url: str, log_callback) -> dict | None:
+        self._probe_all(log_callback)
+        primary = self._sources[0][1]
+        for _, source in self._sources:
+            validator = self._validators.get(source)
+            if validator is not None:
+                # another source's version only ever matches itself
+                return validator if source == primary else {"source": source, **validator}
+        return None
+
+    def download(self, url: str, dest_dir: Path, log_callback,
+                 entry: AssetEntry | None = None,
+                 progress: ProgressCallback | None = None,
+                 digest: StreamHash | None = None) -> Path | None:
+        primary, primary_url = self._sources[0]
+        if url != primary_url:
+            # not the entry's file (a chunk next to its manifest): only its own source has it
+            return primary.download(url, dest_dir, log_callback, entry, progress, digest)
+        self._probe_all(log_callback)
+        order = self._ranked()
+        return _Race(self, order, dest_dir, log_callback, entry, progress, digest).run()
+
+    # ── ranking ───────────────────────────────────────────────────────
+
+    def _probe_all(self, log_callback) -> None:
+        """Probe every source concurrently (once per instance), timing the answers."""
+        if self._latency is not None:
+            return
+        latency, validators = {}, {}
+
+        def probe(provider: BaseProvider, source: str) -> None:
+            began     = time.perf_counter()
+            validator = provider.probe(source, lambda line: None)
+            if validator is not None:
+                latency[source]    = time.perf_counter() - began
+                validators[source] = validator
+
+        pool = ThreadPoolExecutor(len(self._sources), thread_name_prefix="probe")
+        wait([pool.submit(probe, provider, source) for provider, source in self._sources],
+             timeout=self.PROBE_WAIT)
+        pool.shutdown(wait=False)
+        self._latency, self._validators = dict(latency), dict(validators)   # late answers don't count
+
+        log_callback(f"  [Sources] {len(self._sources)} source(s): " + ", ".join(
+            f"{host_of(source)} " + (f"{self._latency[source] * 1000:.0f} ms" if source in self._latency
+                                     else "no answer")
+            + (f" / {rate / _MB:.1f} MB/s before" if (rate := self._stats.rate(source)) else "")
+            for _, source in self._sources))
+
+    def _ranked(self) -> list[tuple[BaseProvider, str]]:
+        def key(item: tuple[int, tuple[BaseProvider, str]]):
+            index, (_, source) = item
+            rate = self._stats.rate(source)
+            if source not in self._latency:
+                return 3, index
+            if rate is None:
+                return 0, self._latency[source]
+            return (1 if rate >= self._hedge_below else 2), -rate
+        return [source for _, source in sorted(enumerate(self._sources), key=key)]
+
+
+# ── one download over several sources ────────────────────────────────
+
+class _Cancelled(Exception):
+    def __str__(self):
+        return "cancelled: another source is being used"
+
+
+class _Attempt:
+    """One source's download, running on a worker thread."""
+
+    def __init__(self, index: int, provider: BaseProvider, url: str, dest_dir: Path,
+                 log_callback, hashed: bool):
+        self.index    = index
+        self.provider = provider
+        self.url      = url
+        self.host     = host_of(url)
+        self.dir      = dest_dir / f".source-{index}"
+        self.hash     = StreamHash() if hashed else None
+        self.cancel   = threading.Event()
+        self.started  = time.monotonic()
+        self.done     = 0
+        self.total    = 0
+        self.future:  Future | None = None
+        self._window: deque[tuple[float, int]] = deque()
+        self._log     = log_callback
+
+    def run(self, entry: AssetEntry | None) -> Path | None:
+        """The worker: download, and if the attempt was cancelled meanwhile, delete what it wrote."""
+        try:
+            return self.provider.download(self.url, self.dir, self.log, entry, self.report, self.hash)
+        finally:
+            if self.cancel.is_set():
+                shutil.rmtree(self.dir, ignore_errors=True)
+
+    def log(self, line: str) -> None:
+        if not self.cancel.is_set():            # a cancelled loser's last words are noise
+            self._log(line)
+
+    def report(self, done: int, total: int) -> None:
+        if self.cancel.is_set():
+            raise _Cancelled()
+        now = time.monotonic()
+        self.done, self.total = done, total
+        self._window.append((now, done))
+        while len(self._window) > 2 and now - self._window[0][0] > MultiSourceProvider.RATE_WINDOW:
+            self._window.popleft()
+
+    def rate(self) -> float:
+        """Bytes/s over the last few seconds (0 when stalled)."""
+        now = time.monotonic()
+        if not self._window or now - self._window[-1][0] > MultiSourceProvider.RATE_WINDOW:
+            return 0.0
+        (t0, d0), (t1, d1) = self._window[0], self._window[-1]
+        if t1 - t0 < 0.5:
+            return self.done / max(now - self.started, 1e-3)
+        return (d1 - d0) / (t1 - t0)
+
+    def judged(self) -> bool:
+        return time.monotonic() - self.started >= MultiSourceProvider.HEDGE_AFTER
+
+
+class _Race:
+    """Runs attempts over the ranked sources until one delivers the file."""
+
+    def __init__(self, owner: MultiSourceProvider, order: list[tuple[BaseProvider, str]],
+                 dest_dir: Path, log_callback, entry: AssetEntry | None,
+                 progress: ProgressCallback | None, digest: StreamHash | None):
+        self._owner    = owner
+        self._queue    = deque(enumerate(order))
+        self._dest     = dest_dir
+        self._log      = log_callback
+        self._entry    = entry
+        self._progress = progress
+        self._digest   = digest
+        self._running: list[_Attempt] = []
+        self._started: list[_Attempt] = []     # every attempt, running or not
+        # a worker per source: a cancelled attempt holds its thread until its next progress report
+        self._pool     = ThreadPoolExecutor(len(order), thread_name_prefix="source")
+
+    def run(self) -> Path | None:
+        won = None
+        try:
+            self._start("Starting on")
+            while self._running:
+                wait([a.future for a in self._running], timeout=self._owner.POLL, return_when=FIRST_COMPLETED)
+                for attempt in [a for a in self._running if a.future.done()]:
+                    self._running.remove(attempt)
+                    file = self._result(attempt)
+                    if file is not None:
+                        won = self._win(attempt, file)
+                        return won
+                    if not self._running:
+                        self._start("Switching to")
+                self._report()
+                self._hedge_or_switch()
+            self._log("  [Sources] ERROR: no source could deliver the file")
+            return None
+        finally:
+            # losers still running stop at their next progress report and clean up after themselves
+            for attempt in self._started:
+                attempt.cancel.set()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            if won is not None:
+                for attempt in self._started:
+                    if attempt.future.done():
+                        shutil.rmtree(attempt.dir, ignore_errors=True)
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _start(self, verb: str) -> bool:
+        if not self._queue:
+            return False
+        index, (provider, url) = self._queue.popleft()
+        attempt = _Attempt(index, provider, url, self._dest, self._log, self._digest is not None)
+        rate = self._owner._stats.rate(url)
+        self._log(f"  [Sources] {verb} {attempt.host}"
+                  + (f" ({rate / _MB:.1f} MB/s before)" if rate else ""))
+        attempt.future = self._pool.submit(attempt.run, self._entry)
+        self._running.append(attempt)
+        self._started.append(attempt)
+        return True
+
+    def _result(self, attempt: _Attempt) -> Path | None:
+        stats = self._owner._stats
+        try:
+            file = attempt.future.result()
+        except Exception as e:
+            attempt.log(f"  [Sources] ERROR from {attempt.host}: {e}")
+            file = None
+        if file is None and not attempt.cancel.is_set():
+            stats.record_failure(attempt.url)
+        return file
+
+    def _win(self, attempt: _Attempt, file: Path) -> Path:
+        seconds = time.monotonic() - attempt.started
+        size    = file.stat().st_size
+        rate    = size / max(seconds, 1e-3)
+        self._owner._stats.record(attempt.url, size, seconds)
+        for other in self._running:
+            self._give_up(other, f"{attempt.host} finished first",
+                          slow=other.rate() * self._owner.SWITCH_RATIO < rate)
+
+        dest_file = self._dest / file.name
+        os.replace(file, dest_file)
+        if self._progress is not None:
+            self._progress(size, size)
+        if self._digest is not None and attempt.hash.covers(dest_file):
+            self._digest.set_known(attempt.hash.hexdigest(), attempt.hash.size, "streamed")
+        self._log(f"  [Sources] Got {file.name} from {attempt.host} ({rate / _MB:.1f} MB/s)")
+        return dest_file
+
+    def _give_up(self, attempt: _Attempt, why: str, slow: bool) -> None:
+        """Cancel a running attempt, keeping what it showed of its host's speed (and ranking it lower if `slow`)."""
+        attempt.cancel.set()
+        stats = self._owner._stats
+        stats.record(attempt.url, attempt.done, time.monotonic() - attempt.started)
+        if slow:
+            stats.record_failure(attempt.url)
+        self._log(f"  [Sources] Dropped {attempt.host}: {why}")
+
+    def _hedge_or_switch(self) -> None:
+        owner = self._owner
+        if len(self._running) == 1:
+            current = self._running[0]
+            if not current.judged() or not self._queue:
+                return
+            rate = current.rate()
+            urls = [current.url, *(url for _, (_, url) in self._queue)]
+            best = max(owner._stats.rate(url) or 0.0 for url in urls)
+            if rate < owner._hedge_below or rate * owner.SWITCH_RATIO < best:
+                self._log(f"  [Sources] {current.host} at {rate / _MB:.1f} MB/s — racing another source")
+                self._start("Hedging with")
+        elif len(self._running) == 2:
+            first, second = self._running
+            if not second.judged():
+                return
+            for slow, fast in ((first, second), (second, first)):
+                if slow.rate() * owner.SWITCH_RATIO < fast.rate():
+                    self._running.remove(slow)
+                    self._give_up(slow, f"{fast.host} is {fast.rate() / max(slow.rate(), 1.0):.0f}× faster",
+                                  slow=True)
+                    return
+
+    def _report(self) -> None:
+        if self._progress is not None and self._running:
+            lead = max(self._running, key=lambda a: a.done)
+            self._progress(lead.done, lead.total)
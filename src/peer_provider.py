@@ -0,0 +1,221 @@
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import BinaryIO
+
+from base_provider import BaseProvider
+from config import AssetEntry
+from http_provider import HttpProvider
+from integrity import StreamHash
+from peer_server import ARTIFACTS_PATH, BLOBS_PATH
+from progress import ProgressCallback
+from ranged_file import RangedFile
+
+_LOOKUP_TIMEOUT = 3.0       # seconds; a LAN mirror answers at once or is off
+_RETRY_DOWN     = 300.0     # seconds before a mirror that didn't answer is asked again
+
+# mirror → when it last failed to answer a lookup
+_down: dict[str, float] = {}
+_down_lock = threading.Lock()
+
+
+class PeerProvider(BaseProvider):
+    """
+    Wraps an entry's own provider (the "origin") and tries LAN mirrors —
+    other machines running Main.py --serve — before it: an artifact one
+    workstation downloaded is then pulled by the rest of the team over
+    the LAN instead of from Mega / the web each time.
+
+    Which artifact a mirror must have:
+      - entries with a `sha256`: the blob with that hash;
+      - others: one the mirror cached under the same URL and the same
+        remote validator the origin reports now (probed if the run hasn't
+        already), so a stale mirror is never used for a newer version.
+    What comes back is hashed while it downloads and must match the
+    mirror's advertised sha256 and size, the entry's sha256 / size and
+    the size in the origin's validator; anything else is discarded. When
+    no mirror has it, or one fails, the origin downloads it as usual.
+
+    Streams and byte ranges come from the origin, for files no mirror
+    has: one a mirror has is downloaded from it whole instead, since it's
+    checked before anything is unpacked. Batches go to the origin only
+    for what no mirror had. provider_registry wraps every provider in one
+    when mirrors are set.
+    """
+
+    def __init__(self, origin: BaseProvider, mirrors: list[str]):
+        self._origin     = origin
+        self._mirrors    = [m.rstrip("/") for m in mirrors]
+        self._validators: dict[str, dict | None] = {}     # url → what the origin's probe said
+        self._http       = HttpProvider()
+
+    @property
+    def name(self) -> str:
+        return self._origin.name
+
+    @property
+    def origin(self) -> BaseProvider:
+        """The wrapped provider, for downloads mirrors never have (e.g. chunks)."""
+        return self._origin
+
+    def download(self, url: str, dest_dir: Path, log_callback,
+                 entry: AssetEntry | None = None,
+                 progress: ProgressCallback | None = None,
+                 digest: StreamHash | None = None) -> Path | None:
+        file = self._from_mirrors(url, dest_dir, log_callback, entry, progress, digest)
+        if file is not None:
+            return file
+        return self._origin.download(url, dest_dir, log_callback, entry, progress, digest)
+
+    def probe(self, url: str, log_callback) -> dict | None:
+        validator = self._validators[url] = self._origin.probe(url, log_callback)
+        return validator
+
+    def remote_filename(self, url: str) -> str | None:
+        return self._origin.remote_filename(url)
+
+    def open_stream(self, url: str, log_callback,
+                    entry: AssetEntry | None = None,
+                    progress: ProgressCallback | None = None) -> BinaryIO | None:
+        if self._on_mirror(url, entry, log_callback):
+            return None                 # download() fetches it from the mirror
+        return self._origin.open_stream(url, log_callback, entry, progress)
+
+    def open_ranged(self, url: str, log_callback) -> RangedFile | None:
+        if self._on_mirror(url, None, log_callback):
+            return None
+        return self._origin.open_ranged(url, log_callback)
+
+    def can_batch(self, url: str) -> bool:
+        return self._origin.can_batch(url)
+
+    def download_batch(self, urls: list[str], dest_dirs: list[Path], log_callback,
+                       progress: list[ProgressCallback | None] | None = None) -> list[Path | None]:
+        progress = progress or [None] * len(urls)
+        results  = [self._from_mirrors(url, dest_dir, log_callback, None, report, None)
+                    for url, dest_dir, report in zip(urls, dest_dirs, progress)]
+        rest = [i for i, file in enumerate(results) if file is None]
+        if rest:
+            fetched = self._origin.download_batch([urls[i] for i in rest], [dest_dirs[i] for i in rest],
+                                                  log_callback, [progress[i] for i in rest])
+            for i, file in zip(rest, fetched):
+                results[i] = file
+        return results
+
+    async def download_async(self, url: str, dest_dir: Path, log_callback,
+                             entry: AssetEntry | None = None,
+                             progress: ProgressCallback | None = None,
+                             digest: StreamHash | None = None) -> Path | None:
+        file = await asyncio.to_thread(self._from_mirrors, url, dest_dir, log_callback,
+                                       entry, progress, digest)
+        if file is not None:
+            return file
+        return await self._origin.download_async(url, dest_dir, log_callback, entry, progress, digest)
+
+    async def probe_async(self, url: str, log_callback) -> dict | None:
+        validator = self._validators[url] = await self._origin.probe_async(url, log_callback)
+        return validator
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _from_mirrors(self, url: str, dest_dir: Path, log_callback,
+                      entry: AssetEntry | None, progress: ProgressCallback | None,
+                      digest: StreamHash | None) -> Path | None:
+        """The artifact from the first mirror that has it and passes the checks; None to use the origin."""
+        for mirror, artifact, validator in self._find(url, entry, log_callback):
+            file = self._fetch(mirror, artifact, dest_dir, log_callback, entry, validator, progress)
+            if file is not None:
+                if digest is not None:
+                    digest.set_known(artifact["sha256"], artifact["size"], "verified from mirror")
+                return file
+        return None
+
+    def _on_mirror(self, url: str, entry: AssetEntry | None, log_callback) -> bool:
+        """Whether any mirror has the artifact (without fetching it)."""
+        return next(self._find(url, entry, log_callback), None) is not None
+
+    def _find(self, url: str, entry: AssetEntry | None, log_callback):
+        """Yield (mirror, artifact, validator) for each mirror that has the artifact, in order."""
+        if entry is not None and entry.sha256:
+            query, validator = {"sha256": entry.sha256.lower()}, None
+        else:
+            if url not in self._validators:
+                self.probe(url, log_callback)
+            validator = self._validators[url]
+            if validator is None:
+                return              # can't tell which version a mirror's copy is
+            query = {"url": url}
+
+        for mirror in self._mirrors:
+            with _down_lock:
+                if time.monotonic() - _down.get(mirror, -_RETRY_DOWN) < _RETRY_DOWN:
+                    continue
+            artifact = self._lookup(mirror, query, validator, log_callback)
+            if artifact is not None:
+                yield mirror, artifact, validator
+
+    def _lookup(self, mirror: str, query: dict, validator: dict | None, log_callback) -> dict | None:
+        """The mirror's artifact matching `query` (and `validator`), or None."""
+        request = urllib.request.Request(f"{mirror}{ARTIFACTS_PATH}?{urllib.parse.urlencode(query)}",
+                                         headers={"User-Agent": HttpProvider.USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=_LOOKUP_TIMEOUT) as response:
+                found = json.load(response).get("artifacts", [])
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                log_callback(f"  [Peer] {mirror}: HTTP {e.code}")
+            return None
+        except (OSError, ValueError) as e:
+            log_callback(f"  [Peer] {mirror} unreachable ({e}), skipping it for now")
+            with _down_lock:
+                _down[mirror] = time.monotonic()
+            return None
+        for artifact in found:
+            if validator is None or artifact.get("validator") == validator:
+                return artifact
+        return None
+
+    def _fetch(self, mirror: str, artifact: dict, dest_dir: Path, log_callback,
+               entry: AssetEntry | None, validator: dict | None,
+               progress: ProgressCallback | None) -> Path | None:
+        """Download and check one mirror artifact; None (and nothing left behind) if it fails."""
+        sha256, size = artifact["sha256"], artifact["size"]
+        name = Path(artifact["name"]).name          # the origin's file name: decides how it's installed
+        log_callback(f"  [Peer] {mirror} has {name} ({sha256[:12]})")
+
+        streamed = StreamHash()
+        scratch  = dest_dir / ".peer"
+        blob = self._http.download(f"{mirror}{BLOBS_PATH}{sha256}", scratch,
+                                   log_callback, progress=progress, digest=streamed)
+        if blob is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+            return None
+
+        problem = None
+        if not streamed.covers(blob) or streamed.hexdigest() != sha256:
+            problem = "its content doesn't match its advertised sha256"
+        elif blob.stat().st_size != size:
+            problem = f"it is {blob.stat().st_size} bytes, advertised {size}"
+        elif entry is not None and entry.sha256 and sha256 != entry.sha256.lower():
+            problem = "it isn't the sha256 the entry publishes"
+        elif entry is not None and entry.size is not None and size != entry.size:
+            problem = f"it is {size} bytes, the entry expects {entry.size}"
+        elif validator is not None and validator.get("size") not in (None, size):
+            problem = f"it is {size} bytes, the origin reports {validator['size']}"
+        if problem is not None:
+            log_callback(f"  [Peer] Rejected {name} from {mirror}: {problem}")
+            shutil.rmtree(scratch, ignore_errors=True)
+            return None
+
+        dest_file = dest_dir / name
+        os.replace(blob, dest_file)
+        shutil.rmtree(scratch, ignore_errors=True)
+        log_callback(f"  [Peer] Verified {name} from {mirror}")
+        return dest_file
@@ -0,0 +1,107 @@
+import http.server
+import json
+import urllib.parse
+from pathlib import Path
+
+from download_cache import DownloadCache
+
+# ── protocol ──────────────────────────────────────────────────────────
+#
+# GET /artifacts?url=<source url>   {"artifacts": [{"sha256", "size", "name", "validator"}, ...]}
+# GET /artifacts?sha256=<hash>      {"artifacts": [{"sha256", "size", "name"}]}
+# GET /blobs/<sha256>               the artifact's bytes
+#
+# Only what the download cache holds is served: artifacts this machine
+# downloaded, under the source URL + remote version they came from.
+
+ARTIFACTS_PATH = "/artifacts"
+BLOBS_PATH     = "/blobs/"
+
+
+class PeerServer:
+    """
+    Serves a machine's DownloadCache to the LAN (Main.py --serve), so
+    other workstations can pull artifacts from it through PeerProvider
+    instead of each downloading them from the origin.
+
+    Read-only and unauthenticated: run it on a trusted network. Clients
+    verify what they get (see PeerProvider).
+    """
+
+    def __init__(self, cache: DownloadCache, host: str, port: int, log_callback):
+        self._server = http.server.ThreadingHTTPServer((host, port), _make_handler(cache, log_callback))
+        self._server.daemon_threads = True
+        self._log    = log_callback
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._log(f"Serving the download cache at {self.address} (Ctrl+C to stop)")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+
+
+def _make_handler(cache: DownloadCache, log_callback):
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"       # keep-alive: a client pulls many artifacts in a row
+        server_version   = "AssetPull-peer/1.0"
+
+        def do_GET(self):
+            path, _, query = self.path.partition("?")
+            if path == ARTIFACTS_PATH:
+                params = urllib.parse.parse_qs(query)
+                found  = cache.artifacts(url=params.get("url", [None])[0],
+                                         sha256=params.get("sha256", [None])[0])
+                self._send_json({"artifacts": found}, 200 if found else 404)
+            elif path.startswith(BLOBS_PATH) and (blob := cache.blob(path[len(BLOBS_PATH):])) is not None:
+                self._send_file(blob)
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+        def do_HEAD(self):
+            path = self.path.partition("?")[0]
+            blob = cache.blob(path[len(BLOBS_PATH):]) if path.startswith(BLOBS_PATH) else None
+            if blob is None:
+                self.send_error(404)
+                return
+            self._send_headers(blob)
+
+        def _send_json(self, data: dict, status: int) -> None:
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_file(self, blob: Path) -> None:
+            with open(blob, "rb") as f:     # an open handle survives eviction of the blob mid-send
+                self._send_headers(blob)
+                self.wfile.flush()
+                try:
+                    self.connection.sendfile(f)     # zero-copy where the OS has it
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                    return
+            log_callback(f"  [Serve] {self.client_address[0]} ← {blob.name[:12]}")
+
+        def _send_headers(self, blob: Path) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(blob.stat().st_size))
+            self.send_header("ETag", f'"{blob.name}"')      # content-addressed: the hash is the version
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass                            # one line per artifact sent is enough
+
+    return Handler
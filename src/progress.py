@@ -0,0 +1,150 @@
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+
+# ── events ────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Byte progress of one phase ("download", "extract", ...) of one entry."""
+    entry:    str
+    phase:    str
+    done:     int
+    total:    int            # 0 when unknown
+    finished: bool = False   # last event of this phase
+
+    @property
+    def fraction(self) -> float | None:
+        return min(1.0, self.done / self.total) if self.total else None
+
+
+# What providers and the extractor receive: report(done_bytes, total_bytes).
+ProgressCallback = Callable[[int, int], None]
+
+
+class ProgressThrottle:
+    """
+    Turns raw (done, total) reports into ProgressEvents and forwards at
+    most `rate` of them per second per (entry, phase) to `sink`. The
+    first event, the one reaching 100% and the finishing event of a phase
+    always go through.
+    Safe to call from any thread.
+    """
+
+    def __init__(self, sink: Callable[[ProgressEvent], None] | None, rate: float = 10.0):
+        self._sink     = sink
+        self._interval = 1.0 / rate
+        self._lock     = threading.Lock()
+        self._last: dict[tuple[str, str], tuple[float, ProgressEvent]] = {}
+
+    @contextmanager
+    def phase(self, entry: str, phase: str):
+        """Yield a ProgressCallback for one phase; emits the finishing event on exit."""
+        if self._sink is None:
+            yield None
+            return
+
+        key = (entry, phase)
+
+        def report(done: int, total: int) -> None:
+            event = ProgressEvent(entry, phase, done, total)
+            now   = time.monotonic()
+            with self._lock:
+                sent_at = self._last[key][0] if key in self._last else None
+                due     = (sent_at is None or now - sent_at >= self._interval
+                           or (total and done >= total))
+                self._last[key] = (now if due else sent_at, event)
+            if due:
+                self._sink(event)
+
+        try:
+            yield report
+        finally:
+            with self._lock:
+                last = self._last.pop(key, None)
+            done, total = (last[1].done, last[1].total) if last else (0, 0)
+            self._sink(ProgressEvent(entry, phase, done, total, finished=True))
+
+
+# ── console rendering ─────────────────────────────────────────────────
+
+class ConsoleProgress:
+    """
+    CLI front end: log lines scroll as usual while one status line at the
+    bottom shows a bar per active transfer. Falls back to plain log lines
+    (and no bars) when stdout isn't a terminal, e.g. in CI logs.
+    """
+
+    BAR_WIDTH = 24
+
+    def __init__(self, stream=None):
+        self._out    = stream or sys.stdout
+        self._tty    = self._out.isatty()
+        self._lock   = threading.Lock()
+        self._active: dict[tuple[str, str], ProgressEvent] = {}
+        self._shown  = 0            # length of the status line currently on screen
+
+    def log(self, text: str) -> None:
+        with self._lock:
+            self._clear()
+            print(text, file=self._out)
+            self._draw()
+
+    def update(self, event: ProgressEvent) -> None:
+        if not self._tty:
+            return
+        with self._lock:
+            key = (event.entry, event.phase)
+            if event.finished:
+                self._active.pop(key, None)
+            else:
+                self._active[key] = event
+            self._clear()
+            self._draw()
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _clear(self) -> None:
+        # plain spaces rather than ANSI erase codes — works in any Windows console
+        if self._shown:
+            self._out.write("\r" + " " * self._shown + "\r")
+            self._shown = 0
+
+    def _draw(self) -> None:
+        if not self._tty or not self._active:
+            self._out.flush()
+            return
+        width  = shutil.get_terminal_size().columns - 1
+        events = list(self._active.values())
+        if len(events) == 1:
+            line = self._bar(events[0])
+        else:
+            line = f"[{len(events)} active] " + " · ".join(self._compact(e) for e in events)
+        line = line[:width]
+        self._out.write(line)
+        self._out.flush()
+        self._shown = len(line)
+
+    def _bar(self, event: ProgressEvent) -> str:
+        fraction = event.fraction
+        if fraction is None:
+            return f"  {event.entry} {event.phase}  {_mb(event.done)}"
+        filled = int(fraction * self.BAR_WIDTH)
+        bar    = "#" * filled + "." * (self.BAR_WIDTH - filled)
+        return (f"  {event.entry} {event.phase} [{bar}] {fraction * 100:5.1f}%  "
+                f"{_mb(event.done)} / {_mb(event.total)}")
+
+    @staticmethod
+    def _compact(event: ProgressEvent) -> str:
+        fraction = event.fraction
+        amount   = f"{fraction * 100:.0f}%" if fraction is not None else _mb(event.done)
+        return f"{event.entry} {event.phase} {amount}"
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
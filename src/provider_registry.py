@@ -1,6 +1,10 @@
 from mega_provider import MegaProvider
 from http_provider import HttpProvider
 from base_provider import BaseProvider
+from config import AssetEntry
+from host_stats import HostStats
+from multi_source import MultiSourceProvider
+from peer_provider import PeerProvider
 
 # ── registry ──────────────────────────────────────────────────────────
 # Maps the "Type" string from Database.json to a provider class.
@@ -11,6 +15,33 @@ _REGISTRY: dict[str, type[BaseProvider]] = {
     "HTTP": HttpProvider,
 }
 
+# ── LAN mirrors ───────────────────────────────────────────────────────
+# Other machines running --serve. When set, every provider handed out is
+# wrapped in a PeerProvider that asks them before its own source.
+
+_mirrors: list[str] = []
+
+
+def set_mirrors(urls: list[str]) -> None:
+    """Base URLs of the LAN mirrors to try first (empty: go straight to the sources)."""
+    _mirrors[:] = urls
+
+
+# ── multi-source entries ──────────────────────────────────────────────
+# Entries listing extra `sources` get a MultiSourceProvider over all of
+# them, ranked by the throughput each host managed before.
+
+_host_stats  = HostStats()
+_hedge_below = 1024 * 1024         # bytes/s: a source slower than this gets raced by the next one
+
+
+def set_host_stats(stats: HostStats, hedge_below: float | None = None) -> None:
+    """Where source throughput is kept across runs, and the rate below which downloads are hedged."""
+    global _host_stats, _hedge_below
+    _host_stats = stats
+    if hedge_below is not None:
+        _hedge_below = hedge_below
+
 
 def get_provider(type_name: str) -> BaseProvider | None:
     """
@@ -20,9 +51,41 @@ def get_provider(type_name: str) -> BaseProvider | None:
     cls = _REGISTRY.get(type_name)
     if cls is None:
         return None
-    return cls()
+    return _with_mirrors(cls())
+
+
+def provider_for(entry: AssetEntry) -> BaseProvider | None:
+    """
+    The provider that fetches `entry`: its type's, or a MultiSourceProvider
+    when it lists more sources. None if any source's type is unknown.
+    """
+    if not entry.sources:
+        return get_provider(entry.type)
+    sources = []
+    for source in [{"type": entry.type, "url": entry.url}, *entry.sources]:
+        cls = _REGISTRY.get(source.get("type", entry.type))
+        if cls is None:
+            return None
+        sources.append((cls(), source["url"]))
+    return _with_mirrors(MultiSourceProvider(sources, _host_stats, _hedge_below))
+
+
+def unknown_types(entry: AssetEntry) -> list[str]:
+    """The provider types `entry` names that aren't registered."""
+    types = [entry.type, *(source.get("type", entry.type) for source in entry.sources)]
+    return [t for t in dict.fromkeys(types) if t not in _REGISTRY]
+
+
+def _with_mirrors(provider: BaseProvider) -> BaseProvider:
+    return PeerProvider(provider, _mirrors) if _mirrors else provider
 
 
 def available_types() -> list[str]:
     """All registered provider names — used to populate the GUI dropdown."""
     return list(_REGISTRY.keys())
+
+
+async def close_async() -> None:
+    """Let every provider release what it kept open on the running event loop."""
+    for cls in _REGISTRY.values():
+        await cls.close_async()
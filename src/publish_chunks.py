@@ -0,0 +1,108 @@
+"""
+Publish an asset version in the chunked format (see chunk_store.py).
+
+Splits the payload — a folder, an archive (unpacked first) or a single
+file — into content-defined chunks, adds the chunks the output folder
+doesn't have yet under <out>/chunks/ and writes <out>/<name>.manifest.json.
+Serve <out> as static files and point a `"chunked": true` HTTP entry at
+the manifest's URL. Publishing every version into the same folder means
+each one only adds the chunks that changed.
+
+Usage:
+    python publish_chunks.py <PAYLOAD> <OUT_FOLDER> [--name Textures] [--avg-kb 1024]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import uuid
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from chunk_store import MANIFEST_SUFFIX, ChunkedFile, ChunkParams, Manifest, chunk_path, split
+from extractor import extract, is_archive
+
+_LEVEL = 6      # zlib level for stored chunks
+
+
+def publish(payload: Path, out_dir: Path, name: str, params: ChunkParams, log_callback) -> Manifest:
+    """Chunk every file under `payload` (a folder or a single file) into out_dir; return the manifest."""
+    files    = sorted(p for p in payload.rglob("*") if p.is_file()) if payload.is_dir() else [payload]
+    base     = payload if payload.is_dir() else payload.parent
+    manifest = Manifest(params=params)
+    added    = 0
+
+    # zlib and sha256 release the GIL: compress and write chunks on a few threads
+    workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(workers) as pool:
+        pending = deque()           # (chunk list, slot, future) in file order
+
+        def settle_one() -> int:
+            chunks, slot, future = pending.popleft()
+            digest, size, packed, new = future.result()
+            chunks[slot] = digest
+            manifest.chunks[digest] = (size, packed)
+            return int(new)
+
+        for file in files:
+            entry = ChunkedFile(file.relative_to(base).as_posix(), file.stat().st_size, [])
+            manifest.files.append(entry)
+            with open(file, "rb") as f:
+                for data in split(f, params):
+                    pending.append((entry.chunks, len(entry.chunks), pool.submit(_store_chunk, out_dir, data)))
+                    entry.chunks.append("")
+                    if len(pending) > 2 * workers:
+                        added += settle_one()
+        while pending:
+            added += settle_one()
+
+    manifest.save(out_dir / f"{name}{MANIFEST_SUFFIX}")
+    total = sum(f.size for f in manifest.files)
+    log_callback(f"{name}: {len(manifest.files)} file(s), {total / 1024 ** 2:.1f} MB in "
+                 f"{len(manifest.chunks)} chunk(s) ({manifest.compressed_size / 1024 ** 2:.1f} MB "
+                 f"compressed), {added} new")
+    return manifest
+
+
+def _store_chunk(out_dir: Path, data: bytes) -> tuple[str, int, int, bool]:
+    digest = hashlib.sha256(data).hexdigest()
+    target = chunk_path(out_dir, digest)
+    if target.exists():
+        return digest, len(data), target.stat().st_size, False
+    packed = zlib.compress(data, _LEVEL)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+    tmp.write_bytes(packed)
+    os.replace(tmp, target)
+    return digest, len(data), len(packed), True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish an asset in the chunked format")
+    parser.add_argument("payload",  help="Folder, archive or file to publish")
+    parser.add_argument("out",      help="Folder served over HTTP (chunks/ and manifests)")
+    parser.add_argument("--name",   help="Manifest name (default: the payload's name)")
+    parser.add_argument("--avg-kb", type=int, default=1024, help="Average chunk size in KB")
+    args = parser.parse_args()
+
+    payload = Path(args.payload).resolve()
+    out_dir = Path(args.out).resolve()
+    name    = args.name or payload.name.split(".")[0]
+    avg     = args.avg_kb * 1024
+    params  = ChunkParams(min_size=avg // 4, avg_size=avg, max_size=avg * 4)
+
+    if payload.is_file() and is_archive(payload):
+        with tempfile.TemporaryDirectory() as tmp:
+            if extract(payload, Path(tmp), print) is None:
+                sys.exit(1)
+            publish(Path(tmp), out_dir, name, params, print)
+    else:
+        publish(payload, out_dir, name, params, print)
+
+
+if __name__ == "__main__":
+    main()
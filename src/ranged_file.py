@@ -0,0 +1,126 @@
+import http.client
+from bisect import bisect_right
+from typing import BinaryIO, Callable
+
+# fetch(start, end) → a readable stream of the remote file's bytes start..end-1
+RangeFetcher = Callable[[int, int], BinaryIO]
+
+_SKIP_CHUNK = 64 * 1024
+
+
+class RangedFile:
+    """
+    A remote file as a seekable, read-only binary file whose bytes are
+    fetched by range requests as they're read — enough for zipfile to
+    read an archive's central directory and then just the members it's
+    asked for, without the rest of the file being transferred.
+
+    The file's tail (where ZIP keeps its index) comes with the request
+    that opened it. A read anywhere else opens one request covering the
+    span planned for that offset (see plan()), else READ_AHEAD bytes,
+    and later reads carry on from that response as long as they move
+    forward inside it (bytes in between are read and dropped). A read
+    elsewhere drops it for a new request. `fetched` and `requests` count
+    what the reads cost. Not thread-safe.
+    """
+
+    TAIL       = 256 * 1024    # fetched on open: the end of a ZIP's index and, usually, all of it
+    READ_AHEAD = 256 * 1024
+
+    def __init__(self, name: str, size: int, fetch: RangeFetcher, tail: bytes = b""):
+        self.name     = name
+        self.size     = size
+        self.fetched  = len(tail)          # bytes transferred so far
+        self.requests = 1 if tail else 0
+        self._fetch   = fetch
+        self._tail    = tail
+        self._tail_at = size - len(tail)
+        self._pos     = 0
+        self._spans:  list[tuple[int, int]] = []
+        self._starts: list[int] = []
+        self._stream: BinaryIO | None = None
+        self._at      = 0                  # offset of the open response's next byte
+        self._end     = 0                  # offset it stops at
+
+    def plan(self, spans: list[tuple[int, int]]) -> None:
+        """Announce the (start, end) spans about to be read front to back, sorted and disjoint: one request each."""
+        self._spans  = spans
+        self._starts = [start for start, _ in spans]
+
+    # ── file interface ────────────────────────────────────────────────
+
+    def read(self, size: int | None = -1) -> bytes:
+        left = self.size - self._pos
+        if size is None or size < 0 or size > left:
+            size = max(0, left)
+        parts = []
+        while size > 0:
+            data = self._read_some(size)
+            parts.append(data)
+            size      -= len(data)
+            self._pos += len(data)
+        return b"".join(parts)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self._pos, self.size)[whence]
+        if base + offset < 0:
+            raise ValueError(f"negative seek position {base + offset}")
+        self._pos = base + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._drop()
+
+    def __enter__(self) -> "RangedFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _read_some(self, size: int) -> bytes:
+        pos = self._pos
+        if pos >= self._tail_at:
+            start = pos - self._tail_at
+            return self._tail[start:start + size]
+
+        if self._stream is None or not self._at <= pos < self._end:
+            self._open(pos, size)
+        while self._at < pos:                           # a gap between planned members
+            self._take(min(pos - self._at, _SKIP_CHUNK))
+        return self._take(min(size, self._end - pos))
+
+    def _open(self, pos: int, size: int) -> None:
+        self._drop()
+        end = pos + max(size, self.READ_AHEAD)
+        i   = bisect_right(self._starts, pos) - 1
+        if i >= 0 and pos < self._spans[i][1]:
+            end = self._spans[i][1]
+        end = min(end, self._tail_at)
+        self._stream   = self._fetch(pos, end)
+        self._at       = pos
+        self._end      = end
+        self.requests += 1
+
+    def _take(self, size: int) -> bytes:
+        data = self._stream.read(size)
+        if not data:
+            raise http.client.IncompleteRead(b"", self._end - self._at)
+        self._at     += len(data)
+        self.fetched += len(data)
+        return data
+
+    def _drop(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
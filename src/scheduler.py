@@ -0,0 +1,137 @@
+import heapq
+import math
+
+from config import AssetEntry
+
+
+class Schedule:
+    """
+    Order in which SyncRunner works through one run's entries.
+
+    An entry waits for
+      - the entries named in its `depends_on` (those that are part of this
+        run — the others are assumed to be installed already, and listed
+        by outside() so the caller can say so), and
+      - earlier entries whose `location` is the same folder as its own or
+        contains it / lies inside it. Their files can overlap, so they are
+        applied one after another in config order (dependencies first),
+        exactly as a plain sequential run would; later entries still win.
+
+    Among the entries whose predecessors have all finished, the next one is
+    the one with the highest `priority`, then the smallest published
+    `size`, then config order. An entry inherits the priority of anything
+    waiting on it, so a low-priority dependency never holds back an urgent
+    asset, while large low-priority assets go last instead of ahead of
+    small ones.
+
+    Raises ValueError if the dependencies form a cycle.
+    """
+
+    def __init__(self, entries: list[AssetEntry]):
+        count = len(entries)
+        index = {entry.name: i for i, entry in enumerate(entries)}
+
+        self._requires = [[index[d] for d in entry.depends_on if d in index] for entry in entries]
+        self._outside  = {i: missing for i, entry in enumerate(entries)
+                          if (missing := [d for d in entry.depends_on if d not in index])}
+
+        # config order with dependencies moved ahead of their dependents
+        order = _topological(count, self._requires) if any(self._requires) else range(count)
+        if len(order) != count:
+            placed = set(order)
+            raise ValueError("dependency cycle among: "
+                             + ", ".join(e.name for i, e in enumerate(entries) if i not in placed))
+        rank = [0] * count
+        for position, i in enumerate(order):
+            rank[i] = position
+
+        # overlapping locations apply in that order too
+        # (a pair can appear twice, as a dependency and an overlap; the counts below stay consistent)
+        self._after = [list(deps) for deps in self._requires]
+        for first, then in _overlaps(entries, rank):
+            self._after[then].append(first)
+
+        # every edge points forward in `rank`, so walking it backwards sees dependents first
+        priority = [entry.priority for entry in entries]
+        for i in sorted(range(count), key=rank.__getitem__, reverse=True):
+            for j in self._after[i]:
+                priority[j] = max(priority[j], priority[i])
+
+        self._key = [(-priority[i],
+                      entries[i].size if entries[i].size is not None else math.inf,
+                      i) for i in range(count)]
+        self._waiting    = [len(after) for after in self._after]
+        self._dependents = [[] for _ in range(count)]
+        for i, after in enumerate(self._after):
+            for j in after:
+                self._dependents[j].append(i)
+        self._ready = [self._key[i] for i in range(count) if not self._waiting[i]]
+        heapq.heapify(self._ready)
+
+    def next_ready(self) -> int | None:
+        """Index of the most urgent entry free to start, or None if all of them are waiting."""
+        return heapq.heappop(self._ready)[2] if self._ready else None
+
+    def done(self, index: int) -> None:
+        """Entry `index` finished (whatever the outcome); release what waited on it."""
+        for i in self._dependents[index]:
+            self._waiting[i] -= 1
+            if not self._waiting[i]:
+                heapq.heappush(self._ready, self._key[i])
+
+    def requires(self, index: int) -> list[int]:
+        """Indices of the entries `index` explicitly depends on in this run."""
+        return self._requires[index]
+
+    def outside(self) -> dict[int, list[str]]:
+        """Entry index → the names in its `depends_on` that aren't part of this run."""
+        return self._outside
+
+    def waits(self, index: int) -> bool:
+        """Whether the entry has to wait for any other entry of this run."""
+        return bool(self._after[index])
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+def _topological(count: int, requires: list[list[int]]) -> list[int]:
+    """Kahn's algorithm, taking free nodes in index order; nodes on a cycle are left out."""
+    waiting    = [len(set(deps)) for deps in requires]
+    dependents = [[] for _ in range(count)]
+    for i, deps in enumerate(requires):
+        for j in set(deps):
+            dependents[j].append(i)
+
+    free  = [i for i in range(count) if not waiting[i]]
+    heapq.heapify(free)
+    order = []
+    while free:
+        i = heapq.heappop(free)
+        order.append(i)
+        for j in dependents[i]:
+            waiting[j] -= 1
+            if not waiting[j]:
+                heapq.heappush(free, j)
+    return order
+
+
+def _overlaps(entries: list[AssetEntry], rank: list[int]):
+    """Yield (earlier, later) index pairs, by `rank`, whose locations are equal or nested."""
+    by_location: dict[tuple[str, ...], list[int]] = {}
+    for i in sorted(range(len(entries)), key=rank.__getitem__):     # already sorted unless dependencies reordered
+        by_location.setdefault(_location_key(entries[i].location), []).append(i)
+
+    for location, same in by_location.items():
+        yield from zip(same, same[1:])                  # equal: a chain orders them all
+        for depth in range(len(location)):              # every folder above this one
+            for outer in by_location.get(location[:depth], ()):
+                for inner in same:
+                    yield (outer, inner) if rank[outer] < rank[inner] else (inner, outer)
+
+
+def _location_key(location: str) -> tuple[str, ...]:
+    # case-folded: on Windows "Content/Maps" and "content/maps" are the same folder
+    parts = location.replace("\\", "/").casefold().split("/")
+    if "" in parts or "." in parts:
+        parts = [part for part in parts if part not in ("", ".")]
+    return tuple(parts)
@@ -0,0 +1,115 @@
+from pathlib import Path
+
+from base_extractor import BaseExtractor, ExtractResult, MemberFilter, Meter, crc_unchanged, member_target
+
+
+class SevenZipExtractor(BaseExtractor):
+    """
+    7z in-process via py7zr (optional: `pip install py7zr`), LZMA/LZMA2
+    and the other coders py7zr supports.
+
+    Members are decompressed straight into their files through a py7zr
+    writer factory, so progress follows the decompressed bytes. Delta
+    mode compares size + CRC32 from the archive header; only the members
+    that differ and that the entry selects are decompressed at all.
+    Symbolic links are skipped.
+    """
+
+    formats = ("7z",)
+
+    @property
+    def name(self) -> str:
+        return "py7zr"
+
+    def unavailable(self) -> str | None:
+        try:
+            import py7zr
+        except ImportError:
+            return "py7zr isn't installed (pip install py7zr)"
+        try:
+            from py7zr.io import WriterFactory   # noqa: F401 — with extract(factory=), new in py7zr 1.0
+        except ImportError:
+            return f"py7zr {py7zr.__version__} is too old, 1.0 or newer is needed (pip install -U py7zr)"
+        return None
+
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: MemberFilter | None = None,
+                meter: Meter, current: Path) -> ExtractResult:
+        import py7zr
+
+        log_callback(f"  [Extract] Un-7zipping {archive.name}")
+        result = ExtractResult()
+        wanted = []
+        links  = 0
+        with py7zr.SevenZipFile(archive, "r") as sz:
+            if sz.needs_password():
+                raise RuntimeError(f"{archive.name} is password-protected")
+
+            for member in sz.files:
+                if member.is_directory:
+                    continue
+                if member.is_symlink:
+                    links += 1
+                    continue
+                target = member_target(dest, member.filename)
+                if target is None:
+                    continue
+                if select is not None and not select(member.filename):
+                    result.excluded += 1
+                    continue
+                rel, size = target.relative_to(dest).as_posix(), member.uncompressed
+                result.files.append(rel)
+                unchanged = (delta and member.crc32 is not None
+                             and crc_unchanged(current / rel, size, member.crc32))
+                result.count(size, skipped=unchanged)
+                if unchanged:
+                    meter.add(size)
+                else:
+                    wanted.append(member.filename)
+
+            meter.total = result.bytes_written + result.bytes_skipped
+            if wanted:
+                root = dest.resolve()
+                sz.extract(path=root, targets=wanted, factory=_writer_factory(root, meter))
+
+        if links:
+            log_callback(f"  [Extract] Skipped {links} symbolic link(s)")
+        return result
+
+
+def _writer_factory(dest: Path, meter: Meter):
+    """A py7zr WriterFactory writing each member to its file under dest, feeding `meter`."""
+    from py7zr.io import Py7zIO, WriterFactory
+
+    class _File(Py7zIO):
+        def __init__(self, path: Path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "wb")
+
+        def write(self, s) -> int:
+            n = self._file.write(s)
+            meter.add(n)
+            return n
+
+        def read(self, size=None) -> bytes:
+            return b""
+
+        def seek(self, offset: int, whence: int = 0) -> int:
+            return self._file.seek(offset, whence)
+
+        def flush(self) -> None:
+            self._file.flush()
+
+        def size(self) -> int:
+            return self._file.tell()
+
+        def close(self) -> None:
+            self._file.close()
+
+    class _Factory(WriterFactory):
+        def create(self, filename: str) -> Py7zIO:
+            # py7zr hands over its sanitised absolute output path; map it the same way as other formats
+            target = member_target(dest, Path(filename).relative_to(dest).as_posix())
+            return _File(target)
+
+    return _Factory()
@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Work folders live under the project root, so they share its filesystem
+# and every step of a commit is a rename.
+STAGING_DIR = ".assetpull-staging"
+
+_NEW     = "new"             # files to install, laid out as under dest_dir
+_OLD     = "old"             # files of dest_dir they replace, moved aside during the commit
+_JOURNAL = "journal.json"    # dest_dir, the files being committed and the folders it creates,
+                             # written before the first rename
+_DONE    = "committed"       # marker: all new files are in place, old/ can go
+
+
+class StagedInstall:
+    """
+    One entry's install, unpacked into a staging folder first and then
+    moved into dest_dir file by file with renames — nothing is copied
+    twice, and dest_dir only changes during the short commit.
+
+    During the commit, each file about to be replaced is renamed aside into
+    old/ before the new one is renamed in. If any rename fails, everything
+    already moved is moved back and dest_dir is left exactly as it was.
+    Files the install doesn't touch, including other assets' files in the
+    same folder, stay where they are. If the process dies mid-commit, the
+    journal lets recover() undo it on the next run.
+    """
+
+    def __init__(self, work_dir: Path, dest_dir: Path, log_callback):
+        self._work = work_dir
+        self._dest = dest_dir
+        recover(work_dir, log_callback)      # leftovers of an earlier attempt for this entry
+        self.path.mkdir(parents=True)
+
+    @property
+    def path(self) -> Path:
+        """Where to put the files; they're installed at the same relative paths under dest_dir."""
+        return self._work / _NEW
+
+    def commit(self, log_callback) -> int:
+        """Move the staged files into dest_dir and return how many; on failure roll back and re-raise."""
+        dirs, files = _walk(self.path)
+        new_dirs = [rel for rel in dirs if not (self._dest / rel).exists()]
+        with open(self._work / _JOURNAL, "w", encoding="utf-8") as f:
+            json.dump({"dest": str(self._dest), "files": files, "dirs": new_dirs}, f)
+
+        old = self._work / _OLD
+        made: set[Path] = set()
+        try:
+            for rel in new_dirs:
+                (self._dest / rel).mkdir(parents=True, exist_ok=True)
+            for rel in files:
+                target = self._dest / rel
+                if target.is_dir() and not target.is_symlink():
+                    raise IsADirectoryError(f"'{rel}' is a folder in {self._dest}, the archive has a file there")
+                if os.path.lexists(target):
+                    _make_parent(old / rel, made)
+                    os.replace(target, old / rel)
+                else:
+                    _make_parent(target, made)
+                os.replace(self.path / rel, target)
+        except OSError:
+            _roll_back(self._work, self._dest, files, new_dirs)
+            shutil.rmtree(self._work, ignore_errors=True)
+            log_callback(f"  [Install] Rolled back — {self._dest} left as it was")
+            raise
+
+        (self._work / _DONE).touch()
+        shutil.rmtree(self._work, ignore_errors=True)
+        log_callback(f"  [Install] {len(files)} file(s) moved into place")
+        return len(files)
+
+    def discard(self) -> None:
+        """Drop the staged files without touching dest_dir (unless a commit began — recover() owns those)."""
+        if not (self._work / _JOURNAL).exists():
+            shutil.rmtree(self._work, ignore_errors=True)
+
+
+def recover(work_dir: Path, log_callback) -> None:
+    """
+    Undo a commit an earlier run didn't finish (or finish one that only
+    missed its cleanup), then remove the work folder.
+    """
+    journal = work_dir / _JOURNAL
+    if journal.exists() and not (work_dir / _DONE).exists():
+        with open(journal, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _roll_back(work_dir, Path(data["dest"]), data["files"], data.get("dirs", []))
+        log_callback(f"  [Install] Rolled back an interrupted install into {data['dest']}")
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def recover_all(staging_root: Path, log_callback) -> None:
+    """recover() every work folder under staging_root."""
+    if not staging_root.is_dir():
+        return
+    for work_dir in staging_root.iterdir():
+        if work_dir.is_dir():
+            recover(work_dir, log_callback)
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+def _roll_back(work_dir: Path, dest_dir: Path, files: list[str], new_dirs: list[str]) -> None:
+    """
+    Put dest_dir back as it was from whatever state the commit reached.
+    Works from what's on disk, so it's the same for a failed rename and a
+    killed process: a file in old/ goes back; a file that left new/ with
+    nothing in old/ was added by the commit and is removed, and so are the
+    folders the commit created once they're empty again.
+    """
+    old, new = work_dir / _OLD, work_dir / _NEW
+    for rel in reversed(files):
+        target = dest_dir / rel
+        if os.path.lexists(old / rel):
+            os.replace(old / rel, target)
+        elif not os.path.lexists(new / rel) and os.path.lexists(target):
+            os.remove(target)
+    for rel in reversed(new_dirs):          # walk order: children come after their parents
+        try:
+            (dest_dir / rel).rmdir()
+        except OSError:
+            pass                            # not created after all, or something else was put there
+
+
+def _walk(root: Path) -> tuple[list[str], list[str]]:
+    """Relative (dirs, files) under root; symlinks count as files and aren't followed."""
+    dirs, files = [], []
+    for here, subdirs, names in os.walk(root):
+        base = Path(here).relative_to(root)
+        for name in list(subdirs):
+            if os.path.islink(os.path.join(here, name)):
+                subdirs.remove(name)
+                files.append((base / name).as_posix())
+            else:
+                dirs.append((base / name).as_posix())
+        files.extend((base / name).as_posix() for name in names)
+    return dirs, files
+
+
+def _make_parent(path: Path, made: set[Path]) -> None:
+    parent = path.parent
+    if parent not in made:
+        parent.mkdir(parents=True, exist_ok=True)
+        made.add(parent)
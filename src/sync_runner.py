@@ -1,85 +1,822 @@
+import asyncio
+import queue
 import shutil
+import threading
+import time
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable
 
+from base_provider import BaseProvider
+from chunk_store import ChunkStore, FetchStats, Manifest
 from config import AssetEntry
-from extractor import extract
+from download_cache import DownloadCache
+from extractor import (ExtractResult, MemberFilter, can_read_ranged, can_stream, extract,
+                       extract_ranged, extract_stream, is_archive)
+from install_strategy import move_file
+from integrity import IntegrityError, StreamHash, expects, verify
+from peer_provider import PeerProvider
+from progress import ProgressEvent, ProgressThrottle
+from scheduler import Schedule
+from staging import STAGING_DIR, StagedInstall, recover_all
+from sync_state import SyncState
+from telemetry import Telemetry
 import provider_registry
 
 
+@dataclass
+class SyncSummary:
+    """Outcome of a single SyncRunner.run() call."""
+    succeeded:  list[str] = field(default_factory=list)
+    up_to_date: list[str] = field(default_factory=list)
+    failed:     list[str] = field(default_factory=list)
+
+
+# per-entry outcomes
+_SYNCED     = "synced"
+_UP_TO_DATE = "up to date"
+_FAILED     = "failed"
+
+# pipelined-mode stages
+_DOWNLOAD = "download"
+_INSTALL  = "install"
+
+
+@dataclass
+class _Fetched:
+    """Result of the download stage."""
+    validator:  dict | None
+    file:       Path | None = None             # downloaded artifact, still to be installed
+    extracted:  ExtractResult | None = None    # streaming already unpacked it into `staged`
+    staged:     StagedInstall | None = None
+    up_to_date: bool = False                   # nothing to do for this entry
+    sha256:     str | None = None              # verified hash of `file`, if the entry publishes one
+    manifest:   Manifest | None = None         # chunked entry: `file` parsed, its chunks in the store
+
+
 class SyncRunner:
     """
-    Processes a list of AssetEntry sequentially:
+    Processes a list of AssetEntry:
         1. Resolve provider for each entry
         2. Download into a temp dir
         3. If the result is an archive → extract into the target location
            Otherwise → move the file directly
         4. Clean up temp dir for that entry
 
-    All progress is reported via log_callback(str).
+    Entries are taken in the order of a Schedule: an entry starts only once
+    the entries it depends on and earlier entries with overlapping
+    locations have finished, and among the free ones higher `priority` and
+    smaller assets go first. An entry whose dependency failed fails too.
+
+    By default entries are processed one after another. Passing `jobs`
+    switches to a pipelined mode: downloads run on a pool of `jobs` workers
+    and finished downloads are handed to a separate pool of `extract_jobs`
+    workers, so asset N+1 downloads while asset N is being unpacked.
+
+    With a SyncState, each entry's provider is probed first and entries
+    whose remote version and installed files are unchanged are skipped
+    (unless `force` is set — then everything is re-synced and re-recorded).
+
+    With `stream`, tar archives from providers that support it are unpacked
+    straight from the response body instead of going through a temp file.
+    Anything else — or a stream that fails midway — uses the temp-file path.
+
+    With a DownloadCache, artifacts are looked up in the shared cache
+    (by URL + remote validator) before any provider download, and every
+    fresh download is added to it.
+
+    With `delta`, archive members that are already identical on disk are
+    not rewritten (see extractor.extract).
+
+    Installs are staged: each entry is unpacked into a work folder under
+    <root>/.assetpull-staging and then moved into its location with renames
+    (see staging.StagedInstall). A failed or interrupted install leaves the
+    previous files in place — an interrupted one is rolled back when the
+    next run starts — so the previous sync state stays valid.
+
+    Entries that publish a `sha256` / `size` are verified before anything
+    is installed — from the hash providers compute while writing, or one
+    read of the file when they can't — and a mismatch fails the entry.
+    Such entries are never streamed, are looked up in the cache by hash,
+    and count as up to date when the installed files came from that same
+    hash, without probing the remote.
+
+    Passing `async_jobs` instead runs up to that many downloads at once on
+    a single asyncio event loop (provider.download_async), handing finished
+    ones to `extract_jobs` extraction threads as in pipelined mode. This
+    suits hundreds of small assets: HTTP downloads share keep-alive
+    connections, and sync-only providers run on worker threads.
+
+    With `batch`, entries whose provider can batch them (Mega file links)
+    and that don't wait on other entries of the run are all downloaded up
+    front in one provider call per provider type, before the regular pass;
+    entries the batch couldn't deliver are downloaded on their own in the
+    regular pass.
+
+    Entries marked `chunked` download a manifest instead of the payload,
+    then only the chunks of it missing from `chunk_store` (by default a
+    ChunkStore folder next to temp_dir), and their files are assembled
+    from the store. Each such entry logs the bytes this saved compared
+    with a full download; chunks no installed version needs any more are
+    pruned at the end of the run.
+
+    Entries with `include` / `exclude` patterns install only the archive
+    members (or chunked files) those select. A ZIP from a provider that
+    serves byte ranges isn't downloaded whole: its central directory and
+    then the selected members are read by range and unpacked straight
+    into staging. Entries to verify download the whole file as usual.
+
+    Every entry's phases (probe, check, download, verify, extract, commit,
+    ...) are timed with their byte, file and retry counts into a Telemetry,
+    `telemetry` if one is passed — see Telemetry.write() for the report.
+
+    Status lines are reported via log_callback(str). In pipelined mode the
+    lines of each entry are buffered and flushed as one block when that
+    entry finishes, so concurrent entries don't interleave. Byte progress
+    goes separately to progress_callback(ProgressEvent), throttled to a
+    few events per second per entry and phase; it may be called from any
+    worker thread.
     """
 
-    def __init__(self, root_dir: Path, temp_dir: Path, log_callback: Callable[[str], None]):
-        self._root     = root_dir
-        self._temp     = temp_dir
-        self._log      = log_callback
+    def __init__(
+        self,
+        root_dir: Path,
+        temp_dir: Path,
+        log_callback: Callable[[str], None],
+        jobs: int | None = None,
+        extract_jobs: int = 1,
+        state: SyncState | None = None,
+        force: bool = False,
+        stream: bool = False,
+        delta: bool = False,
+        cache: DownloadCache | None = None,
+        progress_callback: Callable[[ProgressEvent], None] | None = None,
+        batch: bool = False,
+        async_jobs: int | None = None,
+        telemetry: Telemetry | None = None,
+        chunk_store: ChunkStore | None = None,
+    ):
+        self._root         = root_dir
+        self._temp         = temp_dir
+        self._log          = log_callback
+        self._jobs         = jobs
+        self._extract_jobs = extract_jobs
+        self._state        = state
+        self._force        = force
+        self._stream       = stream
+        self._delta        = delta
+        self._cache        = cache
+        self._progress     = ProgressThrottle(progress_callback)
+        self._batch        = batch
+        self._async_jobs   = async_jobs
+        self._telemetry    = telemetry if telemetry is not None else Telemetry()
+        self._chunks       = chunk_store if chunk_store is not None else ChunkStore(temp_dir.with_name("ChunkStore"))
+        self._chunk_totals: FetchStats | None = None   # over this run's chunked entries, if any
+        self._chunk_lock   = threading.Lock()
+        self._prefetched: dict[str, _Fetched] = {}     # entry name → batch result
+        self._log_lock     = threading.Lock()
 
     # ── public ────────────────────────────────────────────────────────
 
-    def run(self, entries: list[AssetEntry]) -> None:
-        """Kick off sequential sync for the given entries."""
+    def run(self, entries: list[AssetEntry]) -> SyncSummary:
+        """Sync the given entries, sequentially or pipelined (see class doc)."""
+        summary = SyncSummary()
         if not entries:
             self._log("Nothing selected.")
-            return
+            return summary
 
+        plan = Schedule(entries)
+        for i, names in plan.outside().items():
+            self._log(f"Note: '{entries[i].name}' depends on {', '.join(map(repr, names))}, "
+                      f"not part of this run — assuming installed")
         self._temp.mkdir(parents=True, exist_ok=True)
+        recover_all(self._root / STAGING_DIR, self._log)
+
+        try:
+            if self._batch:
+                self._prefetch(entries, plan)
+            if self._async_jobs is not None:
+                results = asyncio.run(self._run_async(entries, plan))
+            elif self._jobs is None:
+                results = self._run_sequential(entries, plan)
+            else:
+                results = self._run_pipelined(entries, plan)
+        finally:
+            if self._state is not None:
+                self._state.save()
+
+        # keep the summary in config order, whatever order entries finished in
+        buckets = {_SYNCED: summary.succeeded, _UP_TO_DATE: summary.up_to_date, _FAILED: summary.failed}
+        for entry, outcome in zip(entries, results):
+            buckets[outcome].append(entry.name)
+            self._telemetry.finish(entry.name, entry.type, outcome)
+        self._telemetry.close()
+
+        self._prefetched.clear()
+        self._finish_chunks()
+        self._log_summary(summary)
+        return summary
+
+    # ── scheduling ────────────────────────────────────────────────────
+
+    def _prefetch(self, entries: list[AssetEntry], plan: Schedule) -> None:
+        """
+        Batch mode: download every batchable entry with one call per
+        provider type. Entries that wait on others in this run (see
+        Schedule) are left to the regular pass, which fetches them once
+        what they depend on is installed.
+        """
+        providers: dict[str, BaseProvider] = {}
+        groups:    dict[str, list[AssetEntry]] = {}
+        for i, entry in enumerate(entries):
+            if plan.waits(i) or entry.chunked:
+                continue
+            try:
+                provider = provider_registry.provider_for(entry)
+            except (KeyError, TypeError, AttributeError):
+                continue                # a malformed `sources` item: the regular pass reports it
+            if provider is not None and provider.can_batch(entry.url):
+                providers.setdefault(entry.type, provider)
+                groups.setdefault(entry.type, []).append(entry)
+
+        for type_name, group in groups.items():
+            provider = providers[type_name]
+            if len(group) < 2:
+                continue
+            self._log(f"\n── {provider.name} batch: {len(group)} asset(s) ──")
 
-        for entry in entries:
+            pending: list[tuple[AssetEntry, dict | None]] = []
+            for entry in group:
+                try:
+                    validator = self._probe(entry, provider, self._log)
+                    digest    = StreamHash() if expects(entry) else None
+                    fetched   = self._reuse_stage(entry, provider, validator, self._log, digest)
+                    if fetched is not None:
+                        fetched = self._verify_stage(entry, fetched, digest, self._log)
+                except Exception:
+                    continue            # the regular pass retries it and reports the error
+                if fetched is not None:
+                    self._prefetched[entry.name] = fetched
+                else:
+                    pending.append((entry, validator))
+            if not pending:
+                continue
+
+            began = time.perf_counter()
+            with ExitStack() as phases:
+                reports = [phases.enter_context(self._progress.phase(entry.name, "download"))
+                           for entry, _ in pending]
+                try:
+                    files = provider.download_batch([entry.url for entry, _ in pending],
+                                                    [self._temp / entry.name for entry, _ in pending],
+                                                    self._log, reports)
+                except Exception as e:
+                    self._log(f"  ERROR: {e}")
+                    continue
+            share = (time.perf_counter() - began) / len(pending)   # one run fetched them all
+
+            for (entry, validator), file in zip(pending, files):
+                if file is None:
+                    continue
+                self._telemetry.add(entry.name, "download", share, bytes_in=file.stat().st_size)
+                fetched = self._verify_stage(entry, _Fetched(validator, file=file), None, self._log)
+                if fetched is None:
+                    continue
+                self._store(entry, validator, fetched, self._log)
+                self._prefetched[entry.name] = fetched
+            self._log(f"  Batch fetched {sum(f is not None for f in files)}/{len(pending)} asset(s)")
+
+    def _run_sequential(self, entries: list[AssetEntry], plan: Schedule) -> list[str]:
+        results = [_FAILED] * len(entries)
+        while (i := plan.next_ready()) is not None:
+            entry = entries[i]
             self._log(f"\n── {entry.name} ──")
-            success = self._process_entry(entry)
-            if not success:
+            if self._requirements_met(entries, plan, i, results, self._log):
+                results[i] = self._process_entry(entry, self._log)
+            if results[i] == _FAILED:
                 self._log(f"  ⚠ Skipped: {entry.name}")
+            plan.done(i)
+        return results
+
+    def _run_pipelined(self, entries: list[AssetEntry], plan: Schedule) -> list[str]:
+        jobs         = max(1, self._jobs)
+        extract_jobs = max(1, self._extract_jobs)
+        self._log(f"Pipelined sync: {jobs} download / {extract_jobs} extract worker(s)")
+
+        results = [_FAILED] * len(entries)
+        buffers = [_EntryLog() for _ in entries]
+        events: queue.SimpleQueue = queue.SimpleQueue()    # (stage, index, future) as stages end
+        downloading = 0
+        in_flight   = 0
+
+        with ThreadPoolExecutor(jobs, thread_name_prefix="download") as download_pool, \
+             ThreadPoolExecutor(extract_jobs, thread_name_prefix="extract") as extract_pool:
+
+            def start_ready() -> None:
+                # hand out download slots only as they free up, so an urgent entry
+                # released late doesn't queue behind everything submitted earlier
+                nonlocal downloading, in_flight
+                while downloading < jobs and (i := plan.next_ready()) is not None:
+                    if not self._requirements_met(entries, plan, i, results, buffers[i]):
+                        self._flush_entry(entries[i], buffers[i], _FAILED)
+                        plan.done(i)
+                        continue
+                    future = download_pool.submit(self._guarded, self._download_stage, entries[i], buffers[i])
+                    future.add_done_callback(lambda f, i=i: events.put((_DOWNLOAD, i, f)))
+                    downloading += 1
+                    in_flight   += 1
+
+            start_ready()
+            while in_flight:
+                stage, i, future = events.get()
+                if stage == _DOWNLOAD:
+                    downloading -= 1
+                    fetched = future.result()
+                    if fetched is not None and not fetched.up_to_date:
+                        install = extract_pool.submit(self._install_and_flush, i, entries[i],
+                                                      fetched, buffers[i], results)
+                        install.add_done_callback(lambda f, i=i: events.put((_INSTALL, i, f)))
+                        start_ready()
+                        continue
+                    results[i] = _FAILED if fetched is None else self._up_to_date(entries[i], buffers[i])
+                    self._flush_entry(entries[i], buffers[i], results[i])
+                else:
+                    future.result()
+                in_flight -= 1
+                plan.done(i)
+                start_ready()
+
+        return results
+
+    async def _run_async(self, entries: list[AssetEntry], plan: Schedule) -> list[str]:
+        concurrency  = max(1, self._async_jobs)
+        extract_jobs = max(1, self._extract_jobs)
+        self._log(f"Async sync: {concurrency} concurrent download(s) / {extract_jobs} extract worker(s)")
+
+        results = [_FAILED] * len(entries)
+        buffers = [_EntryLog() for _ in entries]
+        loop    = asyncio.get_running_loop()
+        running: set[asyncio.Task] = set()
+        downloading = 0
+
+        with ThreadPoolExecutor(extract_jobs, thread_name_prefix="extract") as extract_pool:
+
+            def start_ready() -> None:
+                nonlocal downloading
+                while downloading < concurrency and (i := plan.next_ready()) is not None:
+                    if not self._requirements_met(entries, plan, i, results, buffers[i]):
+                        self._flush_entry(entries[i], buffers[i], _FAILED)
+                        plan.done(i)
+                        continue
+                    downloading += 1
+                    running.add(asyncio.create_task(one(i, entries[i])))
+
+            async def one(i: int, entry: AssetEntry) -> None:
+                nonlocal downloading
+                try:
+                    fetched = await self._guarded_async(self._download_stage_async, entry, buffers[i])
+                finally:
+                    downloading -= 1
+                    start_ready()
+                if fetched is None or fetched.up_to_date:
+                    results[i] = _FAILED if fetched is None else self._up_to_date(entry, buffers[i])
+                    self._flush_entry(entry, buffers[i], results[i])
+                else:
+                    await loop.run_in_executor(extract_pool, self._install_and_flush,
+                                               i, entry, fetched, buffers[i], results)
+                plan.done(i)
+                start_ready()
+
+            try:
+                start_ready()
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    running.difference_update(done)
+                    for task in done:
+                        task.result()
+            finally:
+                await provider_registry.close_async()
+
+        return results
+
+    @staticmethod
+    def _requirements_met(entries: list[AssetEntry], plan: Schedule, index: int,
+                          results: list[str], log: Callable[[str], None]) -> bool:
+        """False (and logged) if an entry this one depends on failed in this run."""
+        for j in plan.requires(index):
+            if results[j] == _FAILED:
+                log(f"  ERROR: Depends on '{entries[j].name}', which failed")
+                return False
+        return True
+
+    def _install_and_flush(self, index: int, entry: AssetEntry, fetched: _Fetched,
+                           buffer: "_EntryLog", results: list[str]) -> None:
+        ok = self._guarded(self._install_stage, entry, fetched, buffer)
+        results[index] = _SYNCED if ok else _FAILED
+        self._flush_entry(entry, buffer, results[index])
+
+    @staticmethod
+    def _guarded(stage, entry: AssetEntry, *args):
+        """Run a stage, turning unexpected exceptions into a logged failure."""
+        log = args[-1]
+        try:
+            return stage(entry, *args)
+        except Exception as e:
+            log(f"  ERROR: {e}")
+            return None
+
+    @staticmethod
+    async def _guarded_async(stage, entry: AssetEntry, *args):
+        """_guarded for coroutine stages."""
+        log = args[-1]
+        try:
+            return await stage(entry, *args)
+        except Exception as e:
+            log(f"  ERROR: {e}")
+            return None
+
+    def _flush_entry(self, entry: AssetEntry, buffer: "_EntryLog", outcome: str) -> None:
+        """Write one finished entry's buffered lines as a single block."""
+        if outcome == _FAILED:
+            buffer(f"  ⚠ Skipped: {entry.name}")
+        with self._log_lock:
+            self._log(f"\n── {entry.name} ──")
+            for line in buffer.lines:
+                self._log(line)
 
-        self._log("\nFinished.")
+    def _finish_chunks(self) -> None:
+        """Report what chunked entries saved over full downloads, and prune the chunk store."""
+        totals = self._chunk_totals
+        if totals is None:
+            return
+        self._chunk_totals = None
+        self._log(f"\nChunked assets: {_mb(totals.bytes_in)} downloaded instead of "
+                  f"{_mb(totals.bytes_full)} ({_mb(totals.bytes_saved)} saved)")
+        self._chunks.prune(self._log)
+
+    def _log_summary(self, summary: SyncSummary) -> None:
+        self._log(f"\nFinished: {len(summary.succeeded)} synced, "
+                  f"{len(summary.up_to_date)} up to date, {len(summary.failed)} failed.")
+        for name in summary.succeeded:
+            self._log(f"  ✓ {name}")
+        for name in summary.up_to_date:
+            self._log(f"  = {name}")
+        for name in summary.failed:
+            self._log(f"  ✗ {name}")
 
     # ── internals ─────────────────────────────────────────────────────
 
-    def _process_entry(self, entry: AssetEntry) -> bool:
+    def _process_entry(self, entry: AssetEntry, log: Callable[[str], None]) -> str:
+        fetched = self._guarded(self._download_stage, entry, log)
+        if fetched is None:
+            return _FAILED
+        if fetched.up_to_date:
+            return self._up_to_date(entry, log)
+        return _SYNCED if self._guarded(self._install_stage, entry, fetched, log) else _FAILED
+
+    @staticmethod
+    def _provider(entry: AssetEntry, log: Callable[[str], None]) -> BaseProvider | None:
+        """`entry`'s provider, or None after logging why it has none."""
+        try:
+            provider = provider_registry.provider_for(entry)
+            if provider is None:
+                log(f"  ERROR: Unknown provider type '{provider_registry.unknown_types(entry)[0]}'")
+        except (KeyError, TypeError, AttributeError):
+            log(f"  ERROR: Malformed sources for {entry.name} (each needs a \"url\")")
+            return None
+        return provider
+
+    @staticmethod
+    def _up_to_date(entry: AssetEntry, log: Callable[[str], None]) -> str:
+        log(f"  = Up to date: {entry.name}")
+        return _UP_TO_DATE
+
+    def _download_stage(self, entry: AssetEntry, log: Callable[[str], None]) -> _Fetched | None:
+        # batch mode may have settled this entry already
+        prefetched = self._prefetched.pop(entry.name, None)
+        if prefetched is not None:
+            return prefetched
+
         # 1. resolve provider
-        provider = provider_registry.get_provider(entry.type)
+        provider = self._provider(entry, log)
         if provider is None:
-            self._log(f"  ERROR: Unknown provider type '{entry.type}'")
-            return False
+            return None
 
-        # 2. download into a per-entry temp folder
+        validator = self._probe(entry, provider, log)
+        digest    = StreamHash() if expects(entry) else None
+        fetched   = self._reuse_stage(entry, provider, validator, log, digest)
+        if fetched is not None:
+            return self._chunk_stage(entry, provider, self._verify_stage(entry, fetched, digest, log), log)
         entry_temp = self._temp / entry.name
-        if entry_temp.exists():
-            shutil.rmtree(entry_temp)
-        entry_temp.mkdir(parents=True)
 
-        downloaded_file = provider.download(entry.url, entry_temp, self._log)
+        # 3b. some members of a ZIP over a provider serving byte ranges → fetch just those
+        #     (not for entries to verify: checking takes the whole file)
+        if digest is None and _member_filter(entry) is not None:
+            ranged = self._ranged_extract(entry, provider, validator, log)
+            if ranged is not None:
+                return ranged
+
+        # 3c. tar over a streaming-capable provider → unpack while downloading
+        #     (not for entries to verify: nothing may be unpacked before the check)
+        if self._stream and digest is None:
+            streamed = self._stream_extract(entry, provider, validator, log)
+            if streamed is not None:
+                return streamed
+
+        # 3d. download into the per-entry temp folder
+        with self._telemetry.phase(entry.name, "download") as span, \
+             self._progress.phase(entry.name, "download") as report:
+            downloaded_file = provider.download(entry.url, entry_temp, log, entry, report, digest)
+            span.bytes_in = _size(downloaded_file)
         if downloaded_file is None:
-            self._cleanup(entry_temp)
-            return False
+            # keep the temp dir: a partial download there can be resumed next run
+            return None
+
+        # 3e. check it against the published size / hash before anything is installed
+        fetched = self._verify_stage(entry, _Fetched(validator, file=downloaded_file), digest, log)
+        if fetched is None:
+            return None
+
+        self._store(entry, validator, fetched, log)
+        return self._chunk_stage(entry, provider, fetched, log)
+
+    async def _download_stage_async(self, entry: AssetEntry,
+                                    log: Callable[[str], None]) -> _Fetched | None:
+        """_download_stage on the event loop; local disk work goes to worker threads."""
+        prefetched = self._prefetched.pop(entry.name, None)
+        if prefetched is not None:
+            return prefetched
+
+        provider = self._provider(entry, log)
+        if provider is None:
+            return None
+
+        validator = None
+        if self._needs_probe(entry):
+            with self._telemetry.phase(entry.name, "probe"):
+                validator = await provider.probe_async(entry.url, log)
+        digest    = StreamHash() if expects(entry) else None
+        fetched   = await asyncio.to_thread(self._reuse_stage, entry, provider, validator, log, digest)
+        if fetched is not None:
+            fetched = await asyncio.to_thread(self._verify_stage, entry, fetched, digest, log)
+            return await asyncio.to_thread(self._chunk_stage, entry, provider, fetched, log)
+
+        if digest is None and _member_filter(entry) is not None:
+            ranged = await asyncio.to_thread(self._ranged_extract, entry, provider, validator, log)
+            if ranged is not None:
+                return ranged
+
+        if self._stream and digest is None:
+            streamed = await asyncio.to_thread(self._stream_extract, entry, provider, validator, log)
+            if streamed is not None:
+                return streamed
+
+        with self._telemetry.phase(entry.name, "download") as span, \
+             self._progress.phase(entry.name, "download") as report:
+            downloaded_file = await provider.download_async(entry.url, self._temp / entry.name,
+                                                            log, entry, report, digest)
+            span.bytes_in = _size(downloaded_file)
+        if downloaded_file is None:
+            return None
+
+        fetched = await asyncio.to_thread(self._verify_stage, entry,
+                                          _Fetched(validator, file=downloaded_file), digest, log)
+        if fetched is None:
+            return None
+
+        if self._cache is not None:
+            await asyncio.to_thread(self._store, entry, validator, fetched, log)
+        return await asyncio.to_thread(self._chunk_stage, entry, provider, fetched, log)
+
+    def _probe(self, entry: AssetEntry, provider: BaseProvider, log: Callable[[str], None]) -> dict | None:
+        """The remote validator, if the run needs one."""
+        if not self._needs_probe(entry):
+            return None
+        with self._telemetry.phase(entry.name, "probe"):
+            return provider.probe(entry.url, log)
+
+    def _needs_probe(self, entry: AssetEntry) -> bool:
+        # a published sha256 identifies the content on its own
+        return (self._state is not None or self._cache is not None) and not entry.sha256
+
+    def _reuse_stage(self, entry: AssetEntry, provider: BaseProvider, validator: dict | None,
+                     log: Callable[[str], None], digest: StreamHash | None = None) -> _Fetched | None:
+        """
+        Everything before an actual download, given the probed validator:
+        settle the entry if it's up to date or its artifact is in the cache.
+        Returns None if it has to be downloaded.
+        """
+        # 2. skip entries whose remote version and installed files are unchanged
+        if self._state is not None and not self._force:
+            with self._telemetry.phase(entry.name, "check"):
+                if self._state.is_current(entry, validator, self._root / entry.location):
+                    return _Fetched(validator, up_to_date=True)
+
+        entry_temp = self._temp / entry.name
+        self._prepare_temp(entry_temp, provider)
 
-        # 3. extract or move
+        # 3a. the same version may already sit in the shared download cache
+        if self._cache is not None:
+            with self._telemetry.phase(entry.name, "cache lookup") as span:
+                cached = self._cache.lookup(entry.url, validator, entry_temp, log,
+                                            sha256=entry.sha256, digest=digest)
+                span.bytes_in = _size(cached)
+            if cached is not None:
+                return _Fetched(validator, file=cached)
+
+        return None
+
+    def _verify_stage(self, entry: AssetEntry, fetched: _Fetched, digest: StreamHash | None,
+                      log: Callable[[str], None]) -> _Fetched | None:
+        """Check a fetched artifact against the entry's published size / sha256; None on a mismatch."""
+        if fetched.file is None or not expects(entry):
+            return fetched
+        try:
+            with self._telemetry.phase(entry.name, "verify") as span:
+                if digest is None or not digest.covers(fetched.file):
+                    span.bytes_in = _size(fetched.file)         # read back to hash it
+                fetched.sha256 = verify(fetched.file, entry, digest, log)
+        except IntegrityError as e:
+            log(f"  ERROR: Integrity check failed — {e}")
+            # drop the bad bytes so the next run doesn't resume on top of them
+            self._cleanup(self._temp / entry.name)
+            return None
+        return fetched
+
+    def _chunk_stage(self, entry: AssetEntry, provider: BaseProvider, fetched: _Fetched | None,
+                     log: Callable[[str], None]) -> _Fetched | None:
+        """Chunked entries: bring the chunks their fetched manifest lists into the chunk store."""
+        if fetched is None or fetched.file is None or not entry.chunked:
+            return fetched
+        manifest = Manifest.load(fetched.file)
+        if (select := _member_filter(entry)) is not None:
+            manifest = manifest.selected(select)        # only the chunks of the files to install
+        with self._telemetry.phase(entry.name, "chunks") as span, \
+             self._progress.phase(entry.name, "download") as report:
+            if isinstance(provider, PeerProvider):
+                provider = provider.origin      # mirrors serve whole artifacts, not chunks
+            stats = self._chunks.fetch(manifest, entry.url, provider, self._temp / entry.name, log, report)
+            span.bytes_in = stats.bytes_in
+        log(f"  [Chunks] Downloaded {stats.fetched} of {stats.chunks} chunk(s): {_mb(stats.bytes_in)} "
+            f"instead of {_mb(stats.bytes_full)} ({_mb(stats.bytes_saved)} saved)")
+
+        with self._chunk_lock:
+            totals = self._chunk_totals = self._chunk_totals or FetchStats()
+            totals.chunks     += stats.chunks
+            totals.fetched    += stats.fetched
+            totals.bytes_in   += stats.bytes_in
+            totals.bytes_full += stats.bytes_full
+        fetched.manifest = manifest
+        return fetched
+
+    def _stream_extract(self, entry: AssetEntry, provider: BaseProvider, validator: dict | None,
+                        log: Callable[[str], None]) -> _Fetched | None:
+        """Unpack the entry straight from the provider's stream into staging; None means use the temp file."""
+        filename = provider.remote_filename(entry.url)
+        if filename is None or not can_stream(filename):
+            return None
+
+        with self._telemetry.phase(entry.name, "stream") as span, \
+             self._progress.phase(entry.name, "download") as report:
+            stream = provider.open_stream(entry.url, log, entry, report)
+            if stream is None:
+                return None
+
+            dest_dir = self._root / entry.location
+            staged   = self._stage(entry, log)
+            try:
+                result = extract_stream(stream, filename, staged.path, log, delta=self._delta,
+                                        current_dir=dest_dir, select=_member_filter(entry))
+            finally:
+                stream.close()
+            if result is not None:
+                span.bytes_out, span.files = result.bytes_written, result.written
+
+        if result is None:
+            staged.discard()
+            log("  Streaming failed — falling back to a full download")
+            return None
+        return _Fetched(validator, extracted=result, staged=staged)
+
+    def _ranged_extract(self, entry: AssetEntry, provider: BaseProvider, validator: dict | None,
+                        log: Callable[[str], None]) -> _Fetched | None:
+        """Unpack the selected members of a remote ZIP into staging by byte ranges; None means download it whole."""
+        filename = provider.remote_filename(entry.url)
+        if filename is None or not can_read_ranged(filename):
+            return None
+
+        with self._telemetry.phase(entry.name, "ranges") as span, \
+             self._progress.phase(entry.name, "extract") as report:
+            file = provider.open_ranged(entry.url, log)
+            if file is None:
+                return None
+
+            dest_dir = self._root / entry.location
+            staged   = self._stage(entry, log)
+            with file:
+                result = extract_ranged(file, staged.path, log, delta=self._delta, progress=report,
+                                        current_dir=dest_dir, select=_member_filter(entry))
+            span.bytes_in = file.fetched
+            if result is not None:
+                span.bytes_out, span.files = result.bytes_written, result.written
+
+        if result is None:
+            staged.discard()
+            log("  Reading byte ranges failed — falling back to a full download")
+            return None
+        return _Fetched(validator, extracted=result, staged=staged)
+
+    def _install_stage(self, entry: AssetEntry, fetched: _Fetched,
+                       log: Callable[[str], None]) -> bool:
+        entry_temp      = self._temp / entry.name
+        downloaded_file = fetched.file
+
+        # 4. extract or move into staging, then swap into place
         dest_dir = self._root / entry.location
         dest_dir.mkdir(parents=True, exist_ok=True)
+        staged   = fetched.staged
 
-        if _is_archive(downloaded_file):
-            ok = extract(downloaded_file, dest_dir, self._log)
-            if not ok:
+        try:
+            if fetched.extracted is not None:
+                files = fetched.extracted.files
+            elif fetched.manifest is not None:
+                staged = self._stage(entry, log)
+                with self._telemetry.phase(entry.name, "assemble") as span, \
+                     self._progress.phase(entry.name, "extract") as report:
+                    result = self._chunks.assemble(fetched.manifest, staged.path, delta=self._delta,
+                                                   previous=self._chunks.installed(entry.name),
+                                                   current=dest_dir, progress=report)
+                    span.bytes_out, span.files = result.bytes_written, result.written
+                log(f"  [Chunks] Assembled {result.written} file(s)"
+                    + (f", {result.skipped} unchanged" if self._delta else ""))
+                files = result.files
+            elif is_archive(downloaded_file):
+                staged = self._stage(entry, log)
+                with self._telemetry.phase(entry.name, "extract") as span, \
+                     self._progress.phase(entry.name, "extract") as report:
+                    span.bytes_in = _size(downloaded_file)
+                    result = extract(downloaded_file, staged.path, log, delta=self._delta,
+                                     progress=report, current_dir=dest_dir, select=_member_filter(entry))
+                    if result is not None:
+                        span.bytes_out, span.files = result.bytes_written, result.written
+                if result is None:
+                    staged.discard()
+                    return False
+                files = result.files
+            else:
+                staged = self._stage(entry, log)
+                with self._telemetry.phase(entry.name, "move"):
+                    how = move_file(downloaded_file, staged.path / downloaded_file.name)
+                log(f"  [Move] {downloaded_file.name} → {dest_dir}" + (f" ({how})" if how != "rename" else ""))
+                files = [downloaded_file.name]
+            with self._telemetry.phase(entry.name, "commit") as span:
+                span.files = staged.commit(log)
+            if fetched.manifest is not None:
+                self._chunks.record(entry.name, fetched.manifest)
+        except Exception:
+            if staged is not None:
+                staged.discard()
+            raise
+        finally:
+            # 5. cleanup
+            with self._telemetry.phase(entry.name, "cleanup"):
                 self._cleanup(entry_temp)
-                return False
-        else:
-            self._log(f"  [Move] {downloaded_file.name} → {dest_dir}")
-            shutil.move(str(downloaded_file), str(dest_dir / downloaded_file.name))
 
-        # 4. cleanup
-        self._cleanup(entry_temp)
-        self._log(f"  ✓ Done: {entry.name}")
+        if self._state is not None:
+            with self._telemetry.phase(entry.name, "record") as span:
+                self._state.record(entry, fetched.validator, dest_dir, files, sha256=fetched.sha256)
+                span.files = len(files)
+
+        log(f"  ✓ Done: {entry.name}")
         return True
 
+    def _store(self, entry: AssetEntry, validator: dict | None, fetched: _Fetched,
+               log: Callable[[str], None]) -> None:
+        """Add a fresh download to the shared cache, if there is one."""
+        if self._cache is None:
+            return
+        with self._telemetry.phase(entry.name, "cache store") as span:
+            span.bytes_out = _size(fetched.file)
+            self._cache.store(entry.url, validator, fetched.file, log, sha256=fetched.sha256)
+
+    def _stage(self, entry: AssetEntry, log: Callable[[str], None]) -> StagedInstall:
+        return StagedInstall(self._root / STAGING_DIR / entry.name, self._root / entry.location, log)
+
+    @staticmethod
+    def _prepare_temp(entry_temp: Path, provider: BaseProvider):
+        """Empty the entry's temp dir, except for resumable partial downloads."""
+        entry_temp.mkdir(parents=True, exist_ok=True)
+        partial = (provider.PARTIAL_SUFFIX, provider.PARTIAL_SUFFIX + ".json")
+        for child in entry_temp.iterdir():
+            if child.is_file() and child.name.endswith(partial):
+                continue
+            if child.is_dir():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+
     @staticmethod
     def _cleanup(path: Path):
         if path.exists():
@@ -88,9 +825,28 @@ class SyncRunner:
 
 # ── helpers ───────────────────────────────────────────────────────────
 
-_ARCHIVE_SUFFIXES = {".zip", ".tar", ".gz", ".bz2", ".tgz", ".rar"}
+class _EntryLog:
+    """log_callback stand-in that collects one entry's lines until it finishes."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def __call__(self, text: str) -> None:
+        self.lines.append(text)
+
+
+def _member_filter(entry: AssetEntry) -> MemberFilter | None:
+    """The entry's include / exclude patterns; None when it has none and takes every member."""
+    return MemberFilter(entry.include, entry.exclude) if entry.include or entry.exclude else None
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 ** 2:.1f} MB"
 
 
-def _is_archive(file_path: Path) -> bool:
-    """Check if the file looks like an archive by its suffixes."""
-    return bool(set(file_path.suffixes) & _ARCHIVE_SUFFIXES)
+def _size(file_path: Path | None) -> int:
+    """Size of a file for the telemetry counters; 0 if there is none (any more)."""
+    try:
+        return file_path.stat().st_size if file_path is not None else 0
+    except OSError:
+        return 0
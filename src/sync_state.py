@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from config import AssetEntry
+
+
+# ── on-disk layout ────────────────────────────────────────────────────
+# SyncState.json lives next to Database.json but is machine-local —
+# it describes what *this* checkout has installed, so don't commit it.
+#
+# {
+#     "Entries": {
+#         "<entry name>": {
+#             "url":       "...",
+#             "location":  "...",
+#             "validator": {"etag": "...", "size": 123},
+#             "sha256":    "...",            # verified hash of the artifact, if the entry publishes one
+#             "include":   ["..."],          # the entry's include / exclude patterns, if it has any
+#             "exclude":   ["..."],
+#             "files":     {"sub/file.bin": {"size": 123, "mtime_ns": 1700000000000000000}}
+#         }
+#     }
+# }
+
+_STATE_FILE = "SyncState.json"
+_STATE_KEY  = "Entries"
+
+_HASH_CHUNK = 1024 * 1024
+
+
+class SyncState:
+    """
+    Remembers, per entry, which remote version was installed and which
+    files it produced, so unchanged entries can be skipped on later runs.
+
+    An entry that publishes a sha256 is matched by that hash instead of
+    the remote validator, so it can be checked without asking the remote.
+
+    The up-to-date check only stat()s the recorded files (size + mtime).
+    With verify=True files are also hashed — on record and on check.
+    Thread-safe: the pipelined runner records from several workers.
+    """
+
+    def __init__(self, config_dir: Path, verify: bool = False):
+        self._path    = config_dir / _STATE_FILE
+        self._verify  = verify
+        self._lock    = threading.Lock()
+        self._entries = self._load()
+
+    # ── public ────────────────────────────────────────────────────────
+
+    def is_current(self, entry: AssetEntry, validator: dict | None, dest_dir: Path) -> bool:
+        """True if `entry` was installed from this exact remote version and is still intact."""
+        if validator is None and not entry.sha256:
+            return False
+
+        with self._lock:
+            record = self._entries.get(entry.name)
+        if record is None:
+            return False
+        if (record.get("url"), record.get("location")) != (entry.url, entry.location):
+            return False
+        if (record.get("include", []), record.get("exclude", [])) != (entry.include, entry.exclude):
+            return False                # other members selected: other files to install
+        if entry.sha256:
+            if record.get("sha256") != entry.sha256.lower():
+                return False
+        elif record.get("validator") != validator:
+            return False
+
+        return all(
+            _file_matches(dest_dir / rel, info, self._verify)
+            for rel, info in record.get("files", {}).items()
+        )
+
+    def record(self, entry: AssetEntry, validator: dict | None, dest_dir: Path,
+               files: list[str], sha256: str | None = None) -> None:
+        """
+        Remember a successful install of `entry`. `sha256` is the verified
+        hash of the artifact it came from. No-op without a validator or hash.
+        """
+        if validator is None and sha256 is None:
+            self.forget(entry.name)
+            return
+
+        manifest = {}
+        for rel in files:
+            info = _describe(dest_dir / rel, self._verify)
+            if info is not None:
+                manifest[rel] = info
+
+        record = {
+            "url":       entry.url,
+            "location":  entry.location,
+            "validator": validator,
+            "sha256":    sha256,
+            "files":     manifest,
+        }
+        if entry.include:
+            record["include"] = entry.include
+        if entry.exclude:
+            record["exclude"] = entry.exclude
+        with self._lock:
+            self._entries[entry.name] = record
+
+    def forget(self, name: str) -> None:
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def save(self) -> None:
+        """Write the state atomically (temp file + rename)."""
+        with self._lock:
+            data = {_STATE_KEY: self._entries}
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_name(self._path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp, self._path)
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _load(self) -> dict:
+        if not self._path.exists():
+            return {}
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f).get(_STATE_KEY, {})
+        except (OSError, ValueError):
+            # a corrupt state file only costs us a full re-sync
+            return {}
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+def _describe(path: Path, with_hash: bool) -> dict | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    info = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        info["sha256"] = _sha256(path)
+    return info
+
+
+def _file_matches(path: Path, info: dict, with_hash: bool) -> bool:
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    if st.st_size != info.get("size") or st.st_mtime_ns != info.get("mtime_ns"):
+        return False
+    if with_hash:
+        return info.get("sha256") == _sha256(path)
+    return True
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
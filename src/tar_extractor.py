@@ -0,0 +1,198 @@
+import tarfile
+from pathlib import Path
+from typing import BinaryIO
+
+from base_extractor import BaseExtractor, ExtractResult, MemberFilter, Meter, member_target, mtime_unchanged
+import zstd_frames
+
+# tarfile's stream mode re-slices its read buffer on every small read,
+# so a larger buffer costs more copying than it saves in read calls
+_STREAM_BUFSIZE = 64 * 1024
+
+# extraction filters: 3.12+, and 3.8.17 / 3.9.17 / 3.10.12 / 3.11.4 security releases
+_HAS_FILTERS = hasattr(tarfile, "data_filter")
+
+# format → (tarfile mode for a file, mode for a non-seekable stream)
+_MODES = {
+    "tar":     ("r:",    "r|"),
+    "tar.gz":  ("r:gz",  "r|gz"),
+    "tar.bz2": ("r:bz2", "r|bz2"),
+    "tar.xz":  ("r:xz",  "r|xz"),
+}
+
+
+class TarExtractor(BaseExtractor):
+    """
+    Tarballs via the stdlib tarfile, from a file or straight from a
+    stream. tar headers carry no checksum of the data, so delta mode
+    compares size + mtime (which extraction restores).
+    """
+
+    formats = tuple(_MODES)
+
+    @property
+    def name(self) -> str:
+        return "tarfile"
+
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: MemberFilter | None = None,
+                meter: Meter, current: Path) -> ExtractResult:
+        log_callback(f"  [Extract] Untarring {archive.name}")
+        with tarfile.open(archive, _MODES[fmt][0]) as tf:
+            return _untar(tf, dest, delta, select, meter, current)
+
+    def can_stream(self, fmt: str) -> bool:
+        return fmt in _MODES
+
+    def extract_stream(self, stream: BinaryIO, fmt: str, dest: Path, log_callback, *,
+                       delta: bool = False, select: MemberFilter | None = None,
+                       meter: Meter, current: Path) -> ExtractResult:
+        with tarfile.open(fileobj=stream, mode=_MODES[fmt][1], bufsize=_STREAM_BUFSIZE) as tf:
+            return _untar(tf, dest, delta, select, meter, current)
+
+
+class ZstdTarExtractor(BaseExtractor):
+    """
+    Zstandard tarballs (optional: `pip install zstandard`), decompressed
+    on the fly into tarfile's streaming mode — nothing is staged on disk.
+
+    zstd can't split a frame between threads, but archives made of many
+    independent frames (written by pzstd or a seekable-format writer —
+    `zstd -T0` still writes one frame) are decompressed on up to
+    `workers` threads, frames handed back in order. Single-frame archives
+    and downloads being streamed use one thread, which zstd does at
+    several hundred MB/s anyway.
+    """
+
+    formats = ("tar.zst",)
+
+    @property
+    def name(self) -> str:
+        return "zstandard"
+
+    def unavailable(self) -> str | None:
+        try:
+            import zstandard  # noqa: F401
+        except ImportError as e:
+            return f"zstandard isn't available ({e}) — pip install zstandard"
+        return None
+
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: MemberFilter | None = None,
+                meter: Meter, current: Path) -> ExtractResult:
+        import zstandard
+
+        with open(archive, "rb") as f:
+            try:
+                spans = zstd_frames.frame_spans(f) if workers > 1 else []
+            except ValueError:
+                spans = []              # not a plain frame sequence: let zstandard report it
+            if len(spans) > 1:
+                threads = min(workers, len(spans))
+                log_callback(f"  [Extract] Untarring {archive.name} "
+                             f"({len(spans)} zstd frames on {threads} threads)")
+                reader = zstd_frames.ParallelFrameReader(archive, spans, threads)
+            else:
+                log_callback(f"  [Extract] Untarring {archive.name}")
+                f.seek(0)
+                reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            with reader, tarfile.open(fileobj=reader, mode="r|", bufsize=_STREAM_BUFSIZE) as tf:
+                return _untar(tf, dest, delta, select, meter, current)
+
+    def can_stream(self, fmt: str) -> bool:
+        return True
+
+    def extract_stream(self, stream: BinaryIO, fmt: str, dest: Path, log_callback, *,
+                       delta: bool = False, select: MemberFilter | None = None,
+                       meter: Meter, current: Path) -> ExtractResult:
+        import zstandard
+
+        reader = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+        with reader, tarfile.open(fileobj=reader, mode="r|", bufsize=_STREAM_BUFSIZE) as tf:
+            return _untar(tf, dest, delta, select, meter, current)
+
+
+class Lz4TarExtractor(BaseExtractor):
+    """
+    LZ4 tarballs (optional: `pip install lz4`), decompressed on the fly
+    into tarfile's streaming mode, from a file or a download stream.
+    LZ4 decodes faster than the disk writes, so one thread is enough.
+    """
+
+    formats = ("tar.lz4",)
+
+    @property
+    def name(self) -> str:
+        return "lz4"
+
+    def unavailable(self) -> str | None:
+        try:
+            import lz4.frame  # noqa: F401
+        except ImportError as e:
+            return f"lz4 isn't available ({e}) — pip install lz4"
+        return None
+
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: MemberFilter | None = None,
+                meter: Meter, current: Path) -> ExtractResult:
+        log_callback(f"  [Extract] Untarring {archive.name}")
+        with open(archive, "rb") as f:
+            return self.extract_stream(f, fmt, dest, log_callback, delta=delta, select=select,
+                                       meter=meter, current=current)
+
+    def can_stream(self, fmt: str) -> bool:
+        return True
+
+    def extract_stream(self, stream: BinaryIO, fmt: str, dest: Path, log_callback, *,
+                       delta: bool = False, select: MemberFilter | None = None,
+                       meter: Meter, current: Path) -> ExtractResult:
+        import lz4.frame
+
+        with lz4.frame.LZ4FrameFile(stream, "rb") as reader, \
+                tarfile.open(fileobj=reader, mode="r|", bufsize=_STREAM_BUFSIZE) as tf:
+            return _untar(tf, dest, delta, select, meter, current)
+
+
+def _untar(tf: tarfile.TarFile, dest: Path, delta: bool, select: MemberFilter | None,
+           meter: Meter, current: Path) -> ExtractResult:
+    result = ExtractResult()
+
+    def members():
+        # a generator over tf walks members in order, so this works for "r|" streams too
+        for member in tf:
+            target = member_target(dest, member.name)
+            if target is None:
+                continue
+            rel = target.relative_to(dest).as_posix()
+            if select is not None and not select(rel):
+                # tar has no index: its data is still read (and decompressed) past, just not written
+                result.excluded += member.isfile()
+                continue
+            member.name = rel                   # land where member_target says, as the other backends do
+            if not _HAS_FILTERS and not (member.isfile() or member.isdir()):
+                continue                        # no data filter to vet links and devices: skip them
+            if member.isfile():
+                result.files.append(rel)
+                unchanged = delta and mtime_unchanged(current / rel, member.size, member.mtime)
+                result.count(member.size, skipped=unchanged)
+                if unchanged:
+                    meter.add(member.size)
+                    continue
+            yield member
+            # tar only reveals sizes member by member, so progress moves per member
+            if member.isfile():
+                meter.add(member.size)
+
+    if _HAS_FILTERS:
+        tf.extractall(dest, members=members(), filter=_data_filter)
+    else:
+        tf.extractall(dest, members=members())
+    return result
+
+
+def _data_filter(member: tarfile.TarInfo, path: str) -> tarfile.TarInfo | None:
+    """tarfile's "data" filter, skipping what it refuses (links out of dest, devices, ...) instead of failing."""
+    try:
+        return tarfile.data_filter(member, path)
+    except tarfile.FilterError:
+        return None
@@ -0,0 +1,198 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+_MB = 1024 * 1024
+
+
+# ── counters ──────────────────────────────────────────────────────────
+
+@dataclass
+class PhaseStats:
+    """Totals of one phase ("download", "extract", ...) of one entry, or of a whole run."""
+    seconds:   float = 0.0
+    bytes_in:  int = 0      # read: from the network, the archive, the cache...
+    bytes_out: int = 0      # written to disk
+    files:     int = 0
+    retries:   int = 0
+    runs:      int = 0      # times the phase ran
+
+    def add(self, other: "PhaseStats") -> None:
+        self.seconds   += other.seconds
+        self.bytes_in  += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.files     += other.files
+        self.retries   += other.retries
+        self.runs      += other.runs
+
+    def to_json(self) -> dict:
+        data = {"seconds": round(self.seconds, 4)}
+        for key in ("bytes_in", "bytes_out", "files", "retries"):
+            if getattr(self, key):
+                data[key] = getattr(self, key)
+        if self.seconds > 0:
+            if self.bytes_in:
+                data["in_mb_s"] = round(self.bytes_in / _MB / self.seconds, 2)
+            if self.bytes_out:
+                data["out_mb_s"] = round(self.bytes_out / _MB / self.seconds, 2)
+        if self.runs > 1:
+            data["runs"] = self.runs
+        return data
+
+
+class Span:
+    """What a running phase fills in; its time is measured around it."""
+    __slots__ = ("bytes_in", "bytes_out", "files", "retries")
+
+    def __init__(self):
+        self.bytes_in  = 0
+        self.bytes_out = 0
+        self.files     = 0
+        self.retries   = 0
+
+
+@dataclass
+class _EntryRecord:
+    type:    str = ""
+    outcome: str = ""
+    phases:  dict[str, PhaseStats] = field(default_factory=dict)
+    first:   float | None = None     # perf_counter() at the start of its first phase
+    last:    float = 0.0             # ... and the end of its last one
+
+
+# the span of the phase running in this thread / task, for note_retry()
+_active: ContextVar[Span | None] = ContextVar("telemetry_span", default=None)
+_retry_lock = threading.Lock()
+
+
+def note_retry() -> None:
+    """Count a retry against the phase running in this context; no-op outside one."""
+    span = _active.get()
+    if span is not None:
+        with _retry_lock:           # segment threads of one download share the span
+            span.retries += 1
+
+
+# ── collector ─────────────────────────────────────────────────────────
+
+class Telemetry:
+    """
+    Per-entry, per-phase wall time, bytes in / out, file and retry counts
+    for one sync run, written out as a JSON or JSONL report.
+
+    Cheap enough to leave on: a phase costs two perf_counter() calls and
+    one short lock. Thread-safe; providers don't take a reference —
+    they call note_retry(), which finds the current phase through a
+    context variable (threads and asyncio tasks each have their own).
+    """
+
+    def __init__(self):
+        self._lock    = threading.Lock()
+        self._entries: dict[str, _EntryRecord] = {}
+        self._started = datetime.now(timezone.utc)
+        self._t0      = time.perf_counter()
+        self._t1: float | None = None
+        self.settings: dict = {}          # how the run was configured, copied into the report
+
+    @contextmanager
+    def phase(self, entry: str, name: str):
+        """Time the block as phase `name` of `entry`; yields a Span to fill in."""
+        span  = Span()
+        token = _active.set(span)
+        began = time.perf_counter()
+        try:
+            yield span
+        finally:
+            ended = time.perf_counter()
+            _active.reset(token)
+            self._add(entry, name, began, ended, span)
+
+    def add(self, entry: str, name: str, seconds: float, bytes_in: int = 0,
+            bytes_out: int = 0, files: int = 0) -> None:
+        """Record a phase measured elsewhere (e.g. an entry's share of a batch download)."""
+        span = Span()
+        span.bytes_in, span.bytes_out, span.files = bytes_in, bytes_out, files
+        ended = time.perf_counter()
+        self._add(entry, name, ended - seconds, ended, span)
+
+    def finish(self, entry: str, type_name: str, outcome: str) -> None:
+        """Set the entry's outcome; the report lists entries in the order they're finished."""
+        with self._lock:
+            record = self._entries.pop(entry, None) or _EntryRecord()
+            record.type, record.outcome = type_name, outcome
+            self._entries[entry] = record
+
+    def close(self) -> None:
+        """Mark the end of the run."""
+        self._t1 = time.perf_counter()
+
+    # ── report ────────────────────────────────────────────────────────
+
+    def to_json(self) -> dict:
+        """{"run": ..., "entries": [...]} — run totals first, then one record per entry."""
+        with self._lock:
+            entries = list(self._entries.items())
+
+        totals: dict[str, PhaseStats] = {}
+        outcomes: dict[str, int] = {}
+        records = []
+        for name, record in entries:
+            for phase, stats in record.phases.items():
+                totals.setdefault(phase, PhaseStats()).add(stats)
+            outcomes[record.outcome] = outcomes.get(record.outcome, 0) + 1
+            records.append({
+                "name":    name,
+                "type":    record.type,
+                "outcome": record.outcome,
+                "seconds": round(record.last - record.first, 4) if record.first is not None else 0.0,
+                "retries": sum(s.retries for s in record.phases.values()),
+                "phases":  {phase: stats.to_json() for phase, stats in record.phases.items()},
+            })
+
+        ended = self._t1 if self._t1 is not None else time.perf_counter()
+        run = {
+            "started":  self._started.isoformat(timespec="seconds"),
+            "seconds":  round(ended - self._t0, 4),
+            "settings": self.settings,
+            "outcomes": outcomes,
+            "phases":   {phase: stats.to_json() for phase, stats in totals.items()},
+        }
+        return {"run": run, "entries": records}
+
+    def write(self, path: Path) -> None:
+        """
+        Write the report. A .jsonl path gets one line per entry followed by
+        a line with the run totals, appended so CI can collect many runs in
+        one file; anything else gets a single JSON document.
+        """
+        report = self.to_json()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".jsonl":
+            with open(path, "a", encoding="utf-8") as f:
+                for record in report["entries"]:
+                    f.write(json.dumps({"entry": record, "started": report["run"]["started"]},
+                                       ensure_ascii=False) + "\n")
+                f.write(json.dumps({"run": report["run"]}, ensure_ascii=False) + "\n")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=4, ensure_ascii=False)
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _add(self, entry: str, name: str, began: float, ended: float, span: Span) -> None:
+        with self._lock:
+            record = self._entries.setdefault(entry, _EntryRecord())
+            stats  = record.phases.setdefault(name, PhaseStats())
+            stats.seconds   += ended - began
+            stats.bytes_in  += span.bytes_in
+            stats.bytes_out += span.bytes_out
+            stats.files     += span.files
+            stats.retries   += span.retries
+            stats.runs      += 1
+            record.first = began if record.first is None else min(record.first, began)
+            record.last  = max(record.last, ended)
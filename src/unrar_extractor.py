@@ -0,0 +1,99 @@
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from base_extractor import BaseExtractor, ExtractResult, MemberFilter, Meter
+
+_EXTRACTING = "Extracting "
+
+
+class UnrarExtractor(BaseExtractor):
+    """
+    RAR via the unrar CLI, for machines without libarchive. unrar must be
+    installed separately (not bundled — closed-source tool).
+
+    One unrar run per archive. Its output is read line by line as it
+    works (nothing is buffered), and each "Extracting <file> OK" line
+    advances the progress. No delta mode: every file is written.
+    """
+
+    formats = ("rar",)
+
+    @property
+    def name(self) -> str:
+        return "unrar"
+
+    def unavailable(self) -> str | None:
+        if shutil.which("unrar") is None:
+            return "'unrar' not found in PATH (https://www.win-rar.com/unrarfree.html)"
+        return None
+
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: MemberFilter | None = None,
+                meter: Meter, current: Path) -> ExtractResult:
+        log_callback(f"  [Extract] Unraring {archive.name} (unrar)")
+        if delta:
+            log_callback("  [Extract] Delta mode isn't available with unrar, writing every file")
+
+        result = ExtractResult()
+        # -idc -idp: no banner, no percentages — one line per member
+        command = ["unrar", "x", "-o+", "-y", "-idc", "-idp", str(archive)]
+        with tempfile.TemporaryDirectory(prefix="unrar-") as tmp:
+            if select is not None:
+                names  = _file_members(archive)
+                wanted = [name for name in names if select(name)]
+                result.excluded = len(names) - len(wanted)
+                if not wanted:
+                    return result
+                # only the selected members: a list file of their names, in UTF-16 with a BOM
+                # (-scul; older unrar builds have no UTF-8 option for list files)
+                list_file = Path(tmp) / "members.txt"
+                list_file.write_text("\n".join(wanted) + "\n", encoding="utf-16")
+                command += ["-scul", f"@{list_file}"]
+
+            proc = subprocess.Popen(
+                command + [str(dest) + "/"],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace",
+            )
+            other = []          # anything else unrar said, for the error message
+            for line in proc.stdout:
+                line = line.strip()
+                if not (line.startswith(_EXTRACTING) and line.endswith("OK")):
+                    if line:
+                        other = (other + [line])[-5:]
+                    continue
+                rel    = line[len(_EXTRACTING):-2].strip().replace("\\", "/")
+                target = dest / rel
+                if target.is_file():
+                    size = target.stat().st_size
+                    result.files.append(rel)
+                    result.count(size, skipped=False)
+                    meter.add(size)
+            code = proc.wait()
+
+        if code != 0:
+            if other:
+                log_callback(f"  [Extract] unrar error: {' / '.join(other)}")
+            raise RuntimeError(f"unrar exited with code {code}")
+        return result
+
+
+def _file_members(archive: Path) -> list[str]:
+    """
+    The paths of the archive's files. `unrar lt` prints a "Name:" /
+    "Type:" block per member; folders and links are left out, so they
+    neither count as excluded nor go into the list file.
+    """
+    listing = subprocess.run(["unrar", "lt", "-idc", str(archive)], capture_output=True,
+                             text=True, errors="replace", check=True)
+    files, name = [], None
+    for line in listing.stdout.splitlines():
+        key, _, value = line.strip().partition(": ")
+        if key == "Name":
+            name = value
+        elif key == "Type" and name is not None:
+            if value == "File":
+                files.append(name)
+            name = None
+    return files
@@ -0,0 +1,168 @@
+import heapq
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from base_extractor import (COPY_BUFSIZE, BaseExtractor, ExtractResult, MemberFilter, Meter,
+                            crc_unchanged, member_target)
+from ranged_file import RangedFile
+
+# ZIPs smaller than this aren't worth a thread pool
+_PARALLEL_MIN_MEMBERS = 32
+_PARALLEL_MIN_BYTES   = 16 * 1024 * 1024
+
+# remote ZIPs: members closer together than this are fetched as one range,
+# reading the bytes in between rather than paying for another request
+_RANGE_GAP = 256 * 1024
+
+
+class ZipExtractor(BaseExtractor):
+    """
+    ZIP via the stdlib zipfile. Every member is opened on its own, so large
+    archives can be split across threads: zlib/bz2/lzma release the GIL
+    while they decompress, and each thread reads through its own ZipFile
+    handle. Delta mode compares size + CRC32 from the central directory.
+
+    The central directory also tells where every member lies, so a ZIP
+    behind a provider that serves byte ranges can be unpacked member by
+    member without downloading what isn't selected (extract_ranged).
+    """
+
+    formats = ("zip",)
+
+    @property
+    def name(self) -> str:
+        return "zipfile"
+
+    def extract(self, archive: Path, fmt: str, dest: Path, log_callback, *,
+                workers: int = 1, delta: bool = False, select: MemberFilter | None = None,
+                meter: Meter, current: Path) -> ExtractResult:
+        with zipfile.ZipFile(archive, "r") as zf:
+            jobs, result = _plan(zf.infolist(), dest, current, select)
+
+        total = sum(info.file_size for info, _, _ in jobs)
+        meter.total = total
+        if workers > 1 and len(jobs) >= _PARALLEL_MIN_MEMBERS and total >= _PARALLEL_MIN_BYTES:
+            buckets = _balance(jobs, workers)
+            log_callback(f"  [Extract] Unzipping {archive.name} on {len(buckets)} threads")
+            with ThreadPoolExecutor(len(buckets), thread_name_prefix="unzip") as pool:
+                futures = [pool.submit(_unzip_file, archive, bucket, delta, meter)
+                           for bucket in buckets]
+                for future in futures:
+                    result.merge(future.result())
+        else:
+            log_callback(f"  [Extract] Unzipping {archive.name}")
+            result.merge(_unzip_file(archive, jobs, delta, meter))
+
+        return result
+
+    def can_read_ranged(self, fmt: str) -> bool:
+        return True
+
+    def extract_ranged(self, file: RangedFile, fmt: str, dest: Path, log_callback, *,
+                       delta: bool = False, select: MemberFilter | None = None,
+                       meter: Meter, current: Path) -> ExtractResult:
+        """
+        The central directory comes from the file's tail; then the members
+        to write are read in archive order, each run of them lying close
+        together fetched as one range. Delta-unchanged members aren't fetched.
+        """
+        with zipfile.ZipFile(file, "r") as zf:
+            jobs, result = _plan(zf.infolist(), dest, current, select)
+            meter.total = sum(info.file_size for info, _, _ in jobs)
+
+            fetch = []
+            for job in jobs:
+                info, _, current_path = job
+                unchanged = delta and crc_unchanged(current_path, info.file_size, info.CRC)
+                if unchanged:
+                    result.count(info.file_size, skipped=True)
+                    meter.add(info.file_size)
+                else:
+                    fetch.append(job)
+            fetch.sort(key=lambda job: job[0].header_offset)
+
+            spans = _member_spans(zf, [info for info, _, _ in fetch])
+            file.plan(spans)
+            log_callback(f"  [Extract] Unzipping {len(fetch)} member(s) of {file.name} "
+                         f"by byte ranges ({len(spans)} range(s))")
+            result.merge(_unzip_members(zf, fetch, False, meter))
+        return result
+
+
+def _plan(infos: list[zipfile.ZipInfo], dest: Path, current: Path,
+          select: MemberFilter | None) -> tuple[list[tuple[zipfile.ZipInfo, Path, Path]], ExtractResult]:
+    """
+    The members to unpack as (member, where to write it, where its current
+    version lives), and a result listing their files. Creates every
+    directory up front, so workers never race each other on makedirs.
+    """
+    jobs, excluded = [], 0
+    for info in infos:
+        target = member_target(dest, info.filename)
+        if target is None:
+            continue
+        if select is not None and not select(info.filename):
+            excluded += not info.is_dir()
+            continue
+        if info.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            jobs.append((info, target, current / target.relative_to(dest)))
+
+    result = ExtractResult(files=[target.relative_to(dest).as_posix() for _, target, _ in jobs],
+                           excluded=excluded)
+    return jobs, result
+
+
+def _unzip_file(archive: Path, jobs: list[tuple[zipfile.ZipInfo, Path, Path]],
+                delta: bool, meter: Meter) -> ExtractResult:
+    """_unzip_members through this thread's own handle on the archive."""
+    with zipfile.ZipFile(archive, "r") as zf:
+        return _unzip_members(zf, jobs, delta, meter)
+
+
+def _unzip_members(zf: zipfile.ZipFile, jobs: list[tuple[zipfile.ZipInfo, Path, Path]],
+                   delta: bool, meter: Meter) -> ExtractResult:
+    """jobs: (member, where to write it, where its current version lives)."""
+    counts = ExtractResult()
+    for info, target, current in jobs:
+        unchanged = delta and crc_unchanged(current, info.file_size, info.CRC)
+        counts.count(info.file_size, skipped=unchanged)
+        if unchanged:
+            meter.add(info.file_size)
+            continue
+        with zf.open(info) as src, open(target, "wb") as out:
+            while chunk := src.read(COPY_BUFSIZE):
+                out.write(chunk)
+                meter.add(len(chunk))
+    return counts
+
+
+def _member_spans(zf: zipfile.ZipFile, infos: list[zipfile.ZipInfo]) -> list[tuple[int, int]]:
+    """
+    Byte ranges covering `infos` (sorted by offset): each member from its
+    local header up to the next member or the central directory, and
+    members less than _RANGE_GAP apart merged into one range.
+    """
+    offsets = sorted({info.header_offset for info in zf.infolist()} | {zf.start_dir})
+    after   = dict(zip(offsets, offsets[1:]))
+    spans: list[tuple[int, int]] = []
+    for info in infos:
+        start, end = info.header_offset, after[info.header_offset]
+        if spans and start - spans[-1][1] < _RANGE_GAP:
+            spans[-1] = (spans[-1][0], max(end, spans[-1][1]))
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def _balance(jobs: list, workers: int) -> list[list]:
+    """Split members into at most `workers` buckets of similar total size (largest first)."""
+    heap = [(0, i, []) for i in range(min(workers, len(jobs)))]
+    for job in sorted(jobs, key=lambda job: job[0].file_size, reverse=True):
+        load, i, bucket = heapq.heappop(heap)
+        bucket.append(job)
+        heapq.heappush(heap, (load + job[0].file_size, i, bucket))
+    return [bucket for _, _, bucket in heap if bucket]
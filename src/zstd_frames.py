@@ -0,0 +1,112 @@
+import io
+import struct
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+_FRAME_MAGIC     = 0xFD2FB528
+_SKIPPABLE_MAGIC = 0x184D2A50       # ... through 0x184D2A5F
+_DID_SIZES       = (0, 1, 2, 4)
+_FCS_SIZES       = (0, 2, 4, 8)     # 0 means 1 byte when the frame is single-segment
+
+
+def frame_spans(f: BinaryIO) -> list[tuple[int, int]]:
+    """
+    (offset, length) of every data frame of a zstd file, found by walking
+    frame and block headers (a few bytes per 128 KB block; nothing is
+    decompressed). Skippable frames are left out. Raises ValueError if
+    the file isn't a well-formed sequence of frames.
+    """
+    spans = []
+    f.seek(0, io.SEEK_END)
+    end = f.tell()
+    pos = 0
+    while pos < end:
+        f.seek(pos)
+        magic, = struct.unpack("<I", _read_exactly(f, 4))
+        if magic & 0xFFFFFFF0 == _SKIPPABLE_MAGIC:
+            size, = struct.unpack("<I", _read_exactly(f, 4))
+            pos += 8 + size
+            continue
+        if magic != _FRAME_MAGIC:
+            raise ValueError(f"no zstd frame at offset {pos}")
+
+        descriptor = _read_exactly(f, 1)[0]
+        single     = descriptor >> 5 & 1
+        fcs_size   = _FCS_SIZES[descriptor >> 6] or single
+        checksum   = descriptor >> 2 & 1
+        cursor     = pos + 5 + (not single) + _DID_SIZES[descriptor & 3] + fcs_size
+        while True:
+            f.seek(cursor)
+            header = int.from_bytes(_read_exactly(f, 3), "little")
+            last, kind, size = header & 1, header >> 1 & 3, header >> 3
+            if kind == 3:
+                raise ValueError(f"reserved zstd block type at offset {cursor}")
+            cursor += 3 + (1 if kind == 1 else size)      # an RLE block stores one byte
+            if last:
+                break
+        cursor += 4 * checksum
+        if cursor > end:
+            raise ValueError("truncated zstd frame")
+        spans.append((pos, cursor - pos))
+        pos = cursor
+    return spans
+
+
+class ParallelFrameReader(io.RawIOBase):
+    """
+    Readable stream of the decompressed content of a multi-frame zstd file,
+    with up to `workers` frames decompressing at once on a thread pool
+    (zstandard releases the GIL) and handed out strictly in order. At most
+    2 × workers decompressed frames are held in memory.
+    """
+
+    def __init__(self, path: Path, spans: list[tuple[int, int]], workers: int):
+        super().__init__()
+        self._path    = path
+        self._spans   = iter(spans)
+        self._ahead   = 2 * workers
+        self._pool    = ThreadPoolExecutor(workers, thread_name_prefix="zstd")
+        self._pending: deque[Future] = deque()
+        self._buffer  = memoryview(b"")
+        self._fill()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            if not self._pending:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+            self._fill()
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def close(self) -> None:
+        for future in self._pending:
+            future.cancel()
+        self._pool.shutdown(wait=True)
+        super().close()
+
+    def _fill(self) -> None:
+        while len(self._pending) < self._ahead and (span := next(self._spans, None)) is not None:
+            self._pending.append(self._pool.submit(self._decompress, *span))
+
+    def _decompress(self, offset: int, length: int) -> bytes:
+        import zstandard
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        # decompressobj: frames needn't record their content size
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _read_exactly(f: BinaryIO, n: int) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise ValueError("truncated zstd frame")
+    return data